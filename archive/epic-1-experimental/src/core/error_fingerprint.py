@@ -0,0 +1,137 @@
+"""
+Error Fingerprinting - Stable grouping keys for MADF error events
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Error messages carry volatile tokens (paths, UUIDs, line numbers,
+timestamps, addresses, counters), so the same failure rarely repeats the
+same text. normalize_error_message() replaces those tokens with
+placeholders and error_fingerprint() hashes the error type plus the
+normalised message into a short key.
+
+The fingerprint is written to details.error_fingerprint by
+QuickLogger.log_error and at import time (PostgresManager,
+LocalAnalyticsBackend, LogArchive), where it is promoted to the indexed
+detail_error_fingerprint column that error-pattern queries group on.
+SentryManager uses the same key as the Sentry issue fingerprint.
+"""
+
+import re
+import hashlib
+from typing import Dict, Any, Optional, Tuple
+
+
+# Applied in order: specific shapes before the generic number rule
+_VOLATILE_PATTERNS = (
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"), "<ts>"),
+    (re.compile(r"\b\d{2}:\d{2}:\d{2}(?:\.\d+)?\b"), "<ts>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<hex>"),
+    (re.compile(r"\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"\w+://\S+"), "<url>"),
+    (re.compile(r"(?:[A-Za-z]:)?(?:[\\/][\w.\-@~]+){2,}[\\/]?"), "<path>"),
+    (re.compile(r"\bline \d+", re.I), "line <n>"),
+    (re.compile(r"(?<![\w<.])\d+(?:\.\d+)?"), "<n>"),
+)
+_WHITESPACE = re.compile(r"\s+")
+
+# Normalised messages are truncated before hashing (long tails are payload, not shape)
+MAX_PATTERN_LENGTH = 300
+
+# Where error events keep their type and message (details first, then top level)
+_MESSAGE_KEYS = ("error", "error_message")
+
+
+def normalize_error_message(message: str) -> str:
+    """
+    Replace volatile tokens in an error message with placeholders
+
+    Args:
+        message: Raw error message
+
+    Returns:
+        Normalised message, e.g. "File <path> not found (line <n>)"
+    """
+    text = str(message)
+    for pattern, placeholder in _VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return _WHITESPACE.sub(" ", text).strip()[:MAX_PATTERN_LENGTH]
+
+
+def error_fingerprint(error_type: Optional[str], message: Optional[str]) -> str:
+    """
+    Stable fingerprint for an error type and message
+
+    Args:
+        error_type: Exception class name (may be None)
+        message: Raw error message (may be None)
+
+    Returns:
+        16 hex character key
+    """
+    key = f"{error_type or ''}|{normalize_error_message(message or '')}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def error_fields(event: Dict[str, Any]) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    Error type and message of an error event
+
+    Reads details first (PatternExtractor / SentryManager layout), then
+    top-level fields (QuickLogger.log_error layout). Error events are
+    category/event_type "error", or failed events carrying details.error.
+
+    Returns:
+        (error_type, message), or None if the event is not an error
+    """
+    details = event.get("details")
+    details = details if isinstance(details, dict) else {}
+    is_error = (
+        event.get("category") == "error" or event.get("event_type") == "error"
+        or (event.get("success") is False and bool(details.get("error")))
+    )
+    if not is_error:
+        return None
+
+    error_type = details.get("error_type") or event.get("error_type")
+    message = next(
+        (source[key] for source in (details, event) for key in _MESSAGE_KEYS if source.get(key)),
+        None
+    )
+    if error_type is None and message is None:
+        return None
+    return error_type, None if message is None else str(message)
+
+
+def fingerprint_details(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Event details with error_fingerprint filled in (import-time normaliser)
+
+    Non-error events are returned unchanged. For error events the message
+    and type are also copied to details.error / details.error_type when they
+    were logged elsewhere (e.g. top-level error_message), so error-pattern
+    queries always have an example message.
+
+    Args:
+        event: Parsed JSONL event
+
+    Returns:
+        Details (a new dict when anything was added)
+    """
+    details = event.get("details", {})
+    if not isinstance(details, dict):
+        return details
+
+    fields = error_fields(event)
+    if fields is None:
+        return details
+
+    # Keep a fingerprint set by the logger (QuickLogger.log_error, SentryManager)
+    error_type, message = fields
+    added = {}
+    if not details.get("error_fingerprint"):
+        added["error_fingerprint"] = error_fingerprint(error_type, message)
+    if message is not None and not details.get("error"):
+        added["error"] = message
+    if error_type is not None and not details.get("error_type"):
+        added["error_type"] = error_type
+    return {**details, **added} if added else details
@@ -0,0 +1,133 @@
+"""
+Event Loop Thread - Long-lived asyncio loop for sync callers
+
+Runs one asyncio event loop in a daemon thread for the whole process.
+Sync code (agents, tests) submits coroutines with run_coroutine_threadsafe
+instead of creating and tearing down a loop per call with asyncio.run(),
+so pooled MCP sessions survive between calls.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class EventLoopThread:
+    """Long-lived asyncio event loop running in a background daemon thread"""
+
+    def __init__(self, name: str = "madf-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Running background loop (started on first access)"""
+        self.start()
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start loop thread if not already running"""
+        if self.is_running:
+            return
+        with self._lock:
+            if self.is_running:
+                return
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            self._started.wait()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._started.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            # Cancel outstanding tasks (e.g. pooled MCP session owners) so
+            # server subprocesses are terminated before the loop closes
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def in_loop(self) -> bool:
+        """True if called from a coroutine running on this loop"""
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule coroutine on the background loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run coroutine on the background loop and block for its result
+
+        Safe to call from sync code and from inside other event loops.
+
+        Args:
+            coro: Coroutine to execute
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            Coroutine result
+        """
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError(
+                "EventLoopThread.run() called from its own loop would deadlock - await instead"
+            )
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        """
+        Await coroutine on the background loop from any event loop
+
+        Args:
+            coro: Coroutine to execute
+
+        Returns:
+            Coroutine result
+        """
+        if self.in_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self, timeout: float = 10.0):
+        """Stop loop, cancelling outstanding tasks"""
+        if not self.is_running:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+
+# Global loop thread shared by all MCPBridge instances
+_loop_thread = None
+_loop_thread_lock = threading.Lock()
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Get or create global event loop thread"""
+    global _loop_thread
+    if _loop_thread is None:
+        with _loop_thread_lock:
+            if _loop_thread is None:
+                _loop_thread = EventLoopThread()
+                atexit.register(_loop_thread.stop)
+    return _loop_thread
@@ -0,0 +1,333 @@
+"""
+Latency Sketches - Mergeable streaming percentiles for MADF latencies
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+LatencySketch is a log-bucketed quantile sketch (DDSketch-style): every
+value lands in a bucket whose bounds are within relative_accuracy of each
+other, so any quantile is answered within that relative error from a
+bounded number of counters. Sketches with the same accuracy merge exactly
+by adding bucket counts.
+
+LatencySketchStore keeps one sketch per (agent, tool, action), is updated
+in-process by QuickLogger and merges pending counts into a shared SQLite
+file on flush, so p50/p95/p99 across all sessions come back without
+scanning raw events.
+
+Configuration (environment):
+    MADF_LATENCY_SKETCHES: Update sketches from QuickLogger events (default: 0)
+    MADF_LATENCY_SKETCH_PATH: SQLite file (default: MADF_LOG_PATH/latency_sketches.sqlite3)
+"""
+
+import os
+import json
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+SketchKey = Tuple[str, str, str]
+
+
+class LatencySketch:
+    """
+    Mergeable quantile sketch with bounded relative error
+
+    Values at or below min_value (e.g. 0 ms) are counted in a zero bucket.
+    When more than max_bins buckets are in use the lowest ones are collapsed,
+    which only affects accuracy of the smallest quantiles.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 2048,
+        min_value: float = 1e-3
+    ):
+        """
+        Initialize sketch
+
+        Args:
+            relative_accuracy: Max relative error of reported quantiles
+            max_bins: Upper bound on buckets kept
+            min_value: Values at or below this are counted as zero
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1):
+        """Record a value (count times)"""
+        if value <= self.min_value:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        """Fold the lowest buckets into one so at most max_bins remain"""
+        indexes = sorted(self.bins)
+        excess = len(indexes) - self.max_bins + 1
+        target = indexes[excess]
+        self.bins[target] += sum(self.bins.pop(i) for i in indexes[:excess])
+
+    def merge(self, other: "LatencySketch"):
+        """
+        Add another sketch's counts into this one
+
+        Args:
+            other: Sketch created with the same relative_accuracy
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative_accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated value at quantile q (0..1), None if empty
+
+        Returns the bucket midpoint, clamped to the observed min/max.
+        """
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def stats(self, quantiles: Sequence[float] = (0.5, 0.9, 0.95, 0.99)) -> Dict[str, Any]:
+        """
+        Percentile and aggregate summary
+
+        Returns:
+            Dict with pXX keys plus mean, min, max, count ({} if empty)
+        """
+        if not self.count:
+            return {}
+        result = {f"p{q * 100:g}": self.quantile(q) for q in quantiles}
+        result.update({
+            "mean": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count
+        })
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form (see from_dict)"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "min_value": self.min_value,
+            "bins": {str(i): c for i, c in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Rebuild a sketch from to_dict output"""
+        sketch = cls(data["relative_accuracy"], data["max_bins"], data["min_value"])
+        sketch.bins = {int(i): c for i, c in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class LatencySketchStore:
+    """
+    Per (agent, tool, action) latency sketches persisted in SQLite
+
+    record() only touches in-memory sketches. flush() merges the counts
+    recorded since the last flush into the shared file in one transaction,
+    so any number of sessions and processes can contribute.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, relative_accuracy: float = 0.01):
+        """
+        Initialize store
+
+        Args:
+            db_path: SQLite file
+                (default: MADF_LATENCY_SKETCH_PATH, else MADF_LOG_PATH/latency_sketches.sqlite3)
+            relative_accuracy: Relative error of new sketches
+        """
+        if db_path is None:
+            db_path = os.getenv("MADF_LATENCY_SKETCH_PATH") or \
+                Path(os.getenv("MADF_LOG_PATH", "D:/Logs/MADF")) / "latency_sketches.sqlite3"
+        self.db_path = Path(db_path)
+        self.relative_accuracy = relative_accuracy
+        self._pending: Dict[SketchKey, LatencySketch] = {}
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @staticmethod
+    def _key(agent_name: Optional[str], tool: Optional[str], action: Optional[str]) -> SketchKey:
+        return (agent_name or "", tool or "", action or "")
+
+    def record(
+        self,
+        duration_ms: float,
+        agent_name: Optional[str] = None,
+        tool: Optional[str] = None,
+        action: Optional[str] = None
+    ):
+        """Add one latency sample to the in-memory sketch for its key"""
+        key = self._key(agent_name, tool, action)
+        with self._lock:
+            sketch = self._pending.get(key)
+            if sketch is None:
+                sketch = self._pending[key] = LatencySketch(self.relative_accuracy)
+            sketch.add(duration_ms)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS latency_sketches ("
+                "agent_name TEXT NOT NULL, tool TEXT NOT NULL, action TEXT NOT NULL, "
+                "sketch TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (agent_name, tool, action))"
+            )
+            self._schema_ready = True
+        return conn
+
+    def flush(self) -> int:
+        """
+        Merge pending counts into the shared file
+
+        Returns:
+            Number of sketches written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE serialises read-merge-write across processes
+            conn.execute("BEGIN IMMEDIATE")
+            for key, sketch in pending.items():
+                row = conn.execute(
+                    "SELECT sketch FROM latency_sketches WHERE agent_name = ? AND tool = ? AND action = ?",
+                    key
+                ).fetchone()
+                if row is not None:
+                    stored = LatencySketch.from_dict(json.loads(row[0]))
+                    stored.merge(sketch)
+                    sketch = stored
+                conn.execute(
+                    "INSERT OR REPLACE INTO latency_sketches (agent_name, tool, action, sketch, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (*key, json.dumps(sketch.to_dict()), time.time())
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Keep the counts for the next flush
+            with self._lock:
+                for key, sketch in pending.items():
+                    current = self._pending.get(key)
+                    if current is not None:
+                        sketch.merge(current)
+                    self._pending[key] = sketch
+            raise
+        finally:
+            conn.close()
+        return len(pending)
+
+    def sketch(
+        self,
+        agent_name: Optional[str] = None,
+        tool: Optional[str] = None,
+        action: Optional[str] = None
+    ) -> LatencySketch:
+        """
+        Merged sketch for every key matching the given fields
+
+        None matches any value, so sketch(agent_name="dev_agent") covers all
+        of that agent's tools and actions. Includes unflushed samples.
+
+        Returns:
+            LatencySketch (empty if nothing matches)
+        """
+        filters = {"agent_name": agent_name, "tool": tool, "action": action}
+        merged = LatencySketch(self.relative_accuracy)
+
+        if self.db_path.exists():
+            where = " AND ".join(f"{column} = ?" for column, value in filters.items() if value is not None)
+            params = [value for value in filters.values() if value is not None]
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT sketch FROM latency_sketches" + (f" WHERE {where}" if where else ""),
+                    params
+                ).fetchall()
+            finally:
+                conn.close()
+            for (data,) in rows:
+                merged.merge(LatencySketch.from_dict(json.loads(data)))
+
+        with self._lock:
+            for key, sketch in self._pending.items():
+                if all(value is None or value == part for value, part in zip(filters.values(), key)):
+                    merged.merge(sketch)
+        return merged
+
+    def percentiles(
+        self,
+        agent_name: Optional[str] = None,
+        tool: Optional[str] = None,
+        action: Optional[str] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Any]:
+        """
+        Latency percentiles for matching keys (see sketch)
+
+        Returns:
+            Dict with p50/p95/p99 (by default), mean, min, max, count
+        """
+        return self.sketch(agent_name, tool, action).stats(quantiles)
@@ -0,0 +1,608 @@
+"""
+Local Analytics Backend - Embedded SQLite storage for MADF log analysis
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Serverless alternative to PostgresManager for LogAnalyzer, PatternExtractor
+and WeeklyRevision. QuickLogger JSONL files are ingested into one local
+SQLite file (or an in-memory database built from the log directory on
+initialize) and answer the same queries, so pattern analysis and weekly
+revision run on a laptop or in CI without a Postgres server.
+
+Select with MADF_ANALYTICS_BACKEND=local (see create_analytics_backend).
+"""
+
+import os
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .error_fingerprint import fingerprint_details
+from .log_rotation import is_compressed, iter_log_files, open_log
+from .quick_logger import compute_event_hash, validate_event
+
+
+# Same column order as PostgresManager IMPORT_COLUMNS
+EVENT_COLUMNS = (
+    "timestamp", "event_type", "category", "session_id", "story_id",
+    "agent_name", "workflow_id", "thread_id", "trace_id",
+    "duration_ms", "tokens_used", "context_percent",
+    "success", "confidence_score", "impact_score", "details", "event_hash"
+)
+REQUIRED_COLUMNS = ("timestamp", "event_type", "category", "session_id", "story_id")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS madf_events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    story_id TEXT NOT NULL,
+    agent_name TEXT,
+    workflow_id TEXT,
+    thread_id TEXT,
+    trace_id TEXT,
+    duration_ms INTEGER DEFAULT 0,
+    tokens_used INTEGER DEFAULT 0,
+    context_percent REAL DEFAULT 0.0,
+    success INTEGER DEFAULT 1,
+    confidence_score REAL,
+    impact_score REAL,
+    details TEXT,
+    event_hash TEXT UNIQUE,
+    detail_error TEXT GENERATED ALWAYS AS (json_extract(details, '$.error')) STORED,
+    detail_error_type TEXT GENERATED ALWAYS AS (json_extract(details, '$.error_type')) STORED,
+    detail_action TEXT GENERATED ALWAYS AS (json_extract(details, '$.action')) STORED,
+    detail_tool TEXT GENERATED ALWAYS AS (json_extract(details, '$.tool')) STORED,
+    detail_error_fingerprint TEXT GENERATED ALWAYS AS (json_extract(details, '$.error_fingerprint')) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_madf_timestamp ON madf_events(timestamp);
+CREATE INDEX IF NOT EXISTS idx_madf_session_id ON madf_events(session_id);
+CREATE INDEX IF NOT EXISTS idx_madf_story_agent ON madf_events(story_id, agent_name, event_type);
+CREATE INDEX IF NOT EXISTS idx_madf_slow_ops ON madf_events(duration_ms, agent_name, event_type, detail_action);
+
+CREATE TABLE IF NOT EXISTS madf_ingest_ledger (
+    file_path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    lines_read INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Rollup metrics (same names as PostgresManager.query_rollups), computed on raw rows
+ROLLUP_METRICS = {
+    "event_count": "COUNT(*)",
+    "success_count": "COUNT(*) FILTER (WHERE success = 1)",
+    "failure_count": "COUNT(*) FILTER (WHERE success = 0)",
+    "duration_sum": "COALESCE(SUM(duration_ms), 0)",
+    "duration_count": "COUNT(duration_ms)",
+    "tokens_sum": "COALESCE(SUM(tokens_used), 0)",
+    "tokens_count": "COUNT(tokens_used)",
+    "token_events": "COUNT(*) FILTER (WHERE tokens_used > 0)",
+    "context_sum": "COALESCE(SUM(context_percent), 0)",
+    "context_count": "COUNT(context_percent)",
+    "confidence_sum": "COALESCE(SUM(confidence_score), 0)",
+    "confidence_count": "COUNT(confidence_score)"
+}
+ROLLUP_DIMENSIONS = ("story_id", "agent_name", "event_type")
+
+# PatternExtractor catalog entries that need SQLite syntax (others run as is)
+QUERY_OVERRIDES = {
+    "error_patterns": """
+        SELECT
+            detail_error_fingerprint as fingerprint,
+            MIN(detail_error) as error_message,
+            MIN(detail_error_type) as error_type,
+            COUNT(*) as occurrence_count,
+            json_group_array(DISTINCT agent_name) as affected_agents,
+            json_group_array(DISTINCT event_type) as event_types,
+            MIN(timestamp) as first_seen,
+            MAX(timestamp) as last_seen,
+            AVG(duration_ms) as avg_duration_before_error,
+            COUNT(DISTINCT session_id) as affected_sessions
+        FROM madf_events
+        WHERE detail_error_fingerprint IS NOT NULL
+          AND timestamp >= %(start_time)s AND timestamp < %(end_time)s
+        GROUP BY detail_error_fingerprint
+        HAVING COUNT(*) >= %(min_occurrences)s
+        ORDER BY occurrence_count DESC
+    """,
+    "slow_operations": """
+        SELECT
+            agent_name,
+            event_type,
+            detail_action as action,
+            COUNT(*) as occurrence_count,
+            AVG(duration_ms) as avg_duration_ms,
+            MAX(duration_ms) as max_duration_ms,
+            MIN(duration_ms) as min_duration_ms,
+            percentile_cont(duration_ms, 0.95) as p95_duration_ms
+        FROM madf_events
+        WHERE duration_ms >= %(duration_threshold_ms)s
+          AND timestamp >= %(start_time)s AND timestamp < %(end_time)s
+        GROUP BY agent_name, event_type, detail_action
+        HAVING COUNT(*) >= 3
+        ORDER BY avg_duration_ms DESC
+        LIMIT %(limit)s
+    """
+}
+
+# Result columns decoded back to Python types
+JSON_COLUMNS = frozenset({"details", "affected_agents", "event_types"})
+TIMESTAMP_COLUMNS = frozenset({"timestamp", "first_seen", "last_seen", "start_time", "end_time"})
+
+_PARAM_PATTERN = re.compile(r"%\((\w+)\)s|%s|%%")
+
+
+def _timestamp_text(value: Any) -> str:
+    """
+    Canonical UTC text form (sorts chronologically)
+
+    Naive values are local time, as in Postgres timestamptz and LogArchive,
+    for both stored events and query bounds.
+    """
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return ts.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _to_sqlite(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _timestamp_text(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _translate(query: str, params: Any) -> Tuple[str, Any]:
+    """Convert psycopg placeholders (%s, %(name)s) to sqlite3 (?, :name)"""
+    def replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        return f":{match.group(1)}" if match.group(1) else "?"
+
+    query = _PARAM_PATTERN.sub(replace, query)
+    if isinstance(params, dict):
+        return query, {k: _to_sqlite(v) for k, v in params.items()}
+    return query, tuple(_to_sqlite(v) for v in params or ())
+
+
+class _PercentileCont:
+    """percentile_cont(value, fraction) aggregate (linear interpolation, as in Postgres)"""
+
+    def __init__(self):
+        self.values = []
+        self.fraction = 0.5
+
+    def step(self, value, fraction):
+        if value is not None:
+            self.values.append(value)
+        self.fraction = fraction
+
+    def finalize(self):
+        if not self.values:
+            return None
+        values = sorted(self.values)
+        position = (len(values) - 1) * self.fraction
+        lower = int(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class LocalAnalyticsBackend:
+    """
+    Embedded SQLite analytics backend (PostgresManager-compatible subset)
+
+    Provides the calls LogAnalyzer, PatternExtractor and WeeklyRevision make:
+    execute_query, query_rollups, get_session_stats and JSONL import.
+    """
+
+    dialect = "sqlite"
+    query_overrides = QUERY_OVERRIDES
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        log_dir: Optional[Path] = None,
+        pattern: str = "story_*.jsonl"
+    ):
+        """
+        Initialize local backend
+
+        Args:
+            db_path: SQLite file (default: MADF_LOCAL_DB_PATH or ":memory:")
+            log_dir: Directory of QuickLogger JSONL files imported on initialize
+                (default: MADF_LOG_PATH if it exists)
+            pattern: Glob for log files in log_dir
+        """
+        self.db_path = str(db_path or os.getenv("MADF_LOCAL_DB_PATH", ":memory:"))
+        if log_dir is None and os.getenv("MADF_LOG_PATH"):
+            log_dir = Path(os.getenv("MADF_LOG_PATH"))
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.pattern = pattern
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._initialized = False
+
+    def initialize(self):
+        """Open database, create schema and import the log directory"""
+        if self._initialized:
+            return
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_aggregate("percentile_cont", 2, _PercentileCont)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA_SQL)
+        self._migrate_schema()
+        self._initialized = True
+
+        if self.log_dir and self.log_dir.is_dir():
+            self.import_log_dir(self.log_dir)
+
+    def _migrate_schema(self):
+        """Add columns introduced after a database file was created"""
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_xinfo(madf_events)")}
+        if "detail_error_fingerprint" not in columns:
+            # SQLite can only add generated columns as VIRTUAL
+            self._conn.execute(
+                "ALTER TABLE madf_events ADD COLUMN detail_error_fingerprint TEXT "
+                "GENERATED ALWAYS AS (json_extract(details, '$.error_fingerprint')) VIRTUAL"
+            )
+        self._conn.execute("DROP INDEX IF EXISTS idx_madf_error_fingerprint")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_madf_fingerprint ON madf_events(detail_error_fingerprint) "
+            "WHERE detail_error_fingerprint IS NOT NULL"
+        )
+        self._conn.commit()
+
+    def import_log_dir(self, log_dir: Path, pattern: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Import (new lines of) every matching JSONL file in a directory
+
+        Compressed files (pattern + ".zst") are included.
+
+        Returns:
+            Totals across files
+        """
+        totals = {"files": 0, "total_events": 0, "successful_imports": 0,
+                  "duplicate_events": 0, "failed_imports": 0}
+        for path in iter_log_files(log_dir, pattern or self.pattern):
+            result = self.import_jsonl_file(path)
+            totals["files"] += 1
+            for key in ("total_events", "successful_imports", "duplicate_events", "failed_imports"):
+                totals[key] += result[key]
+        return totals
+
+    @staticmethod
+    def _new_lines(jsonl_path: Path, offset: int, line_num: int):
+        """Yield (line_num, line, end_offset) for complete lines after offset"""
+        if is_compressed(jsonl_path):
+            # Immutable: read whole unless already done; the offset is the
+            # compressed size and only reached with the last line
+            size = jsonl_path.stat().st_size
+            if offset == size:
+                return
+            previous = None
+            with open_log(jsonl_path) as f:
+                for entry in enumerate(f, 1):
+                    if previous:
+                        yield previous[0], previous[1], 0
+                    previous = entry
+            if previous:
+                yield previous[0], previous[1], size
+            return
+
+        with open(jsonl_path, 'rb') as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # Partial trailing line: wait for the writer
+                offset += len(raw)
+                line_num += 1
+                yield line_num, raw.decode("utf-8", errors="replace"), offset
+
+    def import_jsonl_file(
+        self,
+        jsonl_path: Path,
+        validate: bool = False,
+        chunk_size: int = 5000
+    ) -> Dict[str, Any]:
+        """
+        Import new complete lines of a JSONL log file
+
+        Resumes from the byte offset recorded for the file (restarting if the
+        file was replaced or truncated); events already present (same event
+        hash) are skipped. Compressed (.jsonl.zst) files are immutable, so
+        they are read whole once and skipped while unchanged. Rows are
+        inserted one chunk per transaction, together with the ledger offset.
+
+        Args:
+            jsonl_path: Path to JSONL log file
+            validate: Tag events failing UniversalEventSchema with
+                details.schema_validation_error
+            chunk_size: Rows per insert/commit
+
+        Returns:
+            Import statistics
+        """
+        if not self._initialized:
+            self.initialize()
+
+        jsonl_path = Path(jsonl_path)
+        file_key = str(jsonl_path.resolve())
+        stat = jsonl_path.stat()
+        ledger = self._conn.execute(
+            "SELECT inode, byte_offset, lines_read FROM madf_ingest_ledger WHERE file_path = ?", (file_key,)
+        ).fetchone()
+        offset, line_num = 0, 0
+        if ledger and ledger["inode"] == stat.st_ino and ledger["byte_offset"] <= stat.st_size:
+            offset, line_num = ledger["byte_offset"], ledger["lines_read"]
+
+        counts = {"total_events": 0, "successful_imports": 0, "duplicate_events": 0, "failed_imports": 0}
+        rows, advanced = [], False
+        for line_num, line, offset in self._new_lines(jsonl_path, offset, line_num):
+            advanced = True
+            if not line.strip():
+                continue
+            counts["total_events"] += 1
+            try:
+                rows.append(self._event_row(json.loads(line), validate))
+            except (ValueError, TypeError, AttributeError) as e:
+                counts["failed_imports"] += 1
+                print(f"Line {line_num} import failed: {e}")
+
+            if len(rows) >= chunk_size:
+                self._insert_chunk(rows, counts, (file_key, stat.st_ino, offset, line_num))
+                rows, advanced = [], False
+
+        if rows or advanced:
+            self._insert_chunk(rows, counts, (file_key, stat.st_ino, offset, line_num))
+
+        return {**counts, "file_path": str(jsonl_path)}
+
+    def _insert_chunk(self, rows: List[Tuple], counts: Dict[str, int], ledger: Tuple):
+        """Insert one chunk and save the ledger position in the same transaction"""
+        placeholders = ", ".join("?" * len(EVENT_COLUMNS))
+        with self._lock, self._conn:
+            inserted = self._conn.executemany(
+                f"INSERT OR IGNORE INTO madf_events ({', '.join(EVENT_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            ).rowcount if rows else 0
+            self._conn.execute(
+                "INSERT OR REPLACE INTO madf_ingest_ledger (file_path, inode, byte_offset, lines_read) "
+                "VALUES (?, ?, ?, ?)",
+                ledger
+            )
+        counts["successful_imports"] += inserted
+        counts["duplicate_events"] += len(rows) - inserted
+
+    @staticmethod
+    def _event_row(event: Dict[str, Any], validate: bool) -> Tuple:
+        """Map a JSONL event to an EVENT_COLUMNS row (same defaults as PostgresManager)"""
+        missing = [c for c in REQUIRED_COLUMNS if event.get(c) is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        # Hash the event as logged (same key as PostgresManager)
+        event_hash = compute_event_hash(event)
+
+        details = fingerprint_details(event)
+        if validate:
+            error = validate_event(event)
+            if error is not None:
+                details = {**(details if isinstance(details, dict) else {}), "schema_validation_error": error}
+
+        return (
+            _timestamp_text(event["timestamp"]),
+            event["event_type"],
+            event["category"],
+            event["session_id"],
+            event["story_id"],
+            event.get("agent_name"),
+            event.get("workflow_id"),
+            event.get("thread_id"),
+            event.get("trace_id"),
+            event.get("duration_ms", 0),
+            event.get("tokens_used", 0),
+            event.get("context_percent", 0.0),
+            _to_sqlite(event.get("success", True)),
+            event.get("confidence_score"),
+            event.get("impact_score"),
+            json.dumps(details),
+            event_hash
+        )
+
+    def execute_query(
+        self,
+        query: str,
+        params: Any = None,
+        timeout_ms: Optional[int] = None,
+        prepare: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a query written for PostgresManager (psycopg placeholders)
+
+        sqlite3 caches compiled statements per connection, so prepare and
+        timeout_ms are accepted for compatibility and ignored.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (tuple or dict)
+
+        Returns:
+            List of result dictionaries
+        """
+        if not self._initialized:
+            self.initialize()
+
+        query, params = _translate(query, params)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._decode(dict(row)) for row in rows]
+
+    @staticmethod
+    def _decode(row: Dict[str, Any]) -> Dict[str, Any]:
+        for key, value in row.items():
+            if value is None:
+                continue
+            if key in JSON_COLUMNS and isinstance(value, str):
+                row[key] = json.loads(value)
+            elif key in TIMESTAMP_COLUMNS and isinstance(value, str):
+                row[key] = datetime.fromisoformat(value)
+            elif key == "success":
+                row[key] = bool(value)
+        return row
+
+    def query_rollups(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[List[str]] = None,
+        include_sessions: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate event metrics (same result shape as PostgresManager.query_rollups)
+
+        Computed directly from raw events - local datasets are small enough
+        that pre-aggregated rollups are unnecessary.
+        """
+        filters = filters or {}
+        group_by = list(group_by or [])
+        unknown = [c for c in list(filters) + group_by if c not in ROLLUP_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unsupported rollup dimensions: {', '.join(unknown)}")
+
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        for column, value in filters.items():
+            expr = "COALESCE(agent_name, '')" if column == "agent_name" else column
+            values = list(value) if isinstance(value, (list, tuple)) else [value]
+            if column == "agent_name":
+                values = [v or "" for v in values]
+            clauses.append(f"{expr} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+        dimensions = ", ".join("COALESCE(agent_name, '') AS agent_name" if c == "agent_name" else c
+                               for c in group_by)
+        metrics = ", ".join(f"{expr} AS {name}" for name, expr in ROLLUP_METRICS.items())
+        sessions = ", COUNT(DISTINCT session_id) AS sessions" if include_sessions else ""
+        query = (
+            f"SELECT {dimensions + ', ' if group_by else ''}{metrics}, "
+            f"COUNT(DISTINCT story_id) AS stories, COUNT(DISTINCT NULLIF(agent_name, '')) AS agents{sessions} "
+            f"FROM madf_events"
+            + (f" WHERE {' AND '.join(clauses)}" if clauses else "")
+            + (f" GROUP BY {', '.join(group_by)}" if group_by else "")
+        )
+        return [row for row in self.execute_query(query, tuple(params)) if row["event_count"]]
+
+    def get_session_stats(self, session_id: str) -> Dict[str, Any]:
+        """
+        Get summary statistics for a session
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Session statistics dictionary
+        """
+        results = self.get_sessions_stats(session_ids=[session_id], limit=1)
+        return results[0] if results else {}
+
+    def get_sessions_stats(
+        self,
+        session_ids: Optional[List[str]] = None,
+        story_id: Optional[str] = None,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Summary statistics for many sessions in one grouped query
+
+        Same ordering and keyset cursor as PostgresManager.get_sessions_stats.
+
+        Args:
+            session_ids: Sessions to include (None = all)
+            story_id: Only sessions of this story
+            limit: Maximum sessions per page
+            before: (end_time, session_id) of the previous page's last row
+
+        Returns:
+            List of session statistics dictionaries
+        """
+        if session_ids is not None and not session_ids:
+            return []
+
+        conditions, params = [], []
+        if session_ids is not None:
+            conditions.append(f"session_id IN ({', '.join(['%s'] * len(session_ids))})")
+            params.extend(session_ids)
+        if story_id is not None:
+            conditions.append("story_id = %s")
+            params.append(story_id)
+        having = ""
+        if before is not None:
+            having = "HAVING (MAX(timestamp), session_id) < (%s, %s)"
+            params.extend(before)
+        params.append(limit)
+
+        return self.execute_query(
+            f"""
+            SELECT
+                session_id,
+                story_id,
+                COUNT(*) as total_events,
+                SUM(duration_ms) as total_duration_ms,
+                AVG(duration_ms) as avg_duration_ms,
+                SUM(tokens_used) as total_tokens_used,
+                AVG(context_percent) as avg_context_percent,
+                COUNT(*) FILTER (WHERE success = 1) as successful_events,
+                COUNT(*) FILTER (WHERE success = 0) as failed_events,
+                MIN(timestamp) as start_time,
+                MAX(timestamp) as end_time
+            FROM madf_events
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            GROUP BY session_id, story_id
+            {having}
+            ORDER BY end_time DESC, session_id DESC
+            LIMIT %s
+            """,
+            tuple(params)
+        )
+
+    def close(self):
+        """Close SQLite connection"""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+            self._initialized = False
+
+
+def create_analytics_backend(backend: Optional[str] = None):
+    """
+    Create the analytics storage backend
+
+    Args:
+        backend: "postgres" or "local" (default: MADF_ANALYTICS_BACKEND or postgres)
+
+    Returns:
+        PostgresManager or LocalAnalyticsBackend
+    """
+    backend = backend or os.getenv("MADF_ANALYTICS_BACKEND", "postgres")
+    if backend == "local":
+        return LocalAnalyticsBackend()
+    if backend != "postgres":
+        raise ValueError(f"Unsupported analytics backend: {backend}")
+
+    from .postgres_manager_sync import PostgresManager
+    return PostgresManager()
@@ -6,8 +6,21 @@ Provides high-level analysis methods that return concise summaries
 Perfect for LLM consumption without exceeding token limits
 """
 
-from typing import Dict, Any, List, Optional
-from .postgres_manager_sync import PostgresManager
+import itertools
+from typing import Dict, Any, List, Optional, Iterator
+from .local_analytics import create_analytics_backend
+from .pattern_extractor_sync import PatternExtractor
+
+try:
+    from .postgres_manager_sync import PostgresManager
+except ImportError:
+    # psycopg not installed: only the local backend is available
+    PostgresManager = None
+
+
+def _ratio(total, count) -> float:
+    """Average from rollup sum/count columns (0 when nothing was counted)"""
+    return float(total) / count if count else 0.0
 
 
 class LogAnalyzer:
@@ -18,14 +31,15 @@ class LogAnalyzer:
     Focuses on aggregated metrics rather than raw event dumps
     """
 
-    def __init__(self, postgres_manager: Optional[PostgresManager] = None):
+    def __init__(self, postgres_manager: Optional["PostgresManager"] = None):
         """
         Initialize log analyzer
 
         Args:
-            postgres_manager: PostgresManager instance (creates new if None)
+            postgres_manager: PostgresManager or LocalAnalyticsBackend
+                (default: create_analytics_backend())
         """
-        self.pg = postgres_manager or PostgresManager()
+        self.pg = postgres_manager or create_analytics_backend()
 
     def initialize(self):
         """Initialize Postgres connection"""
@@ -37,8 +51,75 @@ class LogAnalyzer:
 
         Returns human-readable summary of session execution
         """
-        stats = self.pg.get_session_stats(session_id)
+        return self._format_session_summary(session_id, self.pg.get_session_stats(session_id))
+
+    def iter_session_stats(
+        self,
+        session_ids: Optional[List[str]] = None,
+        story_id: Optional[str] = None,
+        page_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream statistics for any number of sessions, newest first
+
+        Each page is one grouped get_sessions_stats query; the next page
+        continues from the last row's (end_time, session_id).
+
+        Args:
+            session_ids: Sessions to include (None = all, or all of story_id)
+            story_id: Only sessions of this story
+            page_size: Sessions fetched per query
 
+        Yields:
+            Session statistics dictionaries
+        """
+        if session_ids is not None:
+            # Bound the id list sent per query as well
+            session_ids = list(dict.fromkeys(session_ids))
+            chunks = [session_ids[i:i + page_size] for i in range(0, len(session_ids), page_size)]
+        else:
+            chunks = [None]
+
+        for chunk in chunks:
+            before = None
+            while True:
+                page = self.pg.get_sessions_stats(
+                    session_ids=chunk, story_id=story_id, limit=page_size, before=before
+                )
+                yield from page
+                if len(page) < page_size:
+                    break
+                before = (page[-1]["end_time"], page[-1]["session_id"])
+
+    def get_session_summaries(
+        self,
+        session_ids: Optional[List[str]] = None,
+        story_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        page_size: int = 500
+    ) -> List[str]:
+        """
+        Session summaries for a story or id list without a query per session
+
+        Args:
+            session_ids: Sessions to summarise (None = all sessions of story_id)
+            story_id: Story whose sessions to summarise
+            limit: Maximum summaries, most recent sessions first (None = all)
+            page_size: Sessions fetched per query
+
+        Returns:
+            Summaries in get_session_summary format
+        """
+        if limit is not None:
+            page_size = min(page_size, limit)
+        stats = self.iter_session_stats(session_ids, story_id, max(page_size, 1))
+        return [
+            self._format_session_summary(row["session_id"], row)
+            for row in itertools.islice(stats, limit)
+        ]
+
+    @staticmethod
+    def _format_session_summary(session_id: str, stats: Dict[str, Any]) -> str:
         if not stats:
             return f"No data found for session: {session_id}"
 
@@ -86,9 +167,10 @@ Avg Tokens/Event     | {s1.get('avg_tokens', 0):>10.1f} | {s2.get('avg_tokens',
         """
         Get top recurring errors (<250 tokens)
 
-        Returns most common error patterns with occurrence counts
+        Returns most common error patterns (grouped by error fingerprint)
+        with occurrence counts
         """
-        patterns = self.pg.find_error_patterns(min_occurrences=2)
+        patterns = PatternExtractor(postgres_manager=self.pg).find_error_patterns(min_occurrences=2)
 
         if not patterns:
             return "No recurring error patterns found."
@@ -107,35 +189,22 @@ Avg Tokens/Event     | {s1.get('avg_tokens', 0):>10.1f} | {s2.get('avg_tokens',
         """
         Get agent performance summary (<200 tokens)
 
-        Returns key metrics for specific agent
+        Returns key metrics for specific agent (read from hourly/daily rollups)
         """
-        query = """
-        SELECT
-            COUNT(*) as total_actions,
-            AVG(duration_ms) as avg_duration_ms,
-            SUM(tokens_used) as total_tokens,
-            AVG(tokens_used) as avg_tokens,
-            COUNT(*) FILTER (WHERE success = false) as failures,
-            AVG(confidence_score) as avg_confidence,
-            COUNT(DISTINCT session_id) as sessions
-        FROM madf_events
-        WHERE agent_name = %(agent_name)s
-        """
-
-        results = self.pg.execute_query(query, {"agent_name": agent_name})
+        results = self.pg.query_rollups(filters={"agent_name": agent_name}, include_sessions=True)
 
         if not results:
             return f"No data found for agent: {agent_name}"
 
         stats = results[0]
         summary = f"""Agent: {agent_name}
-Actions: {stats.get('total_actions', 0)} total
-Sessions: {stats.get('sessions', 0)} unique
-Avg Duration: {stats.get('avg_duration_ms', 0):.1f}ms
-Avg Tokens: {stats.get('avg_tokens', 0):.1f}
-Total Tokens: {stats.get('total_tokens', 0)}
-Failures: {stats.get('failures', 0)}
-Avg Confidence: {stats.get('avg_confidence', 0):.2f}
+Actions: {stats['event_count']} total
+Sessions: {stats['sessions']} unique
+Avg Duration: {_ratio(stats['duration_sum'], stats['duration_count']):.1f}ms
+Avg Tokens: {_ratio(stats['tokens_sum'], stats['tokens_count']):.1f}
+Total Tokens: {stats['tokens_sum']}
+Failures: {stats['failure_count']}
+Avg Confidence: {_ratio(stats['confidence_sum'], stats['confidence_count']):.2f}
 """
         return summary.strip()
 
@@ -190,24 +259,16 @@ Avg Confidence: {stats.get('avg_confidence', 0):.2f}
         """
         Get token usage breakdown (<200 tokens)
 
-        Returns token consumption by agent and operation type
-        """
-        query = """
-        SELECT
-            agent_name,
-            event_type,
-            COUNT(*) as event_count,
-            SUM(tokens_used) as total_tokens,
-            AVG(tokens_used) as avg_tokens
-        FROM madf_events
-        WHERE story_id = %(story_id)s
-          AND tokens_used > 0
-        GROUP BY agent_name, event_type
-        ORDER BY total_tokens DESC
-        LIMIT 10
+        Returns token consumption by agent and operation type (read from rollups)
         """
-
-        results = self.pg.execute_query(query, {"story_id": story_id})
+        rows = self.pg.query_rollups(filters={"story_id": story_id}, group_by=["agent_name", "event_type"])
+        results = sorted(
+            ({"agent_name": r["agent_name"] or None, "event_type": r["event_type"],
+              "event_count": r["token_events"], "total_tokens": r["tokens_sum"]}
+             for r in rows if r["token_events"]),
+            key=lambda r: r["total_tokens"],
+            reverse=True
+        )[:10]
 
         if not results:
             return f"No token usage data for story: {story_id}"
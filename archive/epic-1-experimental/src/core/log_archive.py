@@ -0,0 +1,450 @@
+"""
+Log Archive - Columnar Parquet archive of MADF execution logs
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Closed daily QuickLogger files (story_{story_id}_{YYYYMMDD}.jsonl[.zst]) are
+compacted into Parquet, partitioned by date and story:
+
+    {archive_dir}/date=2025-10-01/story=1.4/part-0.parquet
+
+LogArchive computes the LogAnalyzer metrics (duration percentiles, token
+sums, failure rates) with pyarrow.compute over whole columns, so months of
+events are analysed without building a Python dict per event.
+
+Configuration (environment):
+    MADF_ARCHIVE_PATH: Archive root (default: MADF_LOG_PATH/archive)
+
+Requires pyarrow (optional dependency).
+"""
+
+import os
+import re
+import json
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+from .error_fingerprint import fingerprint_details
+from .log_rotation import iter_log_files, open_log
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+DAILY_LOG_PATTERN = re.compile(r"^story_(?P<story_id>.+)_(?P<day>\d{8})\.jsonl(?:\.zst)?$")
+
+# Hot details keys stored as their own columns (same as PostgresManager DETAIL_COLUMNS)
+DETAIL_KEYS = {
+    "detail_error": "error",
+    "detail_error_type": "error_type",
+    "detail_action": "action",
+    "detail_tool": "tool",
+    "detail_error_fingerprint": "error_fingerprint"
+}
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Rows parsed before a row group is written
+BATCH_ROWS = 50_000
+
+
+def archive_schema() -> "pa.Schema":
+    """Parquet schema for archived events (details kept as JSON text)"""
+    strings = [
+        "event_type", "category", "session_id", "story_id", "agent_name",
+        "workflow_id", "thread_id", "trace_id"
+    ]
+    fields = [pa.field("timestamp", pa.timestamp("us", tz="UTC"), nullable=False)]
+    fields += [pa.field(name, pa.string()) for name in strings]
+    fields += [
+        pa.field("duration_ms", pa.int64()),
+        pa.field("tokens_used", pa.int64()),
+        pa.field("context_percent", pa.float64()),
+        pa.field("success", pa.bool_()),
+        pa.field("confidence_score", pa.float64()),
+        pa.field("impact_score", pa.float64()),
+        pa.field("details", pa.string())
+    ]
+    fields += [pa.field(name, pa.string()) for name in DETAIL_KEYS]
+    return pa.schema(fields)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the log archive (pip install pyarrow)")
+
+
+def _utc(value: Any) -> datetime:
+    """Parse an event timestamp (naive values are local time, as in Postgres)"""
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return ts.astimezone(timezone.utc)
+
+
+def closed_log_files(log_dir: Path, before: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Daily log files that are no longer written to
+
+    QuickLogger names files by local date, so a file is closed once its day
+    is earlier than `before`.
+
+    Args:
+        log_dir: QuickLogger JSONL directory
+        before: First day still considered open (default: today)
+
+    Returns:
+        List of dicts with path, story_id and day, oldest first
+    """
+    before = before or date.today()
+    files = []
+    for path in iter_log_files(log_dir):
+        match = DAILY_LOG_PATTERN.match(path.name)
+        if not match:
+            continue
+        day = datetime.strptime(match.group("day"), "%Y%m%d").date()
+        if day < before:
+            files.append({"path": path, "story_id": match.group("story_id"), "day": day})
+    return sorted(files, key=lambda f: (f["day"], f["story_id"]))
+
+
+class LogArchive:
+    """
+    Parquet archive of compacted QuickLogger files with vectorized metrics
+    """
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        """
+        Initialize the archive
+
+        Args:
+            archive_dir: Archive root
+                (default: MADF_ARCHIVE_PATH, else MADF_LOG_PATH/archive)
+        """
+        _require_pyarrow()
+        if archive_dir is None:
+            archive_dir = os.getenv("MADF_ARCHIVE_PATH") or \
+                Path(os.getenv("MADF_LOG_PATH", "D:/Logs/MADF")) / "archive"
+        self.archive_dir = Path(archive_dir)
+        self.schema = archive_schema()
+
+    def partition_path(self, story_id: str, day: date) -> Path:
+        """Parquet file for one story and day"""
+        return self.archive_dir / f"date={day.isoformat()}" / f"story={story_id}" / "part-0.parquet"
+
+    def compact(
+        self,
+        log_dir: Optional[Path] = None,
+        before: Optional[date] = None,
+        delete_source: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Compact closed daily JSONL files into Parquet partitions
+
+        Files already compacted at their current size are skipped, so the
+        job can run repeatedly (e.g. from cron).
+
+        Args:
+            log_dir: QuickLogger JSONL directory (default: MADF_LOG_PATH)
+            before: First day still considered open (default: today)
+            delete_source: Remove each JSONL file after it is compacted
+
+        Returns:
+            Dict with files_compacted, files_skipped, events_written, failed_lines
+        """
+        log_dir = Path(log_dir or os.getenv("MADF_LOG_PATH", "D:/Logs/MADF"))
+        stats = {"files_compacted": 0, "files_skipped": 0, "events_written": 0, "failed_lines": 0}
+
+        for entry in closed_log_files(log_dir, before):
+            target = self.partition_path(entry["story_id"], entry["day"])
+            if self._is_current(target, entry["path"]):
+                stats["files_skipped"] += 1
+            else:
+                written, failed = self.compact_file(entry["path"], target)
+                stats["files_compacted"] += 1
+                stats["events_written"] += written
+                stats["failed_lines"] += failed
+            if delete_source:
+                entry["path"].unlink()
+
+        return stats
+
+    def _is_current(self, target: Path, source: Path) -> bool:
+        """True if target was compacted from source at its current size"""
+        if not target.exists():
+            return False
+        metadata = pq.read_schema(target).metadata or {}
+        return metadata.get(b"madf.source_size") == str(source.stat().st_size).encode()
+
+    def compact_file(self, jsonl_path: Path, target: Path) -> tuple:
+        """
+        Convert one JSONL file into a Parquet file
+
+        Rows are written in row groups of BATCH_ROWS; the file is written
+        to a temporary name and renamed so readers never see a partial file.
+
+        Args:
+            jsonl_path: Source JSONL file (.jsonl or .jsonl.zst)
+            target: Destination Parquet file
+
+        Returns:
+            (events_written, failed_lines)
+        """
+        jsonl_path = Path(jsonl_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Dot prefix: dataset discovery ignores the file until it is renamed
+        tmp_path = target.parent / f".{target.name}.tmp"
+        schema = self.schema.with_metadata({
+            "madf.source": jsonl_path.name,
+            "madf.source_size": str(jsonl_path.stat().st_size)
+        })
+
+        written = failed = 0
+        columns = {name: [] for name in schema.names}
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            with open_log(jsonl_path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        self._append_event(columns, json.loads(line))
+                    except (ValueError, TypeError, AttributeError):
+                        # Malformed or partial line
+                        failed += 1
+                        continue
+                    written += 1
+                    if len(columns["timestamp"]) >= BATCH_ROWS:
+                        writer.write_table(pa.table(columns, schema=schema))
+                        columns = {name: [] for name in schema.names}
+            if columns["timestamp"] or not written:
+                writer.write_table(pa.table(columns, schema=schema))
+
+        os.replace(tmp_path, target)
+        return written, failed
+
+    @staticmethod
+    def _append_event(columns: Dict[str, list], event: Dict[str, Any]):
+        """Append one event to the column lists (all-or-nothing)"""
+        details = fingerprint_details(event)
+        details = details if isinstance(details, dict) else {}
+        row = {
+            "timestamp": _utc(event["timestamp"]),
+            "event_type": event.get("event_type"),
+            "category": event.get("category"),
+            "session_id": event.get("session_id"),
+            "story_id": event.get("story_id"),
+            "agent_name": event.get("agent_name"),
+            "workflow_id": event.get("workflow_id"),
+            "thread_id": event.get("thread_id"),
+            "trace_id": event.get("trace_id"),
+            "duration_ms": int(event.get("duration_ms") or 0),
+            "tokens_used": int(event.get("tokens_used") or 0),
+            "context_percent": float(event.get("context_percent") or 0.0),
+            "success": bool(event.get("success", True)),
+            "confidence_score": event.get("confidence_score"),
+            "impact_score": event.get("impact_score"),
+            "details": json.dumps(details) if details else None
+        }
+        for column, key in DETAIL_KEYS.items():
+            value = details.get(key)
+            row[column] = None if value is None else str(value)
+        for name, value in row.items():
+            columns[name].append(value)
+
+    def dataset(self) -> "ds.Dataset":
+        """Arrow dataset over every partition (date/story become columns)"""
+        partitioning = ds.partitioning(
+            pa.schema([("date", pa.string()), ("story", pa.string())]), flavor="hive"
+        )
+        return ds.dataset(self.archive_dir, format="parquet", partitioning=partitioning)
+
+    def scan(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> "pa.Table":
+        """
+        Read matching events as an Arrow table
+
+        Date and story filters prune whole partitions; other filters are
+        pushed down to Parquet row-group statistics.
+
+        Args:
+            columns: Columns to read (default: all)
+            start: Inclusive start timestamp
+            end: Exclusive end timestamp
+            filters: Column equality filters (e.g. {"story_id": "1.4"})
+
+        Returns:
+            pyarrow Table
+        """
+        if not self.archive_dir.exists():
+            return self.schema.empty_table().select(list(columns or self.schema.names))
+
+        expression = None
+
+        def add(condition):
+            nonlocal expression
+            expression = condition if expression is None else expression & condition
+
+        # Partition dates are the writer's local day, which can be one day off
+        # the UTC day: prune with a day of slack, the timestamp filter is exact
+        if start is not None:
+            start = _utc(start)
+            add(ds.field("date") >= (start.date() - timedelta(days=1)).isoformat())
+            add(ds.field("timestamp") >= pa.scalar(start, pa.timestamp("us", tz="UTC")))
+        if end is not None:
+            end = _utc(end)
+            add(ds.field("date") <= (end.date() + timedelta(days=1)).isoformat())
+            add(ds.field("timestamp") < pa.scalar(end, pa.timestamp("us", tz="UTC")))
+        for name, value in (filters or {}).items():
+            if name == "story_id":
+                add(ds.field("story") == str(value))
+            add(ds.field(name) == value)
+
+        return self.dataset().to_table(
+            columns=list(columns) if columns else self.schema.names, filter=expression
+        )
+
+    def metrics(
+        self,
+        group_by: Sequence[str] = ("agent_name",),
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> List[Dict[str, Any]]:
+        """
+        LogAnalyzer metrics per group, computed column-wise
+
+        Duration percentiles use Arrow's t-digest (approximate, within a
+        fraction of a percent); use percentiles() for exact values.
+
+        Args:
+            group_by: Grouping columns ([] = one row for all events)
+            start: Inclusive start timestamp
+            end: Exclusive end timestamp
+            filters: Column equality filters
+            quantiles: Duration quantiles to report (duration_p50, duration_p95, ...)
+
+        Returns:
+            One dict per group, ordered by event_count descending, with
+            event_count, success_count, failure_count, failure_rate,
+            tokens_sum, token_events, avg_tokens, avg_duration_ms,
+            max_duration_ms, duration_pXX, avg_context_percent, avg_confidence
+        """
+        keys = list(group_by)
+        needed = set(keys) | {"duration_ms", "tokens_used", "success", "context_percent", "confidence_score"}
+        table = self.scan(columns=sorted(needed), start=start, end=end, filters=filters)
+
+        if not keys:
+            # Ungrouped aggregation returns scalars; group on a constant instead
+            table = table.append_column("_all", pa.repeat(pa.scalar(True), len(table)))
+        table = table.append_column("failed", pc.cast(pc.invert(table["success"]), pa.int64()))
+        table = table.append_column("token_event", pc.cast(pc.greater(table["tokens_used"], 0), pa.int64()))
+
+        aggregated = table.group_by(keys or ["_all"]).aggregate([
+            ([], "count_all"),
+            ("failed", "sum"),
+            ("tokens_used", "sum"),
+            ("token_event", "sum"),
+            ("duration_ms", "mean"),
+            ("duration_ms", "max"),
+            ("duration_ms", "tdigest", pc.TDigestOptions(q=list(quantiles))),
+            ("context_percent", "mean"),
+            ("confidence_score", "mean")
+        ])
+
+        results = []
+        for row in aggregated.to_pylist():
+            event_count = row["count_all"]
+            failure_count = row["failed_sum"] or 0
+            token_events = row["token_event_sum"] or 0
+            tokens_sum = row["tokens_used_sum"] or 0
+            result = {key: row[key] for key in keys}
+            result.update({
+                "event_count": event_count,
+                "success_count": event_count - failure_count,
+                "failure_count": failure_count,
+                "failure_rate": failure_count / event_count if event_count else 0.0,
+                "tokens_sum": tokens_sum,
+                "token_events": token_events,
+                "avg_tokens": tokens_sum / token_events if token_events else 0.0,
+                "avg_duration_ms": row["duration_ms_mean"] or 0.0,
+                "max_duration_ms": row["duration_ms_max"] or 0
+            })
+            for q, value in zip(quantiles, row["duration_ms_tdigest"] or [None] * len(quantiles)):
+                result[f"duration_p{q * 100:g}"] = value
+            result["avg_context_percent"] = row["context_percent_mean"] or 0.0
+            result["avg_confidence"] = row["confidence_score_mean"] or 0.0
+            results.append(result)
+
+        return sorted(results, key=lambda r: r["event_count"], reverse=True)
+
+    def percentiles(
+        self,
+        column: str = "duration_ms",
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Exact quantiles of one numeric column (linear interpolation)
+
+        Args:
+            column: Numeric column (e.g. duration_ms, tokens_used)
+            quantiles: Quantiles in [0, 1]
+            start: Inclusive start timestamp
+            end: Exclusive end timestamp
+            filters: Column equality filters
+
+        Returns:
+            Dict mapping "p50"/"p95"/... to values (None if no events)
+        """
+        values = self.scan(columns=[column], start=start, end=end, filters=filters)[column]
+        names = [f"p{q * 100:g}" for q in quantiles]
+        if len(values) == 0:
+            return dict.fromkeys(names)
+        result = pc.quantile(values, q=list(quantiles), interpolation="linear")
+        return dict(zip(names, result.to_pylist()))
+
+
+def main():
+    """CLI entry point for log compaction"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact closed MADF JSONL logs into Parquet")
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=None,
+        help="QuickLogger JSONL directory (default: MADF_LOG_PATH)"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=None,
+        help="Parquet archive root (default: MADF_ARCHIVE_PATH or MADF_LOG_PATH/archive)"
+    )
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Remove JSONL files once compacted"
+    )
+
+    args = parser.parse_args()
+
+    stats = LogArchive(args.archive_dir).compact(args.log_dir, delete_source=args.delete_source)
+    print(f"[OK] Compacted {stats['files_compacted']} files "
+          f"({stats['events_written']} events, {stats['failed_lines']} bad lines), "
+          f"skipped {stats['files_skipped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Log Context - contextvars-based logging context for concurrent agents
+Story 1.4 Task 1 Phase 1 implementation
+
+The agent / workflow / thread / trace attribution that QuickLogger stamps on
+every event lives in a ContextVar instead of logger attributes. Each asyncio
+task (and each thread) sees its own value, tasks inherit the context they
+were created from, and scoped changes are undone on exit, so agents running
+concurrently on one event loop never overwrite each other's attribution.
+
+The context is an immutable dict that is replaced, never mutated, so reading
+it on the logging hot path needs no lock.
+
+Usage:
+    with log_context(agent_name="analyst", workflow_id="wf-1"):
+        logger.log_tool_call("Read", 12)        # attributed to analyst
+
+    with log_span("plan"):                      # nested span ids
+        with log_span("search"):
+            ...
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Any, Iterator, Optional
+
+
+# Fields QuickLogger copies from the context onto each event
+CONTEXT_FIELDS = ("agent_name", "workflow_id", "thread_id", "trace_id", "span_id", "parent_span_id")
+
+_EMPTY: Dict[str, Any] = {}
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("madf_log_context", default=_EMPTY)
+
+
+def get_log_context() -> Dict[str, Any]:
+    """Current context (treat as read-only)"""
+    return _log_context.get()
+
+
+def set_log_context(**fields: Any) -> Token:
+    """
+    Merge fields into the current context (None values are ignored)
+
+    Affects the current task/thread and tasks created from it afterwards.
+
+    Returns:
+        Token for reset_log_context
+    """
+    updates = {key: value for key, value in fields.items() if value is not None}
+    return _log_context.set({**_log_context.get(), **updates})
+
+
+def reset_log_context(token: Token):
+    """Restore the context from before set_log_context"""
+    _log_context.reset(token)
+
+
+def clear_log_context():
+    """Drop all context fields in the current task/thread"""
+    _log_context.set(_EMPTY)
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Scoped context: fields apply inside the block and are restored after
+
+    Args:
+        **fields: agent_name, workflow_id, thread_id, trace_id or any extra key
+
+    Yields:
+        The context active inside the block
+    """
+    token = set_log_context(**fields)
+    try:
+        yield _log_context.get()
+    finally:
+        _log_context.reset(token)
+
+
+def new_id(bits: int = 64) -> str:
+    """Random id in hex (64-bit span ids, 128-bit trace ids)"""
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+@contextmanager
+def log_span(name: Optional[str] = None, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Nested span scope: new span_id, parent_span_id from the enclosing span
+
+    A trace_id is created if none is set, so every span belongs to a trace.
+
+    Args:
+        name: Span name (stored as span_name)
+        **fields: Extra context fields for the block
+
+    Yields:
+        The context active inside the block
+    """
+    current = _log_context.get()
+    with log_context(
+        trace_id=current.get("trace_id") or new_id(128),
+        span_id=new_id(),
+        parent_span_id=current.get("span_id"),
+        span_name=name,
+        **fields
+    ) as context:
+        yield context
@@ -0,0 +1,239 @@
+"""
+Log Rotation - zstd compression and sidecar indexes for MADF JSONL logs
+Story 1.4 Task 1 Phase 1 implementation
+
+Closed log files (rotated segments, merged daily files) are compressed to
+<name>.jsonl.zst in a background thread. Next to each compressed file a
+small sidecar index <name>.jsonl.zst.idx.json records the first/last
+timestamp and event counts, so readers can skip files outside a time range
+without decompressing them.
+
+open_log() and iter_log_files() let importers and readers stream .jsonl
+and .jsonl.zst files the same way.
+
+Configuration (environment):
+    MADF_LOG_COMPRESS: Compress closed segments and merged daily files
+        (default: 1, ignored when zstandard is not installed)
+    MADF_LOG_ZSTD_LEVEL: zstd compression level (default: 3)
+
+Rotation only happens in segment mode (MADF_LOG_SEGMENTS=1, see
+log_segments): the shared daily file QuickLogger writes by default is never
+rotated or compressed.
+
+Requires zstandard for compression (optional dependency).
+"""
+
+import io
+import os
+import json
+import atexit
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+
+COMPRESSED_SUFFIX = ".zst"
+INDEX_SUFFIX = ".idx.json"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def compression_enabled() -> bool:
+    """True if closed logs should be compressed (MADF_LOG_COMPRESS and zstandard available)"""
+    return zstd is not None and os.getenv("MADF_LOG_COMPRESS", "1").lower() in ("1", "true", "yes")
+
+
+def is_compressed(path: Path) -> bool:
+    return Path(path).name.endswith(COMPRESSED_SUFFIX)
+
+
+def index_path(path: Path) -> Path:
+    """Sidecar index location for a log file"""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def _require_zstd():
+    if zstd is None:
+        raise ImportError("zstandard is required for compressed logs (pip install zstandard)")
+
+
+def open_log(path: Path) -> TextIO:
+    """
+    Open a JSONL log for reading text lines (.jsonl or .jsonl.zst)
+
+    Compressed files are decompressed as they stream.
+    """
+    if not is_compressed(path):
+        return open(path, 'r', encoding='utf-8')
+    _require_zstd()
+    raw = open(path, 'rb')
+    reader = zstd.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8')
+
+
+def iter_log_files(
+    log_dir: Path,
+    pattern: str = "story_*.jsonl",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Path]:
+    """
+    Plain and compressed log files matching pattern, sorted by name
+
+    With start/end, files whose sidecar index shows no events in
+    [start, end) are skipped (files without an index are always kept).
+
+    Args:
+        log_dir: Directory to search
+        pattern: Glob for plain files; pattern + ".zst" is searched too
+        start: Earliest timestamp of interest (timezone-aware)
+        end: Latest timestamp of interest, exclusive (timezone-aware)
+
+    Returns:
+        List of paths
+    """
+    log_dir = Path(log_dir)
+    paths = set(log_dir.glob(pattern)) | set(log_dir.glob(pattern + COMPRESSED_SUFFIX))
+    files = []
+    for path in sorted(paths):
+        index = read_index(path) if (start or end) else None
+        if index and index["first_timestamp"] and index["last_timestamp"]:
+            if end and datetime.fromisoformat(index["first_timestamp"]) >= end:
+                continue
+            if start and datetime.fromisoformat(index["last_timestamp"]) < start:
+                continue
+        files.append(path)
+    return files
+
+
+class LogIndexBuilder:
+    """Accumulates sidecar index fields while lines are written"""
+
+    def __init__(self):
+        self.first_timestamp: Optional[str] = None
+        self.last_timestamp: Optional[str] = None
+        self.events = 0
+        self.invalid_lines = 0
+        self.event_types: Counter = Counter()
+        self.uncompressed_bytes = 0
+
+    def add(self, line: str):
+        self.uncompressed_bytes += len(line.encode("utf-8"))
+        try:
+            event = json.loads(line)
+            timestamp = event.get("timestamp")
+            event_type = event.get("event_type")
+        except (ValueError, AttributeError):
+            self.invalid_lines += 1
+            return
+        self.events += 1
+        self.event_types[event_type] += 1
+        if timestamp:
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "events": self.events,
+            "invalid_lines": self.invalid_lines,
+            "event_types": dict(self.event_types),
+            "uncompressed_bytes": self.uncompressed_bytes
+        }
+
+
+def read_index(path: Path) -> Optional[Dict[str, Any]]:
+    """Sidecar index of a log file (None if missing or unreadable)"""
+    try:
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_log(path: Path, lines: Iterable[str], level: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Write lines to a log file atomically, compressing if path ends in .zst
+
+    The file is written under a dot-prefixed temporary name and swapped in,
+    then its sidecar index is written (compressed files only).
+
+    Args:
+        path: Destination (.jsonl or .jsonl.zst)
+        lines: Newline-terminated JSON lines
+        level: zstd level (default: MADF_LOG_ZSTD_LEVEL or 3)
+
+    Returns:
+        Index dict (first/last timestamp, counts)
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    builder = LogIndexBuilder()
+    try:
+        if is_compressed(path):
+            _require_zstd()
+            level = level or int(os.getenv("MADF_LOG_ZSTD_LEVEL", "3"))
+            with open(tmp, 'wb') as raw:
+                with zstd.ZstdCompressor(level=level).stream_writer(raw, closefd=False) as writer:
+                    for line in lines:
+                        builder.add(line)
+                        writer.write(line.encode("utf-8"))
+        else:
+            with open(tmp, 'w', encoding='utf-8') as out:
+                for line in lines:
+                    builder.add(line)
+                    out.write(line)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+    index = builder.to_dict()
+    if is_compressed(path):
+        index["compressed_bytes"] = path.stat().st_size
+        with open(index_path(path), 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    return index
+
+
+def compress_file(path: Path, level: Optional[int] = None) -> Path:
+    """
+    Compress a closed log file to <path>.zst (with index) and remove the original
+
+    Returns:
+        Path of the compressed file
+    """
+    path = Path(path)
+    target = path.with_name(path.name + COMPRESSED_SUFFIX)
+    with open_log(path) as f:
+        write_log(target, f, level)
+    path.unlink()
+    return target
+
+
+def compress_in_background(func, *args) -> Future:
+    """
+    Run a compression job on the shared single-worker thread
+
+    Jobs run one at a time in submission order; pending jobs are finished at
+    interpreter exit.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="madf-log-compress")
+            atexit.register(_executor.shutdown, wait=True)
+    return _executor.submit(func, *args)
@@ -0,0 +1,303 @@
+"""
+Log Segments - Per-process JSONL segments merged into daily files
+Story 1.4 Task 1 Phase 1 implementation
+
+With segments enabled (MADF_LOG_SEGMENTS=1) every process appends to its
+own file instead of the shared daily file, so validator subprocesses, MCP
+helpers and the main workflow never contend for or interleave lines in
+one file:
+
+    {log_dir}/segments/story_1.4_20251001.p12345.s0001.jsonl.open   (active)
+    {log_dir}/segments/story_1.4_20251001.p12345.s0001.jsonl        (closed)
+
+A segment is renamed to .jsonl when its writer rotates (size, age, day)
+or closes, and is then compressed to .jsonl.zst in the background (see
+log_rotation). merge_segments() k-way merges closed segments, plus the
+segments of past days left .open by crashed processes, into the
+time-ordered daily file story_{story_id}_{YYYYMMDD}.jsonl (.jsonl.zst when
+compression is on) that PostgresManager.import_jsonl_file,
+LocalAnalyticsBackend and LogArchive already read. Merge before compacting
+a day into the archive.
+
+Configuration (environment):
+    MADF_LOG_SEGMENTS: Write per-process segments (default: 0)
+    MADF_LOG_SEGMENT_MAX_MB: Size at which a new segment is started (default: 64)
+    MADF_LOG_SEGMENT_MAX_AGE: Seconds after which a new segment is started (default: 3600, 0 = off)
+"""
+
+import os
+import re
+import json
+import heapq
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .log_rotation import (
+    COMPRESSED_SUFFIX, compression_enabled, compress_file, compress_in_background,
+    index_path, open_log, write_log
+)
+
+SEGMENT_PATTERN = re.compile(
+    r"^story_(?P<story_id>.+)_(?P<day>\d{8})\.p(?P<pid>\d+)\.s(?P<seq>\d+)\.jsonl(?P<suffix>\.open|\.zst)?$"
+)
+
+# A merge lock older than this is considered abandoned
+STALE_LOCK_SECONDS = 600
+
+
+class SegmentWriter:
+    """
+    Append-only writer for this process's current segment
+
+    Not thread-safe on its own; QuickLogger calls it under its lock. Each
+    write is a single os.write on an O_APPEND descriptor. A forked child
+    detects the new pid and starts its own segment.
+    """
+
+    def __init__(
+        self,
+        segment_dir: Path,
+        story_id: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        compress: Optional[bool] = None
+    ):
+        """
+        Initialize writer (the file is created on first write)
+
+        Args:
+            segment_dir: Directory for segment files
+            story_id: Story identifier used in file names
+            max_bytes: Segment size that triggers a rollover
+                (default: MADF_LOG_SEGMENT_MAX_MB or 64 MB)
+            max_age: Segment age in seconds that triggers a rollover, 0 = never
+                (default: MADF_LOG_SEGMENT_MAX_AGE or 3600)
+            compress: Compress closed segments in the background
+                (default: log_rotation.compression_enabled())
+        """
+        self.segment_dir = Path(segment_dir)
+        self.story_id = story_id
+        self.max_bytes = max_bytes or int(float(os.getenv("MADF_LOG_SEGMENT_MAX_MB", "64")) * 1024 * 1024)
+        self.max_age = max_age if max_age is not None else float(os.getenv("MADF_LOG_SEGMENT_MAX_AGE", "3600"))
+        self.compress = compression_enabled() if compress is None else compress
+        self.pending_compression = []
+        self.path: Optional[Path] = None
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+        self._day: Optional[str] = None
+        self._seq = 0
+        self._size = 0
+        self._opened_at = 0.0
+
+    def _open_next(self, day: str):
+        """Create the next unused segment for (pid, day)"""
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._seq += 1
+            name = f"story_{self.story_id}_{day}.p{self._pid}.s{self._seq:04d}.jsonl"
+            path = self.segment_dir / (name + ".open")
+            if (self.segment_dir / name).exists():
+                # Left by an earlier process with the same pid
+                continue
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND | getattr(os, "O_BINARY", 0))
+            except FileExistsError:
+                continue
+            self._fd, self.path, self._day, self._size = fd, path, day, 0
+            self._opened_at = time.monotonic()
+            return
+
+    def write(self, data: str):
+        """Append serialized lines to the current segment"""
+        pid = os.getpid()
+        day = f"{date.today():%Y%m%d}"
+        if pid != self._pid:
+            # First write, or a forked child inheriting the parent's segment
+            self._fd, self.path, self._pid, self._seq = None, None, pid, 0
+        elif self._fd is not None and (
+            day != self._day or self._size >= self.max_bytes
+            or (self.max_age and time.monotonic() - self._opened_at >= self.max_age)
+        ):
+            self.close()
+        if self._fd is None:
+            self._open_next(day)
+
+        payload = data.encode("utf-8")
+        view = memoryview(payload)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._size += len(payload)
+
+    def close(self):
+        """Close the current segment and mark it mergeable"""
+        if self._fd is None or self._pid != os.getpid():
+            return
+        os.close(self._fd)
+        self._fd = None
+        closed = self.path.with_suffix("")
+        os.replace(self.path, closed)
+        self.path = None
+        if self.compress:
+            self.pending_compression = [f for f in self.pending_compression if not f.done()]
+            self.pending_compression.append(compress_in_background(compress_segment, closed))
+
+
+def _merge_lock_path(log_dir: Path, story_id: str, day: str) -> Path:
+    return Path(log_dir) / f".story_{story_id}_{day}.jsonl.merge.lock"
+
+
+def compress_segment(path: Path) -> Optional[Path]:
+    """
+    Compress a closed segment unless a merge of its day is running
+
+    Returns:
+        Compressed path, or None if the segment was merged or is being merged
+    """
+    path = Path(path)
+    match = SEGMENT_PATTERN.match(path.name)
+    lock = _merge_lock_path(path.parent.parent, match.group("story_id"), match.group("day"))
+    if not _acquire_lock(lock):
+        return None
+    try:
+        return compress_file(path) if path.exists() else None
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+def mergeable_segments(segment_dir: Path, before: Optional[date] = None) -> Dict[tuple, List[Path]]:
+    """
+    Segments that can be merged, grouped by (story_id, day)
+
+    Closed segments are always mergeable. Active (.open) segments only when
+    their day is earlier than `before`, i.e. their writer crashed.
+
+    Args:
+        segment_dir: Directory holding segment files
+        before: First day whose .open segments may still be written (default: today)
+
+    Returns:
+        Dict of (story_id, YYYYMMDD) -> segment paths
+    """
+    before = before or date.today()
+    groups: Dict[tuple, List[Path]] = {}
+    if not Path(segment_dir).is_dir():
+        return groups
+    for path in sorted(Path(segment_dir).iterdir()):
+        match = SEGMENT_PATTERN.match(path.name)
+        if not match:
+            continue
+        if match.group("suffix") == ".open" and datetime.strptime(match.group("day"), "%Y%m%d").date() >= before:
+            continue
+        groups.setdefault((match.group("story_id"), match.group("day")), []).append(path)
+    return groups
+
+
+def _timestamp(line: str) -> str:
+    """Sort key: the event's ISO timestamp ("" for unparseable lines)"""
+    try:
+        return json.loads(line).get("timestamp") or ""
+    except (ValueError, AttributeError):
+        return ""
+
+
+def _lines(path: Path):
+    with open_log(path) as f:
+        for line in f:
+            if line.strip():
+                yield line if line.endswith("\n") else line + "\n"
+
+
+def _acquire_lock(lock_path: Path) -> bool:
+    try:
+        os.close(os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        if time.time() - lock_path.stat().st_mtime < STALE_LOCK_SECONDS:
+            return False
+        lock_path.unlink(missing_ok=True)
+        return _acquire_lock(lock_path)
+
+
+def merge_segments(
+    log_dir: Optional[Path] = None,
+    before: Optional[date] = None,
+    compress: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Merge segments into time-ordered daily files
+
+    For each (story, day) the existing daily file and all mergeable segments
+    are k-way merged by timestamp (each input is already in write order),
+    written to a temporary file and swapped in atomically. Merged segments
+    are then deleted, so re-running is safe. Lines appended to the daily file
+    by a writer without segments during the merge would be lost, so enable
+    segments for every process of a story.
+
+    Args:
+        log_dir: QuickLogger JSONL directory (default: MADF_LOG_PATH)
+        before: See mergeable_segments (default: today)
+        compress: Write the daily file as .jsonl.zst with a sidecar index
+            (default: log_rotation.compression_enabled())
+
+    Returns:
+        Statistics: files_written, segments_merged, events_written, skipped (locked days)
+    """
+    log_dir = Path(log_dir or os.getenv("MADF_LOG_PATH", "D:/Logs/MADF"))
+    compress = compression_enabled() if compress is None else compress
+    stats = {"files_written": [], "segments_merged": 0, "events_written": 0, "skipped": []}
+
+    for (story_id, day), segments in mergeable_segments(log_dir / "segments", before).items():
+        plain = log_dir / f"story_{story_id}_{day}.jsonl"
+        packed = plain.with_name(plain.name + COMPRESSED_SUFFIX)
+        daily = packed if compress else plain
+        lock = _merge_lock_path(log_dir, story_id, day)
+        if not _acquire_lock(lock):
+            stats["skipped"].append(str(daily))
+            continue
+        try:
+            # A segment compressed after it was listed only changed its name
+            segments = [
+                path if path.exists() else path.with_name(path.name + COMPRESSED_SUFFIX)
+                for path in segments
+            ]
+            existing = [path for path in (plain, packed) if path.exists()]
+            inputs = [_lines(path) for path in existing + segments]
+            count = write_log(daily, heapq.merge(*inputs, key=_timestamp))["events"]
+            for path in existing + segments:
+                if path != daily:
+                    path.unlink()
+                    index_path(path).unlink(missing_ok=True)
+        finally:
+            lock.unlink(missing_ok=True)
+
+        stats["files_written"].append(str(daily))
+        stats["segments_merged"] += len(segments)
+        stats["events_written"] += count
+    return stats
+
+
+def main():
+    """CLI entry point for segment merging"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge per-process MADF log segments into daily files")
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=None,
+        help="QuickLogger JSONL directory (default: MADF_LOG_PATH)"
+    )
+
+    args = parser.parse_args()
+
+    stats = merge_segments(args.log_dir)
+    print(f"[OK] Merged {stats['segments_merged']} segments into "
+          f"{len(stats['files_written'])} daily files ({stats['events_written']} events), "
+          f"skipped {len(stats['skipped'])} locked")
+
+
+if __name__ == "__main__":
+    main()
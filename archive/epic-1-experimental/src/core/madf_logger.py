@@ -3,11 +3,12 @@ MADF Logger - Agent execution decorators and workflow context management
 Story 1.4 Task 1 Phase 1 implementation
 """
 
-import time
 import functools
 import inspect
 from typing import Optional, Callable, Any
 from .quick_logger import get_logger, QuickLogger
+from .log_context import log_context
+from .tracing import Span
 
 
 class MADFLogger:
@@ -23,7 +24,7 @@ class MADFLogger:
         thread_id: Optional[str] = None,
         trace_id: Optional[str] = None
     ):
-        """Set workflow context for all subsequent logging"""
+        """Set workflow context for subsequent logging in the current task/thread"""
         self.logger.set_context(
             agent_name=agent_name,
             workflow_id=workflow_id,
@@ -31,6 +32,27 @@ class MADFLogger:
             trace_id=trace_id
         )
 
+    def workflow_context(
+        self,
+        workflow_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        thread_id: Optional[str] = None,
+        trace_id: Optional[str] = None
+    ):
+        """
+        Scoped workflow context, restored on exit
+
+        Usage:
+            with get_madf_logger().workflow_context(workflow_id="wf-1"):
+                await run_workflow()
+        """
+        return log_context(
+            agent_name=agent_name,
+            workflow_id=workflow_id,
+            thread_id=thread_id,
+            trace_id=trace_id
+        )
+
     def log_agent_execution(
         self,
         agent_name: str,
@@ -99,10 +121,13 @@ class MADFLogger:
 
 
 # Decorator for automatic agent execution logging
-def log_agent_execution(agent_name: Optional[str] = None):
+def log_agent_execution(agent_name: Optional[str] = None, sample_rate: Optional[float] = None):
     """
     Decorator to automatically log agent execution with timing
 
+    Each call is a tracing.Span: one agent_action event when it returns or
+    raises, with perf_counter_ns timing and parent/child span ids.
+
     Usage:
         @log_agent_execution(agent_name="analyst")
         async def analyze_code(self, code: str):
@@ -110,97 +135,24 @@ def log_agent_execution(agent_name: Optional[str] = None):
             pass
     """
     def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def async_wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
-            logger = get_logger()
-
+        def start_span(args) -> Span:
             # Extract agent name from args if not provided
             actual_agent_name = agent_name
             if not actual_agent_name and args and hasattr(args[0], '__class__'):
                 actual_agent_name = args[0].__class__.__name__
+            return Span(func.__name__, sample_rate=sample_rate,
+                        agent_name=actual_agent_name, agent=actual_agent_name)
 
-            # Set agent context
-            if actual_agent_name:
-                logger.set_context(agent_name=actual_agent_name)
-
-            # Log execution start
-            logger.log("agent_action", "execution",
-                      agent=actual_agent_name,
-                      action=func.__name__,
-                      status="start")
-
-            try:
-                result = await func(*args, **kwargs)
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Log successful execution
-                logger.log("agent_action", "execution",
-                          agent=actual_agent_name,
-                          action=func.__name__,
-                          duration_ms=duration_ms,
-                          success=True)
-
-                return result
-
-            except Exception as e:
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Log failed execution
-                logger.log("agent_action", "error",
-                          agent=actual_agent_name,
-                          action=func.__name__,
-                          duration_ms=duration_ms,
-                          success=False,
-                          details={"error": str(e)})
-
-                raise
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            # One agent_action event on completion, scoped agent context inside
+            with start_span(args):
+                return await func(*args, **kwargs)
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
-            logger = get_logger()
-
-            # Extract agent name from args if not provided
-            actual_agent_name = agent_name
-            if not actual_agent_name and args and hasattr(args[0], '__class__'):
-                actual_agent_name = args[0].__class__.__name__
-
-            # Set agent context
-            if actual_agent_name:
-                logger.set_context(agent_name=actual_agent_name)
-
-            # Log execution start
-            logger.log("agent_action", "execution",
-                      agent=actual_agent_name,
-                      action=func.__name__,
-                      status="start")
-
-            try:
-                result = func(*args, **kwargs)
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Log successful execution
-                logger.log("agent_action", "execution",
-                          agent=actual_agent_name,
-                          action=func.__name__,
-                          duration_ms=duration_ms,
-                          success=True)
-
-                return result
-
-            except Exception as e:
-                duration_ms = int((time.time() - start_time) * 1000)
-
-                # Log failed execution
-                logger.log("agent_action", "error",
-                          agent=actual_agent_name,
-                          action=func.__name__,
-                          duration_ms=duration_ms,
-                          success=False,
-                          details={"error": str(e)})
-
-                raise
+            with start_span(args):
+                return func(*args, **kwargs)
 
         # Return async or sync wrapper based on function type
         if inspect.iscoroutinefunction(func):
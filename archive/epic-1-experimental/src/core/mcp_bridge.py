@@ -3,41 +3,77 @@ Python MCP Bridge - Real MCP Protocol Integration
 
 Enables hybrid MCP architecture with both direct (stdio) and HTTP integrations
 Uses Python MCP SDK for actual protocol communication
+
+Async methods (call_*_tool_async, call_mcp_tool) run on one long-lived
+background loop; sync wrappers submit to it via run_coroutine_threadsafe
 """
 
 import json
 import asyncio
+import functools
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 from contextlib import asynccontextmanager
 
 # MCP SDK imports
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 import httpx
 
+from .event_loop_thread import get_event_loop_thread
+from .mcp_session_pool import MCPSessionPool
+from .mcp_tool_registry import ToolRegistry
+from .tool_result_cache import ToolResultCache
+
+
+def _on_bridge_loop(func: Callable) -> Callable:
+    """Run async bridge method on the bridge's long-lived loop from any caller loop"""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        return await self._loop_thread.run_async(func(self, *args, **kwargs))
+    return wrapper
+
 
 class MCPBridge:
     """Bridge for communicating with MCP servers using real MCP protocol"""
 
-    def __init__(self):
-        self._active_sessions = {}  # Cache for persistent MCP sessions
-        self._session_locks = {}  # Async locks for session access
+    # Serena tools with no side effects (eligible for result caching and coalescing)
+    SERENA_CACHEABLE_TOOLS = frozenset({
+        "find_symbol",
+        "get_symbols_overview",
+        "find_referencing_symbols",
+        "search_for_pattern"
+    })
 
+    def __init__(self):
         # Load environment-based configuration
         self._load_env_config()
 
+        # Single long-lived event loop owning all MCP sessions
+        self._loop_thread = get_event_loop_thread()
+
+        # Tool schemas cached per server version (warm from disk)
+        self._tool_registry = ToolRegistry(cache_path=self._tool_registry_path)
+
+        # Persistent MCP sessions shared by all stdio tool calls
+        self._session_pool = MCPSessionPool(
+            **self._pool_settings,
+            on_session_start=self._warm_tool_registry,
+            on_session_lost=self._tool_registry.invalidate
+        )
+
         self.direct_mcp_servers = {
             "serena": {
                 "type": "stdio",
                 "command": "uvx",
-                "args": ["--from", "git+https://github.com/oraios/serena", "serena", "start-mcp-server", "--project", "d:/dev/MADF"]
+                "args": ["--from", "git+https://github.com/oraios/serena", "serena", "start-mcp-server", "--project", "d:/dev/MADF"],
+                "pool": {"max_size": 1},  # Language server indexes project once per process
+                "coalesce": sorted(self.SERENA_CACHEABLE_TOOLS)
             },
             "context7": {
                 "type": "stdio",
                 "command": "npx",
-                "args": ["-y", "@upstash/context7-mcp"]
+                "args": ["-y", "@upstash/context7-mcp"],
+                "coalesce": ["resolve-library-id", "get-library-docs"]
             },
             "sequential_thinking": {
                 "type": "stdio",
@@ -79,10 +115,32 @@ class MCPBridge:
             "chrome_devtools": {
                 "type": "stdio",
                 "command": "npx",
-                "args": ["-y", "chrome-devtools-mcp"]
+                "args": ["-y", "chrome-devtools-mcp"],
+                "pool": {"max_size": 1}  # Single shared browser instance
             }
         }
-        self._context7_cache = {}  # Cache for Context7 documentation calls
+        # Two-tier (memory LRU + SQLite) caches for repeated tool results
+        self._context7_cache = ToolResultCache(
+            "context7",
+            max_bytes=self._cache_settings["context7_max_bytes"],
+            ttl_seconds=self._cache_settings["context7_ttl"],
+            db_path=self._tool_cache_db_path
+        )
+        self._serena_cache = None
+        if self._cache_settings["serena_ttl"] > 0:
+            # Opt-in: code changes invalidate symbol results, so keep TTL short
+            self._serena_cache = ToolResultCache(
+                "serena",
+                max_bytes=self._cache_settings["serena_max_bytes"],
+                ttl_seconds=self._cache_settings["serena_ttl"],
+                db_path=self._tool_cache_db_path
+            )
+
+        # Single-flight: identical concurrent calls to idempotent tools share
+        # one in-flight task (server config "coalesce" lists eligible tools).
+        # Only touched from the bridge loop, so no lock is needed.
+        self._inflight_calls: Dict[tuple, asyncio.Task] = {}
+        self._coalesce_stats = {"leaders": 0, "coalesced": 0}
 
     def _load_env_config(self):
         """Load environment variables for MCP server configuration"""
@@ -91,6 +149,27 @@ class MCPBridge:
 
         self._obsidian_vault_path = os.getenv("OBSIDIAN_VAULT_PATH", "")
 
+        # Local cache directory (tool registry, documentation cache)
+        self._cache_dir = Path(os.getenv("MADF_CACHE_PATH", str(Path.home() / ".cache" / "madf")))
+        self._tool_registry_path = self._cache_dir / "mcp_tool_registry.json"
+        self._tool_cache_db_path = self._cache_dir / "tool_result_cache.sqlite3"
+
+        # Tool result cache budgets (Serena caching disabled unless TTL > 0)
+        self._cache_settings = {
+            "context7_max_bytes": int(float(os.getenv("MADF_CONTEXT7_CACHE_MB", "64")) * 1024 * 1024),
+            "context7_ttl": float(os.getenv("MADF_CONTEXT7_CACHE_TTL", str(7 * 24 * 3600))),
+            "serena_max_bytes": int(float(os.getenv("MADF_SERENA_CACHE_MB", "16")) * 1024 * 1024),
+            "serena_ttl": float(os.getenv("MADF_SERENA_CACHE_TTL", "0"))
+        }
+
+        # Session pool defaults (per-server overrides via "pool" in server config)
+        self._pool_settings = {
+            "min_size": int(os.getenv("MCP_POOL_MIN_SIZE", "0")),
+            "max_size": int(os.getenv("MCP_POOL_MAX_SIZE", "4")),
+            "idle_timeout": float(os.getenv("MCP_POOL_IDLE_TIMEOUT", "300")),
+            "health_check_interval": float(os.getenv("MCP_POOL_HEALTH_CHECK_INTERVAL", "30"))
+        }
+
     def _get_filesystem_args(self) -> List[str]:
         """Get filesystem MCP server args with allowed directories from env"""
         args = ["-y", "@modelcontextprotocol/server-filesystem"]
@@ -144,70 +223,78 @@ class MCPBridge:
         all_servers = list(self.direct_mcp_servers.keys()) + list(self.wrapped_mcp_servers.keys())
         return all_servers
 
-    async def _get_persistent_session(self, server_name: str, server_config: Dict[str, Any]):
+    @asynccontextmanager
+    async def _get_stdio_session(self, server_name: str, server_config: Dict[str, Any]):
         """
-        Get or create persistent MCP session for server
+        Borrow pooled MCP stdio session for server
 
         Args:
             server_name: Name of MCP server
             server_config: Server configuration with command and args
 
-        Returns:
+        Yields:
             ClientSession for MCP communication
         """
-        # Check if session already exists
-        if server_name in self._active_sessions:
-            return self._active_sessions[server_name]["session"]
-
-        # Create new session
-        server_params = StdioServerParameters(
-            command=server_config["command"],
-            args=server_config["args"],
-            env=None
-        )
-
-        # Start stdio client and keep context managers alive
-        stdio_ctx = stdio_client(server_params)
-        read, write = await stdio_ctx.__aenter__()
-
-        session_ctx = ClientSession(read, write)
-        session = await session_ctx.__aenter__()
-        await session.initialize()
+        async with self._session_pool.acquire(server_name, server_config) as session:
+            yield session
 
-        # Cache session with context managers for cleanup
-        self._active_sessions[server_name] = {
-            "session": session,
-            "session_ctx": session_ctx,
-            "stdio_ctx": stdio_ctx
-        }
-        return session
-
-    @asynccontextmanager
-    async def _get_stdio_session(self, server_config: Dict[str, Any]):
+    async def _warm_tool_registry(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        session: Any,
+        init_result: Any
+    ):
         """
-        Create MCP stdio session for server (temporary, non-persistent)
+        Session start hook: list tools once per server version
 
-        Args:
-            server_config: Server configuration with command and args
-
-        Yields:
-            ClientSession for MCP communication
+        Skips list_tools() when cached schemas match the server's version hash
         """
-        # Pass current environment to subprocess
-        import os
-        server_params = StdioServerParameters(
-            command=server_config["command"],
-            args=server_config["args"],
-            env=os.environ.copy()
-        )
+        version_hash = ToolRegistry.compute_version_hash(server_config, init_result.serverInfo)
+        if self._tool_registry.is_current(server_name, version_hash):
+            return
+
+        tools_result = await session.list_tools()
+        self._tool_registry.register(server_name, tools_result.tools, version_hash)
+
+    def get_tool_registry(self) -> ToolRegistry:
+        """Get cached tool schema registry"""
+        return self._tool_registry
+
+    def _run_sync(self, coro) -> Any:
+        """Run coroutine on the bridge loop from sync code"""
+        return self._loop_thread.run(coro)
+
+    @_on_bridge_loop
+    async def close_sessions(self):
+        """Terminate all pooled MCP server processes"""
+        await self._session_pool.close_all()
+
+    def close(self):
+        """Terminate all pooled MCP server processes and close caches (sync)"""
+        self._run_sync(self.close_sessions())
+        self._context7_cache.close()
+        if self._serena_cache:
+            self._serena_cache.close()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters for tool result caches"""
+        stats = {"context7": self._context7_cache.stats()}
+        if self._serena_cache:
+            stats["serena"] = self._serena_cache.stats()
+        stats["coalescing"] = {
+            **self._coalesce_stats,
+            "in_flight": len(self._inflight_calls)
+        }
+        return stats
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                yield session
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get session pool counters and per-server session counts"""
+        return self._session_pool.stats()
 
     async def _call_stdio_tool(
         self,
+        server_name: str,
         server_config: Dict[str, Any],
         tool_name: str,
         arguments: Dict[str, Any]
@@ -216,6 +303,7 @@ class MCPBridge:
         Call tool on stdio MCP server
 
         Args:
+            server_name: Name of MCP server
             server_config: Server configuration
             tool_name: Name of tool to call
             arguments: Tool arguments
@@ -224,23 +312,7 @@ class MCPBridge:
             Tool execution result
         """
         try:
-            async with self._get_stdio_session(server_config) as session:
-                # List available tools
-                tools_result = await session.list_tools()
-
-                # Find matching tool
-                matching_tool = None
-                for tool in tools_result.tools:
-                    if tool.name == tool_name:
-                        matching_tool = tool
-                        break
-
-                if not matching_tool:
-                    return {
-                        "success": False,
-                        "error": f"Tool '{tool_name}' not found on server"
-                    }
-
+            async with self._get_stdio_session(server_name, server_config) as session:
                 # Call the tool
                 result = await session.call_tool(tool_name, arguments)
 
@@ -314,8 +386,21 @@ class MCPBridge:
             Dict containing available tools and their descriptions
         """
         # Use async method to get real tool list from MCP server
-        return asyncio.run(self._load_mcp_tools_async(server_name))
+        return self._run_sync(self._load_mcp_tools_async(server_name))
 
+    async def load_mcp_tools_async(self, server_name: str) -> Dict[str, Any]:
+        """
+        Load tools from specified MCP server (async)
+
+        Args:
+            server_name: Name of MCP server to load tools from
+
+        Returns:
+            Dict containing available tools and their descriptions
+        """
+        return await self._load_mcp_tools_async(server_name)
+
+    @_on_bridge_loop
     async def _load_mcp_tools_async(self, server_name: str) -> Dict[str, Any]:
         """Load tools from MCP server (async)"""
         server_config = self.direct_mcp_servers.get(server_name) or self.wrapped_mcp_servers.get(server_name)
@@ -323,23 +408,19 @@ class MCPBridge:
             return {"error": f"Unknown MCP server: {server_name}"}
 
         try:
-            # Get or create persistent session
-            session = await self._get_persistent_session(server_name, server_config)
-
-            # List tools from server
-            tools_result = await session.list_tools()
-
-            # Convert to dict format
-            tools_dict = {}
-            for tool in tools_result.tools:
-                tools_dict[tool.name] = tool
+            # Starting a pooled session warms the registry (no-op if already running)
+            async with self._get_stdio_session(server_name, server_config):
+                pass
 
-            return tools_dict
+            return self._tool_registry.list_tools(server_name)
         except Exception as e:
             return {"error": f"Failed to load tools from {server_name}: {str(e)}"}
 
     def _get_tool_descriptions(self, server_name: str) -> Dict[str, str]:
-        """Get tool descriptions for a server"""
+        """Get tool descriptions for a server (registry first, static fallback)"""
+        if self._tool_registry.is_warm(server_name):
+            return self._tool_registry.get_descriptions(server_name)
+
         tool_descriptions = {
             "serena": {
                 "find_symbol": "Find symbols in code using LSP-based semantic search",
@@ -386,9 +467,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_serena_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_serena_tool_async(tool_name, parameters))
 
-    async def _call_serena_tool_async(
+    @_on_bridge_loop
+    async def call_serena_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -403,22 +485,9 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        server_config = self.direct_mcp_servers.get("serena")
-        if not server_config:
-            return {"success": False, "error": "Serena server not configured"}
-
-        # Use temporary session per call to avoid ClosedResourceError
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                # result.content is a list of content items from MCP SDK
-                return self._parse_serena_result(tool_name, result.content)
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "serena", tool_name, parameters, self._result_parser("serena", tool_name, parameters)
+        )
 
     def _parse_serena_result(self, tool_name: str, result: Any) -> Dict[str, Any]:
         """Parse Serena MCP result into expected format"""
@@ -477,9 +546,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_context7_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_context7_tool_async(tool_name, parameters))
 
-    async def _call_context7_tool_async(
+    @_on_bridge_loop
+    async def call_context7_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -494,32 +564,9 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        # Check cache first
-        cache_key = f"{tool_name}:{json.dumps(parameters, sort_keys=True)}"
-        if cache_key in self._context7_cache:
-            cached_result = self._context7_cache[cache_key].copy()
-            cached_result["cached"] = True
-            return cached_result
-
-        server_config = self.direct_mcp_servers.get("context7")
-        if not server_config:
-            return {"success": False, "error": "Context7 server not configured"}
-
-        # Use temporary session per call to avoid ClosedResourceError
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                parsed_result = self._parse_context7_result(tool_name, result.content, parameters)
-                parsed_result["cached"] = False
-                # Cache the result
-                self._context7_cache[cache_key] = parsed_result.copy()
-                return parsed_result
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "context7", tool_name, parameters, self._result_parser("context7", tool_name, parameters)
+        )
 
     def _parse_context7_result(self, tool_name: str, result: Any, parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Parse Context7 result into expected format (MCP SDK response)"""
@@ -555,9 +602,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_sequential_thinking_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_sequential_thinking_tool_async(tool_name, parameters))
 
-    async def _call_sequential_thinking_tool_async(
+    @_on_bridge_loop
+    async def call_sequential_thinking_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -572,21 +620,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        server_config = self.direct_mcp_servers.get("sequential_thinking")
-        if not server_config:
-            return {"success": False, "error": "Sequential Thinking server not configured"}
-
-        # Use temporary session per call to avoid ClosedResourceError
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                return self._parse_sequential_thinking_result(tool_name, result.content)
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "sequential_thinking", tool_name, parameters,
+            lambda content: self._parse_sequential_thinking_result(tool_name, content)
+        )
 
     def _parse_sequential_thinking_result(self, tool_name: str, result: Any) -> Dict[str, Any]:
         """Parse Sequential Thinking result into expected format (MCP SDK response)"""
@@ -612,6 +649,7 @@ class MCPBridge:
             "reasoning": result_data
         }
 
+    @_on_bridge_loop
     async def call_mcp_tool(
         self,
         server_name: str,
@@ -621,6 +659,10 @@ class MCPBridge:
         """
         Call a tool on specified MCP server (async)
 
+        Context7 and Serena results come back parsed, as from their helpers,
+        and share the helpers' result cache; other servers return the raw
+        transport result.
+
         Args:
             server_name: Name of MCP server
             tool_name: Name of tool to call
@@ -629,18 +671,149 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        # Get server config
-        server_config = self.direct_mcp_servers.get(server_name) or self.wrapped_mcp_servers.get(server_name)
+        return await self._call_tool(
+            server_name, tool_name, parameters, self._result_parser(server_name, tool_name, parameters)
+        )
 
+    def _result_parser(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Dict[str, Any]
+    ) -> Optional[Callable[[Any], Dict[str, Any]]]:
+        """
+        Parser for servers whose results are cached (context7, serena)
+
+        Their results are returned parsed from every entry point (helper,
+        call_mcp_tool, call_many), so all callers share cache entries and
+        coalesced calls. Other servers return raw transport results here.
+        """
+        if server_name == "context7":
+            return lambda content: self._parse_context7_result(tool_name, content, parameters)
+        if server_name == "serena":
+            return lambda content: self._parse_serena_result(tool_name, content)
+        return None
+
+    def _result_cache(self, server_name: str, tool_name: str) -> Optional[ToolResultCache]:
+        """Result cache for a tool, None if its results are not cached"""
+        if server_name == "context7":
+            return self._context7_cache
+        if server_name == "serena" and tool_name in self.SERENA_CACHEABLE_TOOLS:
+            return self._serena_cache
+        return None
+
+    def _validate_tool_call(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Error result if the registry rejects the call, None if it is valid or the registry is cold"""
+        # Tool schemas are cached by the registry when a session starts
+        if not self._tool_registry.is_warm(server_name):
+            return None
+
+        if not self._tool_registry.has_tool(server_name, tool_name):
+            return {
+                "success": False,
+                "error": f"Tool '{tool_name}' not found on server"
+            }
+
+        validation_errors = self._tool_registry.validate_arguments(server_name, tool_name, arguments)
+        if validation_errors:
+            return {
+                "success": False,
+                "error": f"Invalid arguments for '{tool_name}': {'; '.join(validation_errors)}"
+            }
+        return None
+
+    async def _call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        parse: Optional[Callable[[Any], Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Shared path of every public tool call: result cache, registry validation,
+        single-flight, transport
+
+        Args:
+            server_name: Name of MCP server
+            tool_name: Name of tool to call
+            parameters: Parameters for tool call
+            parse: Turns MCP result content into a helper result dict
+                (None = raw result from the stdio/HTTP transport)
+
+        Returns:
+            Dict containing tool execution results
+        """
+        server_config = self.direct_mcp_servers.get(server_name) or self.wrapped_mcp_servers.get(server_name)
         if not server_config:
             return {
                 "success": False,
                 "error": f"Unknown server: {server_name}"
             }
 
+        cache_key = ToolResultCache.make_key(tool_name, parameters)
+        # Raw results hold MCP content objects, so only parsed results are cached
+        cache = self._result_cache(server_name, tool_name) if parse else None
+        if cache is not None:
+            cached_result = cache.get(cache_key)
+            if cached_result is not None:
+                return {**cached_result, "cached": True}
+
+        validation_error = self._validate_tool_call(server_name, tool_name, parameters)
+        if validation_error is not None:
+            return validation_error
+
+        async def call() -> Dict[str, Any]:
+            if parse is None:
+                return await self._dispatch_tool_call(server_name, server_config, tool_name, parameters)
+            try:
+                # Borrow pooled session (server process stays warm between calls)
+                async with self._get_stdio_session(server_name, server_config) as session:
+                    result = await session.call_tool(tool_name, parameters)
+                    parsed_result = parse(result.content)
+            except Exception as e:
+                import traceback
+                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+            if cache is None:
+                return parsed_result
+            # Cache successful results only (errors should be retried)
+            if parsed_result.get("success"):
+                cache.put(cache_key, parsed_result)
+            return {**parsed_result, "cached": False}
+
+        if tool_name not in server_config.get("coalesce", ()):
+            return await call()
+
+        # Join an identical in-flight call instead of issuing another round-trip
+        key = (server_name, parse is not None, cache_key)
+        task = self._inflight_calls.get(key)
+        if task is not None:
+            self._coalesce_stats["coalesced"] += 1
+            # Shield so one caller's cancellation doesn't cancel the shared call
+            result = await asyncio.shield(task)
+            return {**result, "coalesced": True}
+
+        task = asyncio.ensure_future(call())
+        self._inflight_calls[key] = task
+        task.add_done_callback(lambda _: self._inflight_calls.pop(key, None))
+        self._coalesce_stats["leaders"] += 1
+        return await asyncio.shield(task)
+
+    async def _dispatch_tool_call(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        tool_name: str,
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Route tool call to stdio or HTTP transport"""
         # Route based on server type
         if server_config["type"] == "stdio":
-            return await self._call_stdio_tool(server_config, tool_name, parameters)
+            return await self._call_stdio_tool(server_name, server_config, tool_name, parameters)
         elif server_config["type"] == "http":
             return await self._call_http_tool(
                 url=server_config["url"],
@@ -654,6 +827,55 @@ class MCPBridge:
                 "error": f"Unsupported server type: {server_config['type']}"
             }
 
+    @_on_bridge_loop
+    async def call_many(
+        self,
+        calls: List[Any],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Call many independent tools concurrently (async)
+
+        Calls fan out across pooled sessions. Concurrency is capped globally by
+        max_concurrency and per server by the server's pool max_size.
+
+        Args:
+            calls: List of {"server": ..., "tool": ..., "parameters": {...}} dicts
+                   or (server_name, tool_name, parameters) tuples
+            max_concurrency: Maximum calls in flight across all servers
+
+        Returns:
+            List of result dicts in input order (failures isolated per call)
+        """
+        global_limit = asyncio.Semaphore(max(max_concurrency, 1))
+        server_limits: Dict[str, asyncio.Semaphore] = {}
+
+        def server_limit(server_name: str) -> asyncio.Semaphore:
+            if server_name not in server_limits:
+                server_config = self.direct_mcp_servers.get(server_name) or self.wrapped_mcp_servers.get(server_name) or {}
+                _, max_size = self._session_pool.get_limits(server_config)
+                server_limits[server_name] = asyncio.Semaphore(max_size)
+            return server_limits[server_name]
+
+        async def run_one(call: Any) -> Dict[str, Any]:
+            if isinstance(call, dict):
+                server_name = call.get("server")
+                tool_name = call.get("tool")
+                parameters = call.get("parameters", {})
+            else:
+                server_name, tool_name, parameters = call
+
+            async with global_limit:
+                async with server_limit(server_name):
+                    return await self.call_mcp_tool(server_name, tool_name, parameters or {})
+
+        results = await asyncio.gather(*(run_one(call) for call in calls), return_exceptions=True)
+
+        return [
+            {"success": False, "error": str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
     def get_direct_mcp_tools(self) -> Dict[str, Any]:
         """Get all direct MCP tool descriptions"""
         direct_tools = {}
@@ -685,9 +907,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_obsidian_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_obsidian_tool_async(tool_name, parameters))
 
-    async def _call_obsidian_tool_async(
+    @_on_bridge_loop
+    async def call_obsidian_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -702,21 +925,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        server_config = self.wrapped_mcp_servers.get("obsidian")
-        if not server_config:
-            return {"success": False, "error": "Obsidian server not configured"}
-
-        # Use temporary session per call
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                return self._parse_obsidian_result(tool_name, result.content)
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "obsidian", tool_name, parameters,
+            lambda content: self._parse_obsidian_result(tool_name, content)
+        )
 
     def _parse_obsidian_result(self, tool_name: str, result: Any) -> Dict[str, Any]:
         """Parse Obsidian MCP result into expected format"""
@@ -764,9 +976,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_filesystem_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_filesystem_tool_async(tool_name, parameters))
 
-    async def _call_filesystem_tool_async(
+    @_on_bridge_loop
+    async def call_filesystem_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -781,21 +994,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        server_config = self.wrapped_mcp_servers.get("filesystem")
-        if not server_config:
-            return {"success": False, "error": "Filesystem server not configured"}
-
-        # Use temporary session per call
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                return self._parse_filesystem_result(tool_name, result.content)
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "filesystem", tool_name, parameters,
+            lambda content: self._parse_filesystem_result(tool_name, content)
+        )
 
     def _parse_filesystem_result(self, tool_name: str, result: Any) -> Dict[str, Any]:
         """Parse Filesystem MCP result into expected format"""
@@ -842,9 +1044,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        return asyncio.run(self._call_chrome_devtools_tool_async(tool_name, parameters))
+        return self._run_sync(self.call_chrome_devtools_tool_async(tool_name, parameters))
 
-    async def _call_chrome_devtools_tool_async(
+    @_on_bridge_loop
+    async def call_chrome_devtools_tool_async(
         self,
         tool_name: str,
         parameters: Dict[str, Any]
@@ -859,21 +1062,10 @@ class MCPBridge:
         Returns:
             Dict containing tool execution results
         """
-        server_config = self.wrapped_mcp_servers.get("chrome_devtools")
-        if not server_config:
-            return {"success": False, "error": "Chrome DevTools server not configured"}
-
-        # Use temporary session per call
-        async with self._get_stdio_session(server_config) as session:
-            try:
-                # Call tool on session
-                result = await session.call_tool(tool_name, parameters)
-
-                # Parse result into expected format
-                return self._parse_chrome_devtools_result(tool_name, result.content)
-            except Exception as e:
-                import traceback
-                return {"success": False, "error": str(e), "traceback": traceback.format_exc()}
+        return await self._call_tool(
+            "chrome_devtools", tool_name, parameters,
+            lambda content: self._parse_chrome_devtools_result(tool_name, content)
+        )
 
     def _parse_chrome_devtools_result(self, tool_name: str, result: Any) -> Dict[str, Any]:
         """Parse Chrome DevTools MCP result into expected format"""
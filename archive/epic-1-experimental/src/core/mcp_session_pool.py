@@ -0,0 +1,423 @@
+"""
+MCP Session Pool - Persistent, pooled stdio sessions for MCPBridge
+
+Keeps MCP server subprocesses (npx/uvx) alive between tool calls instead of
+paying the cold start + initialize() handshake on every call.
+
+Each pooled session is owned by a dedicated asyncio task that holds the
+stdio_client/ClientSession context managers open. This keeps anyio cancel
+scopes entered and exited in the same task (the cause of the earlier
+ClosedResourceError failures with cached sessions).
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+
+class PooledSession:
+    """Single MCP server process + initialized ClientSession owned by a background task"""
+
+    def __init__(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        on_start: Optional[Callable[..., Awaitable[None]]] = None
+    ):
+        self.server_name = server_name
+        self.server_config = server_config
+        self.session: Optional[ClientSession] = None
+        self.server_info = None
+        self._on_start = on_start
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.in_use = False
+        self.broken = False
+        self.error: Optional[BaseException] = None
+
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        """True while the owner task is running and the session is usable"""
+        return (
+            not self.broken
+            and self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, startup_timeout: float):
+        """Spawn server process and wait for initialize() to complete"""
+        self._task = asyncio.create_task(
+            self._run(), name=f"mcp-session-{self.server_name}"
+        )
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=startup_timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise TimeoutError(
+                f"MCP server '{self.server_name}' did not initialize within {startup_timeout}s"
+            )
+
+        if self.error is not None:
+            raise RuntimeError(
+                f"MCP server '{self.server_name}' failed to start: {self.error}"
+            ) from self.error
+
+    async def _run(self):
+        """Owner task: hold stdio transport and session open until stopped"""
+        server_params = StdioServerParameters(
+            command=self.server_config["command"],
+            args=self.server_config["args"],
+            env=os.environ.copy()
+        )
+
+        try:
+            async with stdio_client(server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    init_result = await session.initialize()
+                    self.server_info = init_result.serverInfo
+                    if self._on_start:
+                        await self._on_start(self.server_name, self.server_config, session, init_result)
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            # Server crashed or failed to start - pool restarts it on next acquire
+            self.error = e
+        finally:
+            self.session = None
+            self.broken = True
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        """Health check via MCP ping request"""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    async def close(self, timeout: float = 5.0):
+        """Stop owner task, terminating the server process"""
+        self.broken = True
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except (asyncio.TimeoutError, Exception):
+            self._task.cancel()
+
+
+class MCPSessionPool:
+    """
+    Per-server pool of persistent MCP stdio sessions
+
+    Features:
+    - Per-server min/max pool sizes (server config "pool" overrides defaults)
+    - Health checks (MCP ping) on idle sessions
+    - Idle reaping down to min_size
+    - Automatic restart of crashed servers on next acquire / health check
+
+    Sessions are bound to the event loop they were created on. If the pool is
+    used from a new loop, sessions from the previous loop are discarded.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        startup_timeout: float = 120.0,
+        ping_timeout: float = 10.0,
+        on_session_start: Optional[Callable[..., Awaitable[None]]] = None,
+        on_session_lost: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize session pool
+
+        Args:
+            min_size: Default minimum warm sessions per server
+            max_size: Default maximum concurrent sessions per server
+            idle_timeout: Seconds before an idle session above min_size is reaped
+            health_check_interval: Seconds between background health checks (0 disables)
+            startup_timeout: Seconds to wait for server initialize()
+            ping_timeout: Seconds to wait for a health check ping
+            on_session_start: Async hook(server_name, server_config, session, init_result)
+                run after initialize() on every new server process
+            on_session_lost: Hook(server_name) run when a crashed session is dropped
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.startup_timeout = startup_timeout
+        self.ping_timeout = ping_timeout
+        self.on_session_start = on_session_start
+        self.on_session_lost = on_session_lost
+
+        self._sessions: Dict[str, List[PooledSession]] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._conditions: Dict[str, asyncio.Condition] = {}
+        self._spawning: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "restarted": 0,
+            "reaped": 0,
+            "health_failures": 0
+        }
+
+    def get_limits(self, server_config: Dict[str, Any]) -> Tuple[int, int]:
+        """Resolve (min_size, max_size) for a server"""
+        pool_config = server_config.get("pool", {})
+        min_size = pool_config.get("min_size", self.min_size)
+        max_size = max(pool_config.get("max_size", self.max_size), 1)
+        return min(min_size, max_size), max_size
+
+    def _bind_loop(self):
+        """Reset pool state if called from a different event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        # Sessions (and their owner tasks) from a previous loop are unusable
+        self._sessions = {}
+        self._conditions = {}
+        self._spawning = {}
+        self._health_task = None
+        self._loop = loop
+
+    def _ensure_health_task(self):
+        """Start background health check task if not running"""
+        if self.health_check_interval <= 0:
+            return
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(
+                self._health_loop(), name="mcp-session-pool-health"
+            )
+
+    def _condition(self, server_name: str) -> asyncio.Condition:
+        if server_name not in self._conditions:
+            self._conditions[server_name] = asyncio.Condition()
+        return self._conditions[server_name]
+
+    @asynccontextmanager
+    async def acquire(self, server_name: str, server_config: Dict[str, Any]):
+        """
+        Borrow a session for the duration of the context
+
+        Args:
+            server_name: Name of MCP server
+            server_config: Server configuration with command and args
+
+        Yields:
+            Initialized ClientSession
+        """
+        pooled = await self._checkout(server_name, server_config)
+        try:
+            yield pooled.session
+        except McpError:
+            # Error responses keep the session usable, but "connection closed"
+            # also surfaces as McpError - verify before returning it to the pool
+            if not await pooled.ping(self.ping_timeout):
+                pooled.broken = True
+            raise
+        except Exception:
+            # Transport failure leaves session in unknown state - force restart
+            pooled.broken = True
+            raise
+        finally:
+            await self._checkin(pooled)
+
+    async def _checkout(self, server_name: str, server_config: Dict[str, Any]) -> PooledSession:
+        """Get idle session, spawn a new one under max_size, or wait"""
+        self._bind_loop()
+        self._ensure_health_task()
+        self._configs[server_name] = server_config
+
+        _, max_size = self.get_limits(server_config)
+        condition = self._condition(server_name)
+
+        async with condition:
+            while True:
+                sessions = self._sessions.setdefault(server_name, [])
+                self._drop_dead(server_name, sessions)
+
+                for pooled in sessions:
+                    if not pooled.in_use:
+                        pooled.in_use = True
+                        pooled.last_used = time.monotonic()
+                        self._counters["reused"] += 1
+                        return pooled
+
+                if len(sessions) + self._spawning.get(server_name, 0) < max_size:
+                    self._spawning[server_name] = self._spawning.get(server_name, 0) + 1
+                    break
+
+                await condition.wait()
+
+        pooled = PooledSession(server_name, server_config, self.on_session_start)
+        try:
+            await pooled.start(self.startup_timeout)
+        except BaseException:
+            async with condition:
+                self._spawning[server_name] -= 1
+                condition.notify()
+            raise
+
+        pooled.in_use = True
+        async with condition:
+            self._spawning[server_name] -= 1
+            self._sessions[server_name].append(pooled)
+        self._counters["created"] += 1
+        return pooled
+
+    async def _checkin(self, pooled: PooledSession):
+        """Return session to pool (closing it if it broke while borrowed)"""
+        condition = self._condition(pooled.server_name)
+        async with condition:
+            pooled.in_use = False
+            pooled.last_used = time.monotonic()
+            if not pooled.alive:
+                self._drop_dead(pooled.server_name, self._sessions.get(pooled.server_name, []))
+            condition.notify()
+
+        if not pooled.alive:
+            await pooled.close()
+
+    def _drop_dead(self, server_name: str, sessions: List[PooledSession]):
+        """Remove crashed sessions so they are restarted on demand"""
+        dead = [s for s in sessions if not s.in_use and not s.alive]
+        for pooled in dead:
+            sessions.remove(pooled)
+            self._counters["restarted"] += 1
+        if dead and self.on_session_lost:
+            self.on_session_lost(server_name)
+
+    async def warm(self, server_name: str, server_config: Dict[str, Any]):
+        """Pre-spawn sessions up to the server's min_size"""
+        self._bind_loop()
+        self._ensure_health_task()
+        self._configs[server_name] = server_config
+
+        min_size, _ = self.get_limits(server_config)
+        condition = self._condition(server_name)
+
+        async with condition:
+            sessions = self._sessions.setdefault(server_name, [])
+            self._drop_dead(server_name, sessions)
+            missing = min_size - len(sessions) - self._spawning.get(server_name, 0)
+            if missing <= 0:
+                return
+            self._spawning[server_name] = self._spawning.get(server_name, 0) + missing
+
+        started = []
+        for _ in range(missing):
+            pooled = PooledSession(server_name, server_config, self.on_session_start)
+            try:
+                await pooled.start(self.startup_timeout)
+                started.append(pooled)
+            except Exception:
+                # Leave remaining slots for on-demand spawn; health check retries
+                pass
+
+        async with condition:
+            self._spawning[server_name] -= missing
+            self._sessions[server_name].extend(started)
+            self._counters["created"] += len(started)
+            condition.notify_all()
+
+    async def health_check(self):
+        """Ping idle sessions, reap idle ones above min_size, restart to min_size"""
+        now = time.monotonic()
+
+        for server_name in list(self._sessions.keys()):
+            server_config = self._configs[server_name]
+            min_size, _ = self.get_limits(server_config)
+            condition = self._condition(server_name)
+
+            # Reserve idle sessions so they aren't handed out mid-check
+            async with condition:
+                sessions = self._sessions[server_name]
+                self._drop_dead(server_name, sessions)
+                candidates = [s for s in sessions if not s.in_use]
+                for pooled in candidates:
+                    pooled.in_use = True
+                remaining = len(sessions)
+
+            to_close = []
+            for pooled in sorted(candidates, key=lambda s: s.last_used):
+                if remaining > min_size and now - pooled.last_used > self.idle_timeout:
+                    to_close.append(pooled)
+                    remaining -= 1
+                    self._counters["reaped"] += 1
+                elif not await pooled.ping(self.ping_timeout):
+                    to_close.append(pooled)
+                    remaining -= 1
+                    self._counters["health_failures"] += 1
+                    if self.on_session_lost:
+                        self.on_session_lost(server_name)
+
+            async with condition:
+                for pooled in candidates:
+                    pooled.in_use = False
+                    if pooled in to_close and pooled in sessions:
+                        sessions.remove(pooled)
+                condition.notify_all()
+
+            for pooled in to_close:
+                await pooled.close()
+
+            await self.warm(server_name, server_config)
+
+    async def _health_loop(self):
+        """Background task running periodic health checks"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.health_check()
+            except Exception:
+                # Health checks must never take down the pool
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters and per-server session counts"""
+        servers = {}
+        for server_name, sessions in self._sessions.items():
+            servers[server_name] = {
+                "total": len(sessions),
+                "in_use": sum(1 for s in sessions if s.in_use),
+                "alive": sum(1 for s in sessions if s.alive)
+            }
+        return {**self._counters, "servers": servers}
+
+    async def close_all(self):
+        """Stop health checks and terminate all pooled server processes"""
+        if self._health_task and not self._health_task.done():
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._health_task = None
+
+        sessions = [s for group in self._sessions.values() for s in group]
+        self._sessions = {}
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
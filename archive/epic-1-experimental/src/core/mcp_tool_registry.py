@@ -0,0 +1,257 @@
+"""
+MCP Tool Registry - Cached tool schemas per MCP server
+
+Replaces per-call list_tools() round-trips with an O(1) lookup table that is
+warmed once per server version and persisted to disk so new processes start warm.
+
+Entries are keyed by server name and stamped with a version hash derived from
+the server launch config and the serverInfo returned by initialize().
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    from jsonschema import Draft202012Validator
+except ImportError:
+    # jsonschema not installed - fall back to required/type checks
+    Draft202012Validator = None
+
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+    "null": type(None)
+}
+
+
+class ToolRegistry:
+    """
+    Tool schema registry keyed by MCP server name
+
+    Provides:
+    - O(1) tool existence/schema lookup
+    - Input schema validation with compiled validators
+    - Version-hash invalidation and disk export/import
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Initialize tool registry
+
+        Args:
+            cache_path: JSON file for persisted schemas (None disables persistence)
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._servers: Dict[str, Dict[str, Any]] = {}
+        self._validators: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+        if self.cache_path:
+            self.load()
+
+    @staticmethod
+    def compute_version_hash(server_config: Dict[str, Any], server_info: Any = None) -> str:
+        """
+        Compute version hash for a server process
+
+        Args:
+            server_config: Server launch configuration (command and args)
+            server_info: serverInfo from initialize() result (name/version)
+
+        Returns:
+            Hex digest identifying the server build
+        """
+        name = getattr(server_info, "name", None) if server_info is not None else None
+        version = getattr(server_info, "version", None) if server_info is not None else None
+        payload = json.dumps({
+            "command": server_config.get("command"),
+            "args": server_config.get("args", []),
+            "name": name,
+            "version": version
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def is_current(self, server_name: str, version_hash: str) -> bool:
+        """Check whether cached schemas match the running server version"""
+        entry = self._servers.get(server_name)
+        return entry is not None and entry["version_hash"] == version_hash
+
+    def register(self, server_name: str, tools: List[Any], version_hash: str):
+        """
+        Register tool schemas for a server
+
+        Args:
+            server_name: Name of MCP server
+            tools: Tool objects from list_tools() (or equivalent dicts)
+            version_hash: Version hash of the server process
+        """
+        tool_map = {}
+        for tool in tools:
+            if isinstance(tool, dict):
+                name = tool["name"]
+                description = tool.get("description") or ""
+                input_schema = tool.get("input_schema") or tool.get("inputSchema") or {}
+            else:
+                name = tool.name
+                description = tool.description or ""
+                input_schema = tool.inputSchema or {}
+            tool_map[name] = {
+                "name": name,
+                "description": description,
+                "input_schema": input_schema
+            }
+
+        with self._lock:
+            self._servers[server_name] = {
+                "version_hash": version_hash,
+                "tools": tool_map
+            }
+            self._drop_validators(server_name)
+
+        if self.cache_path:
+            self.save()
+
+    def invalidate(self, server_name: str):
+        """Drop cached schemas for a server (restart or version change)"""
+        with self._lock:
+            self._servers.pop(server_name, None)
+            self._drop_validators(server_name)
+
+    def _drop_validators(self, server_name: str):
+        for key in [k for k in self._validators if k[0] == server_name]:
+            del self._validators[key]
+
+    def is_warm(self, server_name: str) -> bool:
+        """Check whether server schemas are loaded"""
+        return server_name in self._servers
+
+    def has_tool(self, server_name: str, tool_name: str) -> bool:
+        """O(1) tool existence check"""
+        entry = self._servers.get(server_name)
+        return entry is not None and tool_name in entry["tools"]
+
+    def get_tool(self, server_name: str, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Get cached tool schema"""
+        entry = self._servers.get(server_name)
+        if entry is None:
+            return None
+        return entry["tools"].get(tool_name)
+
+    def list_tools(self, server_name: str) -> Dict[str, Dict[str, Any]]:
+        """Get all cached tools for a server"""
+        entry = self._servers.get(server_name)
+        return dict(entry["tools"]) if entry else {}
+
+    def get_descriptions(self, server_name: str) -> Dict[str, str]:
+        """Get tool name -> description mapping for a server"""
+        return {
+            name: tool["description"]
+            for name, tool in self.list_tools(server_name).items()
+        }
+
+    def validate_arguments(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: Dict[str, Any]
+    ) -> List[str]:
+        """
+        Validate tool arguments against cached input schema
+
+        Args:
+            server_name: Name of MCP server
+            tool_name: Name of tool
+            arguments: Arguments to validate
+
+        Returns:
+            List of validation error messages (empty if valid or schema unknown)
+        """
+        tool = self.get_tool(server_name, tool_name)
+        if not tool or not tool["input_schema"]:
+            return []
+
+        schema = tool["input_schema"]
+
+        if Draft202012Validator is not None:
+            key = (server_name, tool_name)
+            validator = self._validators.get(key)
+            if validator is None:
+                validator = Draft202012Validator(schema)
+                self._validators[key] = validator
+            return [
+                f"{'.'.join(str(p) for p in error.path) or '<root>'}: {error.message}"
+                for error in validator.iter_errors(arguments)
+            ]
+
+        # Fallback: required keys and top-level property types
+        errors = []
+        for required in schema.get("required", []):
+            if required not in arguments:
+                errors.append(f"<root>: '{required}' is a required property")
+        properties = schema.get("properties", {})
+        for key, value in arguments.items():
+            expected = properties.get(key, {}).get("type")
+            python_type = _JSON_TYPES.get(expected) if isinstance(expected, str) else None
+            if python_type and not isinstance(value, python_type):
+                errors.append(f"{key}: {value!r} is not of type '{expected}'")
+        return errors
+
+    def save(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Export registry to disk (atomic replace)
+
+        Args:
+            path: Target file (default: cache_path)
+
+        Returns:
+            Path written, or None if no path configured
+        """
+        target = Path(path) if path else self.cache_path
+        if not target:
+            return None
+
+        with self._lock:
+            payload = json.dumps({"servers": self._servers}, ensure_ascii=True)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, target)
+        return target
+
+    def load(self, path: Optional[Path] = None) -> int:
+        """
+        Import registry from disk
+
+        Args:
+            path: Source file (default: cache_path)
+
+        Returns:
+            Number of servers loaded
+        """
+        source = Path(path) if path else self.cache_path
+        if not source or not source.exists():
+            return 0
+
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Corrupt cache is not fatal - schemas are re-listed on first use
+            return 0
+
+        servers = data.get("servers", {})
+        with self._lock:
+            self._servers.update(servers)
+            self._validators.clear()
+        return len(servers)
@@ -0,0 +1,461 @@
+"""
+OTLP Export - MADF events as OpenTelemetry trace spans
+Story 1.4 Task 1 Phase 1 implementation
+
+Converts QuickLogger events into OTLP/JSON span records
+(ExportTraceServiceRequest), so agent and tool latencies can be viewed in
+standard trace tooling (Jaeger, Tempo, the OpenTelemetry Collector) without
+querying Postgres:
+
+- tracing.Span completion events become spans with their own ids
+- other events with a duration (tool calls, agent actions) become leaf spans
+  under the span they were logged in
+- events without a trace_id are grouped into one trace per workflow/session
+
+OTLPTraceExporter takes events from QuickLogger.log() with a single deque
+append; a background thread converts and sends them in batches, either
+appended to a file (one request per line, the format the Collector's
+otlpjsonfile receiver reads) or POSTed to an OTLP/HTTP endpoint.
+LocalCollector is a minimal stand-in endpoint that writes what it receives
+to a file.
+
+Configuration (environment):
+    MADF_OTLP_ENDPOINT: OTLP/HTTP traces URL, e.g. http://localhost:4318/v1/traces
+    MADF_OTLP_FILE: File to append OTLP/JSON requests to
+    OTEL_SERVICE_NAME: service.name resource attribute (default: madf)
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import threading
+import urllib.request
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+from .log_rotation import open_log
+
+
+SCOPE_NAME = "madf.quick_logger"
+
+SPAN_KIND_INTERNAL = 1
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Event fields exported as span attributes
+ATTRIBUTE_FIELDS = {
+    "agent_name": "madf.agent_name",
+    "event_type": "madf.event_type",
+    "session_id": "madf.session_id",
+    "story_id": "madf.story_id",
+    "workflow_id": "madf.workflow_id",
+    "thread_id": "madf.thread_id",
+    "tool": "madf.tool",
+    "action": "madf.action",
+    "tokens_used": "madf.tokens_used",
+    "context_percent": "madf.context_percent"
+}
+
+
+def _hex_id(value: Any, length: int) -> str:
+    """value if it already is a hex id of this length, else a stable hash of it"""
+    text = str(value)
+    if len(text) == length:
+        try:
+            int(text, 16)
+            return text.lower()
+        except ValueError:
+            pass
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:length]
+
+
+def _unix_nano(timestamp: str) -> int:
+    dt = datetime.fromisoformat(timestamp)
+    return int(dt.timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    """OTLP/JSON KeyValue (int64 values are encoded as strings)"""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def event_to_span(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert one QuickLogger event into an OTLP/JSON span
+
+    Returns:
+        Span dict, or None for events without a duration (session_start, ...)
+    """
+    is_span = "span_name" in event and event.get("span_id")
+    duration_ns = event.get("duration_ns")
+    if duration_ns is None:
+        duration_ms = event.get("duration_ms")
+        if not is_span and not (isinstance(duration_ms, (int, float)) and duration_ms > 0):
+            return None
+        duration_ns = int((duration_ms or 0) * 1_000_000)
+
+    details = event.get("details") if isinstance(event.get("details"), dict) else {}
+    tool = event.get("tool") or details.get("tool")
+    action = event.get("action") or details.get("action")
+
+    if is_span:
+        name = event["span_name"]
+        span_id = _hex_id(event["span_id"], 16)
+        parent_span_id = event.get("parent_span_id")
+        start_ns = _unix_nano(event.get("start_time") or event["timestamp"])
+        end_ns = start_ns + duration_ns
+    else:
+        name = " ".join(part for part in (event.get("event_type"), tool or action) if part)
+        span_id = _hex_id(json.dumps(event, sort_keys=True, default=str), 16)
+        # Logged inside a span: child of that span
+        parent_span_id = event.get("span_id")
+        end_ns = _unix_nano(event["timestamp"])
+        start_ns = end_ns - duration_ns
+
+    trace_key = event.get("trace_id") or event.get("workflow_id") or event.get("session_id") or span_id
+    values = {field: event.get(field) for field in ATTRIBUTE_FIELDS}
+    values["tool"], values["action"] = tool, action
+    attributes = [
+        _attribute(ATTRIBUTE_FIELDS[field], value) for field, value in values.items() if value is not None
+    ]
+    agent = event.get("agent")
+    if agent and agent != event.get("agent_name"):
+        attributes.append(_attribute("madf.agent", agent))
+
+    span = {
+        "traceId": _hex_id(trace_key, 32),
+        "spanId": span_id,
+        "name": name,
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": attributes,
+        "status": {"code": STATUS_OK}
+    }
+    if parent_span_id:
+        span["parentSpanId"] = _hex_id(parent_span_id, 16)
+    if event.get("success") is False or event.get("category") == "error":
+        span["status"] = {"code": STATUS_ERROR, "message": str(details.get("error") or "")}
+    return span
+
+
+def build_request(spans: List[Dict[str, Any]], service_name: Optional[str] = None) -> Dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ExportTraceServiceRequest"""
+    service_name = service_name or os.getenv("OTEL_SERVICE_NAME", "madf")
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}]
+        }]
+    }
+
+
+class OTLPTraceExporter:
+    """
+    Batched, background OTLP/JSON span exporter
+
+    submit() only appends the event to a bounded deque (thread-safe without
+    a lock); conversion and I/O run on the exporter thread. When the queue
+    is full the oldest events are dropped. Evicted events and events that
+    cannot be converted are counted in dropped_events; failed sends drop
+    their batch (failed_requests); last_error keeps the most recent reason.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        file_path: Optional[Path] = None,
+        service_name: Optional[str] = None,
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+        max_queue: int = 50_000,
+        timeout: float = 5.0
+    ):
+        """
+        Initialize exporter and start its thread
+
+        Args:
+            endpoint: OTLP/HTTP traces URL (default: MADF_OTLP_ENDPOINT)
+            file_path: File to append requests to (default: MADF_OTLP_FILE)
+            service_name: service.name resource attribute (default: OTEL_SERVICE_NAME or madf)
+            batch_size: Max spans per request; a full batch triggers an early send
+            flush_interval: Max seconds between sends
+            max_queue: Events kept before the oldest are dropped
+            timeout: HTTP request timeout in seconds
+        """
+        self.endpoint = endpoint or os.getenv("MADF_OTLP_ENDPOINT")
+        file_path = file_path or os.getenv("MADF_OTLP_FILE")
+        self.file_path = Path(file_path) if file_path else None
+        if not self.endpoint and not self.file_path:
+            raise ValueError("OTLPTraceExporter needs an endpoint or a file_path")
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self._queue = deque(maxlen=max_queue)
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.exported_spans = 0
+        self.failed_requests = 0
+        self.dropped_events = 0
+        self.last_error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, name="madf-otlp-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls) -> Optional["OTLPTraceExporter"]:
+        """Exporter configured by MADF_OTLP_ENDPOINT / MADF_OTLP_FILE, None if neither is set"""
+        if not (os.getenv("MADF_OTLP_ENDPOINT") or os.getenv("MADF_OTLP_FILE")):
+            return None
+        return cls()
+
+    def submit(self, event: Dict[str, Any]):
+        """Queue an event for export (hot path)"""
+        if len(self._queue) == self._queue.maxlen:
+            # Full: the append evicts the oldest event
+            self.dropped_events += 1
+        self._queue.append(event)
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Convert and send everything queued so far
+
+        Returns:
+            Number of spans sent
+        """
+        sent = 0
+        while self._queue:
+            spans = []
+            while self._queue and len(spans) < self.batch_size:
+                span = self.convert(self._queue.popleft())
+                if span is not None:
+                    spans.append(span)
+            sent += self.send_spans(spans)
+        return sent
+
+    def convert(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """event_to_span, counting malformed events (missing/unparseable timestamp, ...) as dropped"""
+        try:
+            return event_to_span(event)
+        except Exception as e:
+            self.dropped_events += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            return None
+
+    def send_spans(self, spans: List[Dict[str, Any]]) -> int:
+        """
+        Send one batch of converted spans now
+
+        Returns:
+            Number of spans sent (0 if the request failed)
+        """
+        if not spans:
+            return 0
+        with self._send_lock:
+            if not self._send(build_request(spans, self.service_name)):
+                return 0
+            self.exported_spans += len(spans)
+        return len(spans)
+
+    def _send(self, request: Dict[str, Any]) -> bool:
+        try:
+            body = json.dumps(request, separators=(",", ":"))
+            if self.file_path is not None:
+                self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.file_path, 'a', encoding='utf-8') as f:
+                    f.write(body + "\n")
+            if self.endpoint:
+                http_request = urllib.request.Request(
+                    self.endpoint, data=body.encode("utf-8"),
+                    headers={"Content-Type": "application/json"}, method="POST"
+                )
+                with urllib.request.urlopen(http_request, timeout=self.timeout) as response:
+                    response.read()
+            return True
+        except Exception as e:
+            # Export must never break logging or stop the thread; the batch is dropped
+            self.failed_requests += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+
+    def close(self):
+        """Stop the thread and send what is left"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=self.timeout + 1)
+        self.flush()
+        atexit.unregister(self.close)
+
+
+def export_log_file(jsonl_path: Path, exporter: OTLPTraceExporter) -> int:
+    """
+    Export the spans of an existing JSONL log (.jsonl or .jsonl.zst)
+
+    Converts and sends batches on the calling thread, bypassing the
+    exporter's bounded queue so a large file is never truncated.
+
+    Returns:
+        Number of spans sent
+    """
+    sent = 0
+    spans = []
+    with open_log(jsonl_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            span = exporter.convert(event)
+            if span is not None:
+                spans.append(span)
+            if len(spans) >= exporter.batch_size:
+                sent += exporter.send_spans(spans)
+                spans = []
+    return sent + exporter.send_spans(spans)
+
+
+class LocalCollector:
+    """
+    Minimal OTLP/HTTP stand-in: accepts POST /v1/traces and appends each
+    JSON request body as one line to a file (readable by export tooling or
+    the Collector's otlpjsonfile receiver)
+    """
+
+    def __init__(self, out_path: Path, host: str = "127.0.0.1", port: int = 4318):
+        """
+        Initialize collector (call start() or serve_forever())
+
+        Args:
+            out_path: File receiving one request per line
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self.out_path = Path(out_path)
+        self.requests: List[Dict[str, Any]] = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path.rstrip("/") != "/v1/traces":
+                    self.send_error(404)
+                    return
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    request = json.loads(body)
+                except ValueError:
+                    self.send_error(400)
+                    return
+                collector._store(request)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/traces"
+
+    def _store(self, request: Dict[str, Any]):
+        with self._lock:
+            self.requests.append(request)
+            self.out_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.out_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(request, separators=(",", ":")) + "\n")
+
+    def spans(self) -> Iterable[Dict[str, Any]]:
+        """All spans received so far"""
+        with self._lock:
+            requests = list(self.requests)
+        for request in requests:
+            for resource_spans in request.get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    yield from scope_spans.get("spans", [])
+
+    def start(self) -> "LocalCollector":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def main():
+    """CLI entry point for exporting logs or running the local collector"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export MADF logs as OTLP trace spans")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export JSONL log files")
+    export_parser.add_argument("log_files", type=Path, nargs="+", help="QuickLogger .jsonl / .jsonl.zst files")
+    export_parser.add_argument("--endpoint", default=None, help="OTLP/HTTP traces URL (default: MADF_OTLP_ENDPOINT)")
+    export_parser.add_argument("--out", type=Path, default=None, help="OTLP/JSON output file (default: MADF_OTLP_FILE)")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the local collector stand-in")
+    serve_parser.add_argument("--out", type=Path, required=True, help="File receiving OTLP/JSON requests")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=4318)
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        collector = LocalCollector(args.out, args.host, args.port)
+        print(f"[OK] Collecting OTLP traces at {collector.endpoint} -> {args.out}")
+        try:
+            collector.serve_forever()
+        except KeyboardInterrupt:
+            collector.stop()
+        return
+
+    exporter = OTLPTraceExporter(endpoint=args.endpoint, file_path=args.out)
+    total = sum(export_log_file(path, exporter) for path in args.log_files)
+    exporter.close()
+    print(f"[OK] Exported {total} spans ({exporter.failed_requests} failed requests, "
+          f"{exporter.dropped_events} unconvertible events)")
+
+
+if __name__ == "__main__":
+    main()
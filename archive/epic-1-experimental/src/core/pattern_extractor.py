@@ -49,15 +49,17 @@ class PatternExtractor:
         Returns:
             List of error patterns with metadata
         """
+        params = {"min_occurrences": min_occurrences}
         time_filter = ""
         if time_window_hours:
-            cutoff = datetime.now() - timedelta(hours=time_window_hours)
-            time_filter = f"AND timestamp >= '{cutoff.isoformat()}'"
+            params["cutoff"] = datetime.now() - timedelta(hours=time_window_hours)
+            time_filter = "AND timestamp >= %(cutoff)s"
 
         query = f"""
         SELECT
-            details->>'error' as error_message,
-            details->>'error_type' as error_type,
+            details->>'error_fingerprint' as fingerprint,
+            MIN(details->>'error') as error_message,
+            MIN(details->>'error_type') as error_type,
             COUNT(*) as occurrence_count,
             array_agg(DISTINCT agent_name) as affected_agents,
             array_agg(DISTINCT event_type) as event_types,
@@ -66,15 +68,14 @@ class PatternExtractor:
             AVG(duration_ms) as avg_duration_before_error,
             COUNT(DISTINCT session_id) as affected_sessions
         FROM madf_events
-        WHERE success = false
-          AND details->>'error' IS NOT NULL
+        WHERE details->>'error_fingerprint' IS NOT NULL
           {time_filter}
-        GROUP BY details->>'error', details->>'error_type'
-        HAVING COUNT(*) >= {min_occurrences}
+        GROUP BY details->>'error_fingerprint'
+        HAVING COUNT(*) >= %(min_occurrences)s
         ORDER BY occurrence_count DESC
         """
 
-        return await self.pg.execute_query(query)
+        return await self.pg.execute_query(query, params)
 
     async def find_slow_operations(
         self,
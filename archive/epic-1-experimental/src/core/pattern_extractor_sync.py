@@ -6,9 +6,199 @@ Identifies recurring patterns in execution logs for DSPy training
 Extracts actionable insights from error patterns
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-from .postgres_manager_sync import PostgresManager
+import os
+import warnings
+from typing import Dict, Any, List, Optional, Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from .local_analytics import create_analytics_backend
+from .latency_sketch import LatencySketchStore, DEFAULT_QUANTILES
+
+try:
+    from .postgres_manager_sync import PostgresManager
+except ImportError:
+    # psycopg not installed: only the local backend is available
+    PostgresManager = None
+
+
+# Open time bounds (aware, so every call binds timestamptz parameters and
+# reuses the same prepared statement)
+MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+MAX_TIME = datetime.max.replace(tzinfo=timezone.utc)
+
+# Named, parameterised analytic queries. Statement text never changes between
+# calls, so psycopg prepares each one once per connection and Postgres reuses
+# the plan. Time-bounded queries always filter on timestamp so partitions are
+# pruned at execution time. Hot details keys are read from the generated
+# detail_* columns (PostgresManager DETAIL_COLUMNS) so they can use indexes.
+PATTERN_QUERIES: Dict[str, str] = {
+    "error_patterns": """
+        SELECT
+            detail_error_fingerprint as fingerprint,
+            MIN(detail_error) as error_message,
+            MIN(detail_error_type) as error_type,
+            COUNT(*) as occurrence_count,
+            array_agg(DISTINCT agent_name) as affected_agents,
+            array_agg(DISTINCT event_type) as event_types,
+            MIN(timestamp) as first_seen,
+            MAX(timestamp) as last_seen,
+            AVG(duration_ms) as avg_duration_before_error,
+            COUNT(DISTINCT session_id) as affected_sessions
+        FROM madf_events
+        WHERE detail_error_fingerprint IS NOT NULL
+          AND timestamp >= %(start_time)s AND timestamp < %(end_time)s
+        GROUP BY detail_error_fingerprint
+        HAVING COUNT(*) >= %(min_occurrences)s
+        ORDER BY occurrence_count DESC
+    """,
+    "slow_operations": """
+        SELECT
+            agent_name,
+            event_type,
+            detail_action as action,
+            COUNT(*) as occurrence_count,
+            AVG(duration_ms) as avg_duration_ms,
+            MAX(duration_ms) as max_duration_ms,
+            MIN(duration_ms) as min_duration_ms,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_duration_ms
+        FROM madf_events
+        WHERE duration_ms >= %(duration_threshold_ms)s
+          AND timestamp >= %(start_time)s AND timestamp < %(end_time)s
+        GROUP BY agent_name, event_type, detail_action
+        HAVING COUNT(*) >= 3
+        ORDER BY avg_duration_ms DESC
+        LIMIT %(limit)s
+    """,
+    "success_patterns": """
+        SELECT
+            agent_name,
+            event_type,
+            COUNT(*) as occurrence_count,
+            AVG(confidence_score) as avg_confidence,
+            AVG(duration_ms) as avg_duration_ms,
+            AVG(tokens_used) as avg_tokens_used,
+            AVG(impact_score) as avg_impact_score,
+            COUNT(*) FILTER (WHERE success = true) as success_count,
+            COUNT(*) FILTER (WHERE success = false) as failure_count
+        FROM madf_events
+        WHERE confidence_score >= %(min_confidence)s
+          AND success = true
+          AND timestamp >= %(start_time)s AND timestamp < %(end_time)s
+        GROUP BY agent_name, event_type
+        HAVING COUNT(*) >= 5
+        ORDER BY avg_confidence DESC, occurrence_count DESC
+        LIMIT %(limit)s
+    """,
+    "agent_handoffs": """
+        SELECT
+            details->>'from_agent' as from_agent,
+            details->>'to_agent' as to_agent,
+            details->>'reason' as reason,
+            COUNT(*) as transition_count,
+            AVG(duration_ms) as avg_handoff_duration_ms,
+            COUNT(*) FILTER (WHERE success = true) as successful_handoffs,
+            COUNT(*) FILTER (WHERE success = false) as failed_handoffs
+        FROM madf_events
+        WHERE event_type = 'agent_transition'
+          AND details->>'from_agent' IS NOT NULL
+          AND details->>'to_agent' IS NOT NULL
+        GROUP BY details->>'from_agent', details->>'to_agent', details->>'reason'
+        HAVING COUNT(*) >= 2
+        ORDER BY transition_count DESC
+    """,
+    "token_inefficiency": """
+        SELECT
+            agent_name,
+            event_type,
+            detail_tool as tool_name,
+            COUNT(*) as occurrence_count,
+            AVG(tokens_used) as avg_tokens,
+            AVG(context_percent) as avg_context_percent,
+            AVG(duration_ms) as avg_duration_ms,
+            AVG(tokens_used / NULLIF(duration_ms, 0)) as tokens_per_ms
+        FROM madf_events
+        WHERE tokens_used >= %(high_token_threshold)s
+        GROUP BY agent_name, event_type, detail_tool
+        HAVING COUNT(*) >= 3
+        ORDER BY avg_tokens DESC
+        LIMIT %(limit)s
+    """,
+    "decision_patterns": """
+        SELECT
+            agent_name,
+            details->>'decision_point' as decision_point,
+            details->>'choice_made' as choice_made,
+            COUNT(*) as decision_count,
+            AVG(confidence_score) as avg_confidence,
+            COUNT(*) FILTER (WHERE success = true) as successful_outcomes,
+            COUNT(*) FILTER (WHERE success = false) as failed_outcomes,
+            AVG(duration_ms) as avg_decision_time_ms
+        FROM madf_events
+        WHERE event_type = 'decision'
+          AND details->>'decision_point' IS NOT NULL
+        GROUP BY agent_name, details->>'decision_point', details->>'choice_made'
+        HAVING COUNT(*) >= 2
+        ORDER BY decision_count DESC
+    """
+}
+
+_TRAINING_COLUMNS = """
+        SELECT
+            session_id,
+            story_id,
+            agent_name,
+            event_type,
+            timestamp,
+            duration_ms,
+            tokens_used,
+            context_percent,
+            success,
+            confidence_score,
+            details
+        FROM madf_events
+"""
+_TRAINING_FILTERS = {
+    "success": "WHERE success = true AND confidence_score >= 0.8",
+    "failure": "WHERE success = false",
+    "slow": "WHERE duration_ms > 1000",
+    "all": ""
+}
+for _pattern_type, _filter in _TRAINING_FILTERS.items():
+    PATTERN_QUERIES[f"training_{_pattern_type}"] = (
+        f"{_TRAINING_COLUMNS}        {_filter}\n        ORDER BY timestamp DESC\n        LIMIT %(limit)s\n"
+    )
+
+
+def find_seq_scans(plan: Any, table_prefix: str = "madf_events") -> List[str]:
+    """
+    Collect relations read by sequential scan in an EXPLAIN (FORMAT JSON) plan
+
+    Args:
+        plan: Parsed EXPLAIN output (list/dict tree)
+        table_prefix: Relation name prefix to flag (matches partitions too)
+
+    Returns:
+        Relation names scanned sequentially
+    """
+    found = []
+    if isinstance(plan, list):
+        for item in plan:
+            found.extend(find_seq_scans(item, table_prefix))
+    elif isinstance(plan, dict):
+        relation = plan.get("Relation Name") or ""
+        if plan.get("Node Type") == "Seq Scan" and relation.startswith(table_prefix):
+            found.append(relation)
+        for key in ("Plan", "Plans"):
+            if key in plan:
+                found.extend(find_seq_scans(plan[key], table_prefix))
+    return found
+
+
+def _warn_seq_scan(query_name: str, relations: List[str]):
+    warnings.warn(
+        f"Query '{query_name}' sequentially scans {', '.join(sorted(set(relations)))}",
+        RuntimeWarning,
+        stacklevel=4
+    )
 
 
 class PatternExtractor:
@@ -19,25 +209,102 @@ class PatternExtractor:
     - Error patterns that can be prevented
     - Performance bottlenecks that can be optimized
     - Successful patterns that can be replicated
+
+    Queries come from PATTERN_QUERIES and run as prepared statements.
     """
 
-    def __init__(self, postgres_manager: Optional[PostgresManager] = None):
+    def __init__(
+        self,
+        postgres_manager: Optional["PostgresManager"] = None,
+        capture_plans: Optional[bool] = None,
+        explain_hook: Optional[Callable[[str, List[str]], None]] = None,
+        sketch_store: Optional[LatencySketchStore] = None
+    ):
         """
         Initialize pattern extractor
 
         Args:
-            postgres_manager: PostgresManager instance (creates new if None)
+            postgres_manager: PostgresManager or LocalAnalyticsBackend
+                (default: create_analytics_backend())
+            capture_plans: EXPLAIN each catalog query on first use and flag
+                sequential scans over madf_events (default: MADF_CAPTURE_QUERY_PLANS)
+            explain_hook: Called with (query_name, seq_scanned_relations) when a
+                scan is flagged (default: emit RuntimeWarning)
+            sketch_store: Latency sketches written by QuickLogger
+                (default: LatencySketchStore())
         """
-        self.pg = postgres_manager or PostgresManager()
+        self.pg = postgres_manager or create_analytics_backend()
+        self.capture_plans = capture_plans if capture_plans is not None else (
+            os.getenv("MADF_CAPTURE_QUERY_PLANS", "0").lower() in ("1", "true", "yes"))
+        self.explain_hook = explain_hook or _warn_seq_scan
+        self.seq_scans: Dict[str, List[str]] = {}
+        self._explained: set = set()
+        self.sketches = sketch_store or LatencySketchStore()
 
     def initialize(self):
         """Initialize Postgres connection"""
         self.pg.initialize()
 
+    @staticmethod
+    def _time_bounds(
+        start_time: Optional[datetime],
+        end_time: Optional[datetime]
+    ) -> Dict[str, datetime]:
+        """Timestamp parameters (open ends use MIN_TIME / MAX_TIME; naive values are local time)"""
+        return {
+            "start_time": start_time.astimezone(timezone.utc) if start_time else MIN_TIME,
+            "end_time": end_time.astimezone(timezone.utc) if end_time else MAX_TIME
+        }
+
+    def run_query(self, name: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Run a catalog query as a prepared statement
+
+        Args:
+            name: PATTERN_QUERIES key
+            params: Named query parameters
+
+        Returns:
+            Result rows
+        """
+        params = params or {}
+        if self.capture_plans and name not in self._explained:
+            self._explained.add(name)
+            self.explain(name, params)
+        return self.pg.execute_query(self._query_text(name), params, prepare=True)
+
+    def _query_text(self, name: str) -> str:
+        """Catalog SQL for the backend's dialect (LocalAnalyticsBackend overrides some)"""
+        return getattr(self.pg, "query_overrides", {}).get(name) or PATTERN_QUERIES[name]
+
+    def explain(self, name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Capture the plan of a catalog query and flag sequential scans
+
+        Args:
+            name: PATTERN_QUERIES key
+            params: Named query parameters
+
+        Returns:
+            {"query": name, "plan": EXPLAIN JSON, "seq_scans": [relation names]}
+            (plan is None on non-Postgres backends)
+        """
+        if getattr(self.pg, "dialect", "postgres") != "postgres":
+            return {"query": name, "plan": None, "seq_scans": []}
+        rows = self.pg.execute_query(f"EXPLAIN (FORMAT JSON) {PATTERN_QUERIES[name]}", params or {})
+        plan = rows[0]["QUERY PLAN"] if rows else []
+        seq_scans = find_seq_scans(plan)
+        if seq_scans:
+            self.seq_scans[name] = seq_scans
+            self.explain_hook(name, seq_scans)
+        return {"query": name, "plan": plan, "seq_scans": seq_scans}
+
     def find_error_patterns(
         self,
         min_occurrences: int = 3,
-        time_window_hours: Optional[int] = None
+        time_window_hours: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Find recurring error patterns
@@ -45,41 +312,26 @@ class PatternExtractor:
         Args:
             min_occurrences: Minimum times error must occur to be considered a pattern
             time_window_hours: Only consider errors in last N hours (None = all time)
+            start_time: Only consider errors at or after this time
+            end_time: Only consider errors before this time
 
         Returns:
             List of error patterns with metadata
         """
-        time_filter = ""
         if time_window_hours:
-            cutoff = datetime.now() - timedelta(hours=time_window_hours)
-            time_filter = f"AND timestamp >= '{cutoff.isoformat()}'"
+            start_time = datetime.now(timezone.utc) - timedelta(hours=time_window_hours)
 
-        query = f"""
-        SELECT
-            details->>'error' as error_message,
-            details->>'error_type' as error_type,
-            COUNT(*) as occurrence_count,
-            array_agg(DISTINCT agent_name) as affected_agents,
-            array_agg(DISTINCT event_type) as event_types,
-            MIN(timestamp) as first_seen,
-            MAX(timestamp) as last_seen,
-            AVG(duration_ms) as avg_duration_before_error,
-            COUNT(DISTINCT session_id) as affected_sessions
-        FROM madf_events
-        WHERE category = 'error'
-          AND details->>'error' IS NOT NULL
-          {time_filter}
-        GROUP BY details->>'error', details->>'error_type'
-        HAVING COUNT(*) >= {min_occurrences}
-        ORDER BY occurrence_count DESC
-        """
-
-        return self.pg.execute_query(query)
+        return self.run_query("error_patterns", {
+            "min_occurrences": min_occurrences,
+            **self._time_bounds(start_time, end_time)
+        })
 
     def find_slow_operations(
         self,
         duration_threshold_ms: int = 1000,
-        limit: int = 10
+        limit: int = 10,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Find operations that consistently take too long
@@ -87,34 +339,49 @@ class PatternExtractor:
         Args:
             duration_threshold_ms: Duration threshold in milliseconds
             limit: Maximum patterns to return
+            start_time: Only consider operations at or after this time
+            end_time: Only consider operations before this time
 
         Returns:
             List of slow operation patterns
         """
-        query = f"""
-        SELECT
-            agent_name,
-            event_type,
-            details->>'action' as action,
-            COUNT(*) as occurrence_count,
-            AVG(duration_ms) as avg_duration_ms,
-            MAX(duration_ms) as max_duration_ms,
-            MIN(duration_ms) as min_duration_ms,
-            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration_ms) as p95_duration_ms
-        FROM madf_events
-        WHERE duration_ms >= {duration_threshold_ms}
-        GROUP BY agent_name, event_type, details->>'action'
-        HAVING COUNT(*) >= 3
-        ORDER BY avg_duration_ms DESC
-        LIMIT {limit}
+        return self.run_query("slow_operations", {
+            "duration_threshold_ms": duration_threshold_ms,
+            "limit": limit,
+            **self._time_bounds(start_time, end_time)
+        })
+
+    def get_latency_percentiles(
+        self,
+        agent_name: Optional[str] = None,
+        tool: Optional[str] = None,
+        action: Optional[str] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> Dict[str, Any]:
         """
+        Latency percentiles from the logger's streaming sketches
+
+        Answered from merged per (agent, tool, action) sketches, so cost does
+        not grow with the number of events. Use find_slow_operations for
+        per-operation breakdowns over a time range.
+
+        Args:
+            agent_name: Agent to report (None = all)
+            tool: Tool to report (None = all)
+            action: Action to report (None = all)
+            quantiles: Quantiles to return
 
-        return self.pg.execute_query(query)
+        Returns:
+            Dict with p50/p95/p99 (by default), mean, min, max, count ({} if no samples)
+        """
+        return self.sketches.percentiles(agent_name, tool, action, quantiles)
 
     def find_success_patterns(
         self,
         min_confidence: float = 0.8,
-        limit: int = 10
+        limit: int = 10,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Find patterns associated with successful execution
@@ -122,31 +389,17 @@ class PatternExtractor:
         Args:
             min_confidence: Minimum confidence score threshold
             limit: Maximum patterns to return
+            start_time: Only consider events at or after this time
+            end_time: Only consider events before this time
 
         Returns:
             List of successful execution patterns
         """
-        query = f"""
-        SELECT
-            agent_name,
-            event_type,
-            COUNT(*) as occurrence_count,
-            AVG(confidence_score) as avg_confidence,
-            AVG(duration_ms) as avg_duration_ms,
-            AVG(tokens_used) as avg_tokens_used,
-            AVG(impact_score) as avg_impact_score,
-            COUNT(*) FILTER (WHERE success = true) as success_count,
-            COUNT(*) FILTER (WHERE success = false) as failure_count
-        FROM madf_events
-        WHERE confidence_score >= {min_confidence}
-          AND success = true
-        GROUP BY agent_name, event_type
-        HAVING COUNT(*) >= 5
-        ORDER BY avg_confidence DESC, occurrence_count DESC
-        LIMIT {limit}
-        """
-
-        return self.pg.execute_query(query)
+        return self.run_query("success_patterns", {
+            "min_confidence": float(min_confidence),
+            "limit": limit,
+            **self._time_bounds(start_time, end_time)
+        })
 
     def find_agent_handoff_patterns(self) -> List[Dict[str, Any]]:
         """
@@ -155,25 +408,7 @@ class PatternExtractor:
         Returns:
             List of agent handoff patterns with frequency
         """
-        query = """
-        SELECT
-            details->>'from_agent' as from_agent,
-            details->>'to_agent' as to_agent,
-            details->>'reason' as reason,
-            COUNT(*) as transition_count,
-            AVG(duration_ms) as avg_handoff_duration_ms,
-            COUNT(*) FILTER (WHERE success = true) as successful_handoffs,
-            COUNT(*) FILTER (WHERE success = false) as failed_handoffs
-        FROM madf_events
-        WHERE event_type = 'agent_transition'
-          AND details->>'from_agent' IS NOT NULL
-          AND details->>'to_agent' IS NOT NULL
-        GROUP BY details->>'from_agent', details->>'to_agent', details->>'reason'
-        HAVING COUNT(*) >= 2
-        ORDER BY transition_count DESC
-        """
-
-        return self.pg.execute_query(query)
+        return self.run_query("agent_handoffs")
 
     def find_token_inefficiency_patterns(
         self,
@@ -190,25 +425,10 @@ class PatternExtractor:
         Returns:
             List of token inefficiency patterns
         """
-        query = f"""
-        SELECT
-            agent_name,
-            event_type,
-            details->>'tool' as tool_name,
-            COUNT(*) as occurrence_count,
-            AVG(tokens_used) as avg_tokens,
-            AVG(context_percent) as avg_context_percent,
-            AVG(duration_ms) as avg_duration_ms,
-            AVG(tokens_used / NULLIF(duration_ms, 0)) as tokens_per_ms
-        FROM madf_events
-        WHERE tokens_used >= {high_token_threshold}
-        GROUP BY agent_name, event_type, details->>'tool'
-        HAVING COUNT(*) >= 3
-        ORDER BY avg_tokens DESC
-        LIMIT {limit}
-        """
-
-        return self.pg.execute_query(query)
+        return self.run_query("token_inefficiency", {
+            "high_token_threshold": high_token_threshold,
+            "limit": limit
+        })
 
     def find_decision_patterns(self) -> List[Dict[str, Any]]:
         """
@@ -217,25 +437,7 @@ class PatternExtractor:
         Returns:
             List of decision patterns with outcomes
         """
-        query = """
-        SELECT
-            agent_name,
-            details->>'decision_point' as decision_point,
-            details->>'choice_made' as choice_made,
-            COUNT(*) as decision_count,
-            AVG(confidence_score) as avg_confidence,
-            COUNT(*) FILTER (WHERE success = true) as successful_outcomes,
-            COUNT(*) FILTER (WHERE success = false) as failed_outcomes,
-            AVG(duration_ms) as avg_decision_time_ms
-        FROM madf_events
-        WHERE event_type = 'decision'
-          AND details->>'decision_point' IS NOT NULL
-        GROUP BY agent_name, details->>'decision_point', details->>'choice_made'
-        HAVING COUNT(*) >= 2
-        ORDER BY decision_count DESC
-        """
-
-        return self.pg.execute_query(query)
+        return self.run_query("decision_patterns")
 
     def extract_training_examples(
         self,
@@ -246,40 +448,14 @@ class PatternExtractor:
         Extract specific examples for DSPy training
 
         Args:
-            pattern_type: Type of pattern to extract (success/failure/slow)
+            pattern_type: Type of pattern to extract (success/failure/slow, anything else = all)
             limit: Maximum examples to return
 
         Returns:
             List of training examples with full context
         """
-        filters = {
-            "success": "WHERE success = true AND confidence_score >= 0.8",
-            "failure": "WHERE success = false",
-            "slow": "WHERE duration_ms > 1000"
-        }
-
-        filter_clause = filters.get(pattern_type, "")
-
-        query = f"""
-        SELECT
-            session_id,
-            story_id,
-            agent_name,
-            event_type,
-            timestamp,
-            duration_ms,
-            tokens_used,
-            context_percent,
-            success,
-            confidence_score,
-            details
-        FROM madf_events
-        {filter_clause}
-        ORDER BY timestamp DESC
-        LIMIT {limit}
-        """
-
-        return self.pg.execute_query(query)
+        name = f"training_{pattern_type}" if pattern_type in _TRAINING_FILTERS else "training_all"
+        return self.run_query(name, {"limit": limit})
 
     def generate_pattern_report(self) -> str:
         """
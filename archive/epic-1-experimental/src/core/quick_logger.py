@@ -2,16 +2,50 @@
 QuickLogger - Thread-safe JSONL logging with universal event schema
 Zero-performance-impact structured logging for MADF framework
 Story 1.4 Task 1 Phase 1 implementation
+
+Buffered mode (MADF_LOG_BUFFERED=1) queues serialized events in a bounded
+in-memory ring and appends them in batches from a background flusher thread
+through one open file handle. Flushes happen on size, interval, close() and exit.
+
+Schema validation uses a precompiled fast path (set lookups and exact type
+checks). Only events the fast path rejects are re-checked with the full
+Pydantic model, so verdicts and error messages match UniversalEventSchema.
+Set MADF_LOG_VALIDATE_EVERY=N to validate 1 in N events.
+
+With MADF_LATENCY_SKETCHES=1, events with a duration update an in-memory
+latency sketch per (agent, tool, action); close() merges them into the
+shared sketch file.
+
+With MADF_LOG_SEGMENTS=1 each process writes its own segment file instead
+of appending to the shared daily file; log_segments.merge_segments() builds
+the time-ordered daily file from them. Size/age rotation and zstd
+compression (log_rotation) only apply to segments: without
+MADF_LOG_SEGMENTS=1 the shared daily file grows unrotated and uncompressed.
+
+With MADF_OTLP_ENDPOINT or MADF_OTLP_FILE set, events are also handed to a
+background OTLP trace exporter (see otlp_export).
 """
 
 import json
+import hashlib
 import datetime
 import threading
 import os
+import atexit
+import itertools
+import weakref
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Literal, get_args
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 
+from .error_fingerprint import error_fingerprint
+from .latency_sketch import LatencySketchStore
+from .log_context import get_log_context, set_log_context, log_context
+from .tracing import Span
+from .log_segments import SegmentWriter
+from .otlp_export import OTLPTraceExporter
+
 
 # Universal Event Schema (Story 1.4 specification)
 class UniversalEventSchema(BaseModel):
@@ -45,14 +79,123 @@ class UniversalEventSchema(BaseModel):
     model_config = ConfigDict(extra="allow")  # Allow additional fields for extensibility
 
 
+# Fast-path validator tables (derived from UniversalEventSchema)
+_EVENT_TYPES = frozenset(get_args(UniversalEventSchema.model_fields["event_type"].annotation))
+_CATEGORIES = frozenset(get_args(UniversalEventSchema.model_fields["category"].annotation))
+_REQUIRED_STR_FIELDS = ("timestamp", "session_id", "story_id")
+_OPTIONAL_STR_FIELDS = ("agent_name", "workflow_id", "thread_id", "trace_id")
+_INT_FIELDS = ("duration_ms", "tokens_used", "time_saved_or_wasted_ms")
+_FLOAT_FIELDS = ("context_percent", "confidence_score", "impact_score", "user_satisfaction_delta")
+_BOOL_FIELDS = ("success", "created_rule", "pattern_detected", "needs_review")
+_MISSING = object()
+
+
+def _fast_check(event: Dict[str, Any]) -> bool:
+    """True if event is certainly valid (never accepts what the schema rejects)"""
+    if event.get("event_type") not in _EVENT_TYPES or event.get("category") not in _CATEGORIES:
+        return False
+    for field in _REQUIRED_STR_FIELDS:
+        if type(event.get(field)) is not str:
+            return False
+    for field in _OPTIONAL_STR_FIELDS:
+        value = event.get(field)
+        if value is not None and type(value) is not str:
+            return False
+    for field in _INT_FIELDS:
+        value = event.get(field, _MISSING)
+        if value is not _MISSING and type(value) is not int:
+            return False
+    for field in _FLOAT_FIELDS:
+        value = event.get(field, _MISSING)
+        if value is not _MISSING and type(value) is not float and type(value) is not int:
+            return False
+    for field in _BOOL_FIELDS:
+        value = event.get(field, _MISSING)
+        if value is not _MISSING and type(value) is not bool:
+            return False
+    details = event.get("details", _MISSING)
+    if details is not _MISSING:
+        if type(details) is not dict or any(type(k) is not str for k in details):
+            return False
+    return True
+
+
+def validate_event(event: Dict[str, Any]) -> Optional[str]:
+    """
+    Validate event against UniversalEventSchema
+
+    Args:
+        event: Event dict as written to JSONL
+
+    Returns:
+        Validation error message, or None if valid
+    """
+    if _fast_check(event):
+        return None
+    # Slow path: lax coercions (e.g. "5" -> int) and exact error messages
+    try:
+        UniversalEventSchema(**event)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def compute_event_hash(event: Dict[str, Any]) -> str:
+    """
+    Deterministic event hash (idempotency key shared by the analytics backends)
+
+    Hashes the canonical JSON form (sorted keys, compact separators, ASCII
+    escapes), so the same logged event maps to the same key in every backend
+    and across re-imports.
+
+    Args:
+        event: Event dict as written to JSONL
+
+    Returns:
+        SHA-256 hex digest
+    """
+    canonical = json.dumps(event, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 class QuickLogger:
     """Minimal logger for immediate use - captures everything, analyzes later"""
 
-    def __init__(self, story_id: str = "1.4", validate_schema: bool = True):
+    def __init__(self, story_id: str = "1.4", validate_schema: bool = True,
+                 buffered: Optional[bool] = None,
+                 flush_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 max_buffered_events: Optional[int] = None,
+                 validate_every: Optional[int] = None,
+                 latency_sketches: Optional[bool] = None,
+                 segments: Optional[bool] = None,
+                 trace_exporter: Optional[OTLPTraceExporter] = None):
+        """
+        Initialize logger
+
+        Args:
+            story_id: Story identifier used in session id and file name
+            validate_schema: Validate events against UniversalEventSchema
+            buffered: Batch writes through a background flusher (default: MADF_LOG_BUFFERED)
+            flush_size: Pending events that trigger an early flush (default: 256)
+            flush_interval: Max seconds between flushes (default: 1.0)
+            max_buffered_events: Ring capacity; oldest events dropped when full (default: 10000)
+            validate_every: Validate 1 in N events when validate_schema is set
+                (default: MADF_LOG_VALIDATE_EVERY or 1)
+            latency_sketches: Keep per (agent, tool, action) latency sketches,
+                merged into the shared sketch file on close (default: MADF_LATENCY_SKETCHES)
+            segments: Write a per-process segment under base_path/segments instead of
+                the shared daily file (default: MADF_LOG_SEGMENTS); required for
+                rotation and compression
+            trace_exporter: Exporter receiving every event as an OTLP span candidate
+                (default: OTLPTraceExporter.from_env(), None when not configured)
+        """
         self.story_id = story_id
         self.start_time = datetime.datetime.now(datetime.timezone.utc)
         self.session_id = f"story_{story_id}_{self.start_time:%Y%m%d_%H%M%S}"
         self.validate_schema = validate_schema
+        self.validate_every = max(1, validate_every or int(os.getenv("MADF_LOG_VALIDATE_EVERY", "1")))
+        self._validation_counter = itertools.count()
 
         # Create log directory (configurable via env var)
         self.base_path = Path(os.getenv("MADF_LOG_PATH", "D:/Logs/MADF"))
@@ -65,11 +208,43 @@ class QuickLogger:
         # Thread-safe file writing
         self._lock = threading.Lock()
 
-        # Track current context
-        self.current_agent = None
-        self.workflow_id = None
-        self.thread_id = None
-        self.trace_id = None
+        # Per-process segment sink (see log_segments); log_file stays the merge target
+        if segments is None:
+            segments = os.getenv("MADF_LOG_SEGMENTS", "0").lower() in ("1", "true", "yes")
+        self.segments = SegmentWriter(self.base_path / "segments", story_id) if segments else None
+
+        # Buffered writer state (producers only touch the ring under _lock;
+        # disk I/O happens under _write_lock)
+        if buffered is None:
+            buffered = os.getenv("MADF_LOG_BUFFERED", "0").lower() in ("1", "true", "yes")
+        self.buffered = buffered
+        self.flush_size = flush_size or int(os.getenv("MADF_LOG_FLUSH_SIZE", "256"))
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.getenv("MADF_LOG_FLUSH_INTERVAL", "1.0"))
+        self.max_buffered_events = max_buffered_events or int(os.getenv("MADF_LOG_BUFFER_MAX", "10000"))
+        self.dropped_events = 0
+        self._buffer = deque(maxlen=self.max_buffered_events)
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._flush_requested = threading.Event()
+        self._stop_flusher = threading.Event()
+        self._flusher = None
+        if self.buffered:
+            self._start_flusher()
+
+        # Streaming latency percentiles (see latency_sketch)
+        if latency_sketches is None:
+            latency_sketches = os.getenv("MADF_LATENCY_SKETCHES", "0").lower() in ("1", "true", "yes")
+        self.sketches = LatencySketchStore(
+            os.getenv("MADF_LATENCY_SKETCH_PATH") or self.base_path / "latency_sketches.sqlite3"
+        ) if latency_sketches else None
+
+        # Flushed by the module exit hook if never closed (weak reference)
+        if self.segments is not None or self.buffered or self.sketches is not None:
+            _open_loggers.add(self)
+
+        # OpenTelemetry trace export (see otlp_export)
+        self.trace_exporter = trace_exporter or OTLPTraceExporter.from_env()
 
         # Auto-log session start
         self.log("session_start", "execution",
@@ -79,39 +254,128 @@ class QuickLogger:
     def log(self, event_type: str, category: str, **kwargs):
         """Log any event with automatic timestamp and context"""
 
+        # Per-task context (see log_context), read without locking
+        context = get_log_context()
         event = {
             "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
             "event_type": event_type,
             "category": category,
             "session_id": self.session_id,
             "story_id": self.story_id,
-            "agent_name": self.current_agent,
-            "workflow_id": self.workflow_id,
-            "thread_id": self.thread_id,
-            "trace_id": self.trace_id,
-            **kwargs
+            "agent_name": context.get("agent_name"),
+            "workflow_id": context.get("workflow_id"),
+            "thread_id": context.get("thread_id"),
+            "trace_id": context.get("trace_id")
         }
-
-        # Validate against universal schema if enabled
-        if self.validate_schema:
-            try:
-                UniversalEventSchema(**event)
-            except Exception as e:
+        if "span_id" in context:
+            event["span_id"] = context["span_id"]
+            event["parent_span_id"] = context.get("parent_span_id")
+        event.update(kwargs)
+
+        # Validate against universal schema if enabled (optionally sampled)
+        if self.validate_schema and (
+            self.validate_every == 1 or next(self._validation_counter) % self.validate_every == 0
+        ):
+            error = validate_event(event)
+            if error is not None:
                 # Log validation error but don't block logging
-                event["schema_validation_error"] = str(e)
+                event["schema_validation_error"] = error
+
+        # Span events (duration_ns) were already recorded exactly by tracing.Span
+        duration_ms = event.get("duration_ms")
+        if self.sketches is not None and isinstance(duration_ms, (int, float)) and "duration_ns" not in event:
+            details = event.get("details") if isinstance(event.get("details"), dict) else {}
+            self.sketches.record(
+                duration_ms,
+                agent_name=event.get("agent") or event["agent_name"],
+                tool=event.get("tool") or details.get("tool"),
+                action=event.get("action") or details.get("action")
+            )
+
+        if self.trace_exporter is not None:
+            self.trace_exporter.submit(event)
+
+        line = json.dumps(event, ensure_ascii=True) + "\n"
+
+        if self.buffered:
+            self._enqueue(line)
+            return
 
         # Thread-safe write to JSONL
+        if self.segments is not None:
+            with self._write_lock:
+                self.segments.write(line)
+            return
         with self._lock:
             with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(event, ensure_ascii=True) + "\n")
+                f.write(line)
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name=f"madf-log-flusher-{self.story_id}", daemon=True
+        )
+        self._flusher.start()
+
+    def _enqueue(self, line: str):
+        with self._lock:
+            if len(self._buffer) == self.max_buffered_events:
+                # Ring full - deque drops the oldest event on append
+                self.dropped_events += 1
+            self._buffer.append(line)
+            pending = len(self._buffer)
+        if pending >= self.flush_size:
+            self._flush_requested.set()
+
+    def _flush_loop(self):
+        while not self._stop_flusher.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except OSError:
+                # Disk errors must not kill the flusher - next batch retries the open
+                self._file = None
+
+    def flush(self):
+        """Write buffered events to disk (no-op when nothing is pending)"""
+        with self._write_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                lines = list(self._buffer)
+                self._buffer.clear()
+            if self.segments is not None:
+                self.segments.write("".join(lines))
+                return
+            if self._file is None:
+                self._file = open(self.log_file, "a", encoding="utf-8")
+            self._file.write("".join(lines))
+            self._file.flush()
+
+    def _stop_writer(self):
+        """Stop flusher thread, drain ring and close the file handle"""
+        if self._flusher is None:
+            return
+        self._stop_flusher.set()
+        self._flush_requested.set()
+        self._flusher.join(timeout=5.0)
+        self._flusher = None
+        # Later events (after close) go straight to disk
+        self.buffered = False
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
 
     def log_error(self, error: Exception, context: Optional[Dict] = None):
-        """Log errors with full context"""
+        """Log errors with full context (details.error_fingerprint groups recurrences)"""
         self.log("error", "error",
                 error_type=type(error).__name__,
                 error_message=str(error),
                 context=context or {},
-                priority="high")
+                priority="high",
+                details={"error_fingerprint": error_fingerprint(type(error).__name__, str(error))})
 
     def log_tool_call(self, tool_name: str, duration_ms: int,
                      tokens_used: Optional[int] = None,
@@ -160,26 +424,73 @@ class QuickLogger:
                    workflow_id: Optional[str] = None,
                    thread_id: Optional[str] = None,
                    trace_id: Optional[str] = None):
-        """Update current context for subsequent logs"""
-        if agent_name is not None:
-            self.current_agent = agent_name
-        if workflow_id is not None:
-            self.workflow_id = workflow_id
-        if thread_id is not None:
-            self.thread_id = thread_id
-        if trace_id is not None:
-            self.trace_id = trace_id
+        """
+        Update context for subsequent logs in the current task/thread
+
+        Context lives in a ContextVar, so concurrent asyncio tasks and threads
+        keep their own values. Prefer the scoped context() / span() forms.
+        """
+        set_log_context(agent_name=agent_name, workflow_id=workflow_id,
+                        thread_id=thread_id, trace_id=trace_id)
+
+    def context(self, **fields):
+        """Scoped context manager (see log_context.log_context)"""
+        return log_context(**fields)
+
+    def span(self, name: str, **attributes) -> Span:
+        """Timed span logged as one event on exit (see tracing.Span)"""
+        return Span(name, logger=self, **attributes)
+
+    @property
+    def current_agent(self) -> Optional[str]:
+        return get_log_context().get("agent_name")
+
+    @property
+    def workflow_id(self) -> Optional[str]:
+        return get_log_context().get("workflow_id")
+
+    @property
+    def thread_id(self) -> Optional[str]:
+        return get_log_context().get("thread_id")
+
+    @property
+    def trace_id(self) -> Optional[str]:
+        return get_log_context().get("trace_id")
 
     def get_log_file_path(self) -> str:
         """Return current log file path for external tools"""
         return str(self.log_file)
 
     def close(self):
-        """Log session end"""
+        """Log session end and flush buffered events"""
         end_time = datetime.datetime.now(datetime.timezone.utc)
         duration_minutes = (end_time - self.start_time).total_seconds() / 60
         self.log("session_end", "execution",
                 session_duration_minutes=round(duration_minutes, 2))
+        self._release()
+        _open_loggers.discard(self)
+        if self.trace_exporter is not None:
+            self.trace_exporter.flush()
+
+    def _release(self):
+        """Drain buffered events, close the segment and merge latency sketches"""
+        self._stop_writer()
+        if self.segments is not None:
+            with self._write_lock:
+                self.segments.close()
+        if self.sketches is not None:
+            self.sketches.flush()
+
+
+# Loggers with pending state, released at exit unless closed first. Weak
+# references: an unclosed logger is not kept alive just for the exit hook.
+_open_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _release_open_loggers():
+    for logger in list(_open_loggers):
+        logger._release()
 
 
 # Global logger instance for easy importing
@@ -0,0 +1,208 @@
+"""
+Tool Result Cache - Two-tier cache for repeated MCP tool results
+
+Tier 1: in-memory LRU bounded by a byte budget
+Tier 2: on-disk SQLite store with TTL (survives restarts, shared across processes)
+
+Used for Context7 documentation lookups (most repeated tool call) and,
+optionally, read-only Serena queries.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ToolResultCache:
+    """
+    Bounded two-tier cache for MCP tool results
+
+    Keys are canonical "tool_name:json.dumps(parameters, sort_keys=True)" strings.
+    Entries are namespaced (e.g. per MCP server) inside one SQLite file.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        db_path: Optional[Path] = None
+    ):
+        """
+        Initialize tool result cache
+
+        Args:
+            namespace: Cache namespace (usually MCP server name)
+            max_bytes: Memory tier budget in bytes of serialized results
+            ttl_seconds: Entry lifetime in both tiers
+            db_path: SQLite file for the disk tier (None = memory only)
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.db_path = Path(db_path) if db_path else None
+
+        # key -> (value, size_bytes, expires_at)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0
+        }
+
+        if self.db_path:
+            self._open_disk_tier()
+
+    @staticmethod
+    def make_key(tool_name: str, parameters: Dict[str, Any]) -> str:
+        """Build canonical cache key"""
+        return f"{tool_name}:{json.dumps(parameters, sort_keys=True)}"
+
+    def _open_disk_tier(self):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tool_result_cache (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        """)
+        self._conn.execute(
+            "DELETE FROM tool_result_cache WHERE expires_at <= ?", (time.time(),)
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached result
+
+        Returned dicts are shared with the cache - callers must not mutate them.
+
+        Args:
+            key: Canonical cache key
+
+        Returns:
+            Cached result or None
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                self._remove_memory(key)
+                self._counters["expirations"] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM tool_result_cache WHERE namespace = ? AND cache_key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+                if row is not None:
+                    serialized, expires_at = row
+                    if expires_at > now:
+                        value = json.loads(serialized)
+                        self._put_memory(key, value, len(serialized), expires_at)
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._conn.execute(
+                        "DELETE FROM tool_result_cache WHERE namespace = ? AND cache_key = ?",
+                        (self.namespace, key)
+                    )
+                    self._conn.commit()
+                    self._counters["expirations"] += 1
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """
+        Store result in both tiers
+
+        Args:
+            key: Canonical cache key
+            value: JSON-serializable result dict
+        """
+        serialized = json.dumps(value, ensure_ascii=True, default=str)
+        expires_at = time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._put_memory(key, value, len(serialized), expires_at)
+
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tool_result_cache (namespace, cache_key, value, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, serialized, expires_at)
+                )
+                self._conn.commit()
+
+    def _put_memory(self, key: str, value: Dict[str, Any], size: int, expires_at: float):
+        if key in self._memory:
+            self._remove_memory(key)
+
+        # Entries larger than the whole budget stay disk-only
+        if size > self.max_bytes:
+            return
+
+        self._memory[key] = (value, size, expires_at)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_bytes:
+            evicted_key, _ = next(iter(self._memory.items()))
+            self._remove_memory(evicted_key)
+            self._counters["evictions"] += 1
+
+    def _remove_memory(self, key: str):
+        _, size, _ = self._memory.pop(key)
+        self._memory_bytes -= size
+
+    def clear(self):
+        """Drop all entries in this namespace from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._conn is not None:
+                self._conn.execute(
+                    "DELETE FROM tool_result_cache WHERE namespace = ?", (self.namespace,)
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and memory usage"""
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        lookups = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self):
+        """Close disk tier connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,165 @@
+"""
+Tracing - Low-overhead spans on top of QuickLogger
+Story 1.4 Task 1 Phase 1 implementation
+
+A Span times a block with perf_counter_ns and writes ONE event when it
+finishes (instead of a start/end pair), carrying trace_id, span_id and
+parent_span_id so call trees can be rebuilt from the logs. Ids and the
+active span live in the logging context (see log_context), so events
+logged inside a span are attributed to it and concurrent tasks build
+separate trees.
+
+Sampling is head-based: the root span of a trace decides, every child
+inherits the decision. Spans of unsampled traces only feed the latency
+sketches, so their cost is two clock reads and a context swap.
+
+Configuration (environment):
+    MADF_TRACE_SAMPLE_RATE: Fraction of traces recorded, 0..1 (default: 1.0)
+
+Usage:
+    with Span("plan", agent_name="planning_agent"):
+        with Span("search", tool="Grep"):
+            ...
+"""
+
+import os
+import time
+import random
+import datetime
+from typing import Dict, Any, Optional
+
+from .log_context import get_log_context, set_log_context, reset_log_context, new_id
+
+
+DEFAULT_SAMPLE_RATE = float(os.getenv("MADF_TRACE_SAMPLE_RATE", "1.0"))
+
+
+class Span:
+    """
+    Timed, nestable unit of work logged as a single event on exit
+
+    Works as a sync or async context manager. The event is logged with
+    category "error" and success=False if the block raises an Exception.
+    """
+
+    __slots__ = (
+        "name", "logger", "event_type", "sample_rate", "agent_name", "attributes",
+        "trace_id", "span_id", "parent_span_id", "sampled", "error",
+        "_token", "_start_ns", "_start_wall_ns", "duration_ns"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        logger=None,
+        event_type: str = "agent_action",
+        sample_rate: Optional[float] = None,
+        agent_name: Optional[str] = None,
+        **attributes
+    ):
+        """
+        Initialize span
+
+        Args:
+            name: Span name (logged as span_name, and as action unless given)
+            logger: QuickLogger (default: global get_logger())
+            event_type: Event type of the completion event
+            sample_rate: Sampling rate for root spans (default: MADF_TRACE_SAMPLE_RATE)
+            agent_name: Agent the span belongs to (default: from context)
+            **attributes: Extra fields for the completion event
+        """
+        self.name = name
+        self.logger = logger
+        self.event_type = event_type
+        self.sample_rate = DEFAULT_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.agent_name = agent_name
+        self.attributes = attributes
+        self.trace_id = None
+        self.span_id = None
+        self.parent_span_id = None
+        self.sampled = False
+        self.error: Optional[Exception] = None
+        self.duration_ns = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Add a field to the completion event"""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        parent = get_log_context()
+        sampled = parent.get("sampled")
+        if sampled is None:
+            sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        self.sampled = sampled
+        if self.agent_name is None:
+            self.agent_name = parent.get("agent_name")
+
+        if sampled:
+            self.trace_id = parent.get("trace_id") or new_id(128)
+            self.span_id = new_id()
+            self.parent_span_id = parent.get("span_id")
+            self._token = set_log_context(
+                agent_name=self.agent_name, sampled=True, trace_id=self.trace_id,
+                span_id=self.span_id, parent_span_id=self.parent_span_id, span_name=self.name
+            )
+        else:
+            self._token = set_log_context(agent_name=self.agent_name, sampled=False)
+
+        self._start_wall_ns = time.time_ns()
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ns = time.perf_counter_ns() - self._start_ns
+        reset_log_context(self._token)
+        # Cancellation, KeyboardInterrupt and GeneratorExit end the span without failing it
+        self.error = exc if isinstance(exc, Exception) else None
+        self._emit()
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+    def _emit(self):
+        """Log the completion event (or only the latency when unsampled)"""
+        logger = self.logger
+        if logger is None:
+            from .quick_logger import get_logger
+            logger = get_logger()
+
+        action = self.attributes.get("action", self.name)
+        # Exact latency on both paths (QuickLogger.log skips events with duration_ns)
+        if logger.sketches is not None:
+            logger.sketches.record(
+                self.duration_ns / 1e6,
+                agent_name=self.attributes.get("agent") or self.agent_name,
+                tool=self.attributes.get("tool"),
+                action=action
+            )
+        if not self.sampled:
+            return
+
+        event: Dict[str, Any] = {
+            "agent_name": self.agent_name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "span_name": self.name,
+            "action": action,
+            "start_time": datetime.datetime.fromtimestamp(
+                self._start_wall_ns / 1e9, datetime.timezone.utc
+            ).isoformat(),
+            "duration_ms": self.duration_ns // 1_000_000,
+            "duration_ns": self.duration_ns,
+            "success": self.error is None
+        }
+        event.update(self.attributes)
+        if self.error is not None:
+            details = dict(event.get("details") or {})
+            details.setdefault("error", str(self.error))
+            details.setdefault("error_type", type(self.error).__name__)
+            event["details"] = details
+        logger.log(self.event_type, "error" if self.error is not None else "execution", **event)
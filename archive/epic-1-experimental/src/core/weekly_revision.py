@@ -11,7 +11,13 @@ from pathlib import Path
 from decimal import Decimal
 import json
 
-from .postgres_manager_sync import PostgresManager
+from .local_analytics import create_analytics_backend, LocalAnalyticsBackend
+
+try:
+    from .postgres_manager_sync import PostgresManager
+except ImportError:
+    # psycopg not installed: only the local backend is available
+    PostgresManager = None
 from .log_analyzer_sync import LogAnalyzer
 from .pattern_extractor_sync import PatternExtractor
 
@@ -41,17 +47,18 @@ class WeeklyRevision:
 
     def __init__(
         self,
-        postgres_manager: Optional[PostgresManager] = None,
+        postgres_manager: Optional["PostgresManager"] = None,
         output_dir: Optional[Path] = None
     ):
         """
         Initialize weekly revision system
 
         Args:
-            postgres_manager: PostgresManager instance (creates new if None)
+            postgres_manager: PostgresManager or LocalAnalyticsBackend
+                (default: create_analytics_backend())
             output_dir: Directory for weekly reports (default: docs/qa/weekly-reports/)
         """
-        self.pg = postgres_manager or PostgresManager()
+        self.pg = postgres_manager or create_analytics_backend()
         self.analyzer = LogAnalyzer(postgres_manager=self.pg)
         self.extractor = PatternExtractor(postgres_manager=self.pg)
 
@@ -90,10 +97,13 @@ class WeeklyRevision:
         # Collect weekly statistics
         stats = self._get_week_statistics(week_start, week_end)
 
-        # Extract patterns
-        error_patterns = self.extractor.find_error_patterns(min_occurrences=2)
-        slow_operations = self.extractor.find_slow_operations(duration_threshold_ms=1000)
-        success_patterns = self.extractor.find_success_patterns(min_confidence=0.85)
+        # Extract patterns (bounded to the week so only its partitions are scanned)
+        error_patterns = self.extractor.find_error_patterns(
+            min_occurrences=2, start_time=week_start, end_time=week_end)
+        slow_operations = self.extractor.find_slow_operations(
+            duration_threshold_ms=1000, start_time=week_start, end_time=week_end)
+        success_patterns = self.extractor.find_success_patterns(
+            min_confidence=0.85, start_time=week_start, end_time=week_end)
 
         # Generate report sections
         report = {
@@ -126,28 +136,29 @@ class WeeklyRevision:
         Returns:
             Weekly statistics dictionary
         """
-        query = """
-        SELECT
-            COUNT(*) as total_events,
-            COUNT(DISTINCT session_id) as total_sessions,
-            COUNT(DISTINCT story_id) as stories_worked,
-            SUM(duration_ms) as total_duration_ms,
-            AVG(duration_ms) as avg_duration_ms,
-            SUM(tokens_used) as total_tokens_used,
-            AVG(tokens_used) as avg_tokens_used,
-            AVG(context_percent) as avg_context_percent,
-            COUNT(*) FILTER (WHERE success = true) as successful_events,
-            COUNT(*) FILTER (WHERE success = false) as failed_events,
-            COUNT(DISTINCT agent_name) as agents_used
-        FROM madf_events
-        WHERE timestamp >= %s AND timestamp < %s
-        """
-
-        results = self.pg.execute_query(query, (week_start, week_end))
-
-        if results:
-            return results[0]
-        return {}
+        results = self.pg.query_rollups(start=week_start, end=week_end, include_sessions=True)
+
+        if not results:
+            return {}
+
+        totals = results[0]
+
+        def avg(total_key: str, count_key: str) -> Optional[float]:
+            return float(totals[total_key]) / totals[count_key] if totals[count_key] else None
+
+        return {
+            "total_events": totals["event_count"],
+            "total_sessions": totals["sessions"],
+            "stories_worked": totals["stories"],
+            "total_duration_ms": totals["duration_sum"],
+            "avg_duration_ms": avg("duration_sum", "duration_count"),
+            "total_tokens_used": totals["tokens_sum"],
+            "avg_tokens_used": avg("tokens_sum", "tokens_count"),
+            "avg_context_percent": avg("context_sum", "context_count"),
+            "successful_events": totals["success_count"],
+            "failed_events": totals["failure_count"],
+            "agents_used": totals["agents"]
+        }
 
     def _generate_recommendations(
         self,
@@ -366,10 +377,26 @@ def main():
         default="both",
         help="Output format"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["postgres", "local"],
+        default=None,
+        help="Analytics backend (default: MADF_ANALYTICS_BACKEND or postgres)"
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=None,
+        help="QuickLogger JSONL directory for the local backend (default: MADF_LOG_PATH)"
+    )
 
     args = parser.parse_args()
 
-    revision = WeeklyRevision(output_dir=args.output_dir)
+    if args.backend == "local":
+        backend = LocalAnalyticsBackend(log_dir=args.log_dir)
+    else:
+        backend = create_analytics_backend(args.backend)
+    revision = WeeklyRevision(postgres_manager=backend, output_dir=args.output_dir)
 
     try:
         report_path = revision.run_weekly_revision()
@@ -53,9 +53,10 @@ class ValidatorAgentEnhanced(BaseAgent):
         self.logger = QuickLogger()
 
         # Initialize Story 1.4 components
+        # One PostgresManager (backed by the shared connection pool) for all analytics components
         self.sentry = SentryManager() if enable_sentry else None
-        self.dspy_optimizer = MADFOptimizer() if enable_dspy else None
         self.postgres = PostgresManager() if enable_postgres else None
+        self.dspy_optimizer = MADFOptimizer(postgres_manager=self.postgres) if enable_dspy else None
         self.log_analyzer = LogAnalyzer(postgres_manager=self.postgres) if enable_postgres else None
         self.pattern_extractor = PatternExtractor(postgres_manager=self.postgres) if enable_postgres else None
 
@@ -196,7 +197,8 @@ class ValidatorAgentEnhanced(BaseAgent):
     def analyze_performance(
         self,
         session_id: Optional[str] = None,
-        story_id: Optional[str] = None
+        story_id: Optional[str] = None,
+        max_sessions: Optional[int] = 10
     ) -> Dict[str, Any]:
         """
         Analyze performance metrics from Postgres logs
@@ -204,6 +206,7 @@ class ValidatorAgentEnhanced(BaseAgent):
         Args:
             session_id: Session to analyze
             story_id: Story to analyze
+            max_sessions: Most recent story sessions to summarise (None = all)
 
         Returns:
             Performance analysis results
@@ -223,20 +226,11 @@ class ValidatorAgentEnhanced(BaseAgent):
 
             elif story_id:
                 # Analyze story performance
-                # Get all sessions for this story
-                query = """
-                SELECT DISTINCT session_id
-                FROM madf_events
-                WHERE story_id = %s
-                ORDER BY timestamp DESC
-                LIMIT 10
-                """
-                sessions = self.postgres.execute_query(query, (story_id,))
-
-                summaries = []
-                for session in sessions:
-                    sid = session['session_id']
-                    summaries.append(self.log_analyzer.get_session_summary(sid))
+                # Session stats for the story come back from grouped, paginated queries
+                summaries = self.log_analyzer.get_session_summaries(
+                    story_id=story_id,
+                    limit=max_sessions
+                )
 
                 return {
                     "analysis_type": "story",
@@ -275,7 +269,7 @@ class ValidatorAgentEnhanced(BaseAgent):
                 min_occurrences=min_occurrences
             )
 
-            # Log error patterns to Sentry for alerting
+            # Log error patterns to Sentry for alerting (one issue per fingerprint)
             if self.sentry and patterns:
                 for pattern in patterns[:5]:  # Top 5 errors
                     self.sentry.capture_message(
@@ -283,7 +277,8 @@ class ValidatorAgentEnhanced(BaseAgent):
                         f"({pattern.get('occurrence_count', 0)} times)",
                         level="warning",
                         agent_name="validator_agent",
-                        context=pattern
+                        context=pattern,
+                        fingerprint=pattern.get('fingerprint')
                     )
 
             return patterns
@@ -8,8 +8,10 @@ import os
 import json
 from typing import Optional, Dict, Any, List
 from pathlib import Path
-import psycopg
-from psycopg.rows import dict_row
+
+from .postgres_pool import get_async_postgres_pool, async_statement_timeout
+from .error_fingerprint import fingerprint_details
+from .log_rotation import open_log
 
 
 class PostgresManager:
@@ -18,35 +20,38 @@ class PostgresManager:
 
     Primary operations use direct psycopg3 for performance
     Optional MCP helpers available via mcp_bridge.py for advanced analysis
+
+    Each operation borrows a connection from the shared async pool
+    (postgres_pool.get_async_postgres_pool) for its duration.
     """
 
     def __init__(
         self,
-        connection_string: Optional[str] = None
+        connection_string: Optional[str] = None,
+        statement_timeout_ms: Optional[int] = None
     ):
         """
         Initialize Postgres manager with direct connection
 
         Args:
             connection_string: PostgreSQL connection string (default: from env)
+            statement_timeout_ms: Default timeout for execute_query (default: MADF_PG_QUERY_TIMEOUT_MS, 0 = none)
         """
         self.connection_string = connection_string or os.getenv(
             "POSTGRES_CONNECTION_STRING",
             "postgresql://localhost:5432/madf_logs"
         )
-        self._conn: Optional[psycopg.AsyncConnection] = None
+        self.statement_timeout_ms = statement_timeout_ms if statement_timeout_ms is not None else int(
+            os.getenv("MADF_PG_QUERY_TIMEOUT_MS", "0"))
+        self._pool = None
         self._initialized = False
 
     async def initialize(self):
-        """Initialize connection and create schema"""
+        """Initialize connection pool and create schema"""
         if self._initialized:
             return
 
-        # Create async connection
-        self._conn = await psycopg.AsyncConnection.connect(
-            self.connection_string,
-            row_factory=dict_row
-        )
+        self._pool = await get_async_postgres_pool(self.connection_string)
 
         # Create schema if not exists
         await self.create_schema()
@@ -91,16 +96,16 @@ class PostgresManager:
         CREATE INDEX IF NOT EXISTS idx_madf_events_details ON madf_events USING gin(details);
         """
 
-        async with self._conn.cursor() as cur:
-            await cur.execute(schema_sql)
-            await self._conn.commit()
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(schema_sql)
 
     async def import_jsonl_file(self, jsonl_path: Path) -> Dict[str, Any]:
         """
         Import JSONL log file to Postgres
 
         Args:
-            jsonl_path: Path to JSONL file
+            jsonl_path: Path to JSONL file (.jsonl or .jsonl.zst)
 
         Returns:
             Dict with import statistics
@@ -112,66 +117,67 @@ class PostgresManager:
         errors = 0
         start_time = None
 
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
-            async with self._conn.cursor() as cur:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        event = json.loads(line.strip())
-
-                        # Extract fields matching schema
-                        insert_sql = """
-                            INSERT INTO madf_events (
-                                timestamp, event_type, category, session_id, story_id,
-                                agent_name, workflow_id, thread_id, trace_id,
-                                duration_ms, tokens_used, context_percent, success,
-                                confidence_score, impact_score, time_saved_or_wasted_ms,
-                                user_satisfaction_delta, created_rule, pattern_detected,
-                                needs_review, details
-                            ) VALUES (
-                                %(timestamp)s, %(event_type)s, %(category)s, %(session_id)s,
-                                %(story_id)s, %(agent_name)s, %(workflow_id)s, %(thread_id)s,
-                                %(trace_id)s, %(duration_ms)s, %(tokens_used)s, %(context_percent)s,
-                                %(success)s, %(confidence_score)s, %(impact_score)s,
-                                %(time_saved_or_wasted_ms)s, %(user_satisfaction_delta)s,
-                                %(created_rule)s, %(pattern_detected)s, %(needs_review)s,
-                                %(details)s::jsonb
-                            )
-                            """
-
-                        # Build parameters with defaults
-                        params = {
-                            "timestamp": event.get("timestamp"),
-                            "event_type": event.get("event_type"),
-                            "category": event.get("category"),
-                            "session_id": event.get("session_id"),
-                            "story_id": event.get("story_id"),
-                            "agent_name": event.get("agent_name"),
-                            "workflow_id": event.get("workflow_id"),
-                            "thread_id": event.get("thread_id"),
-                            "trace_id": event.get("trace_id"),
-                            "duration_ms": event.get("duration_ms", 0),
-                            "tokens_used": event.get("tokens_used", 0),
-                            "context_percent": event.get("context_percent", 0.0),
-                            "success": event.get("success", True),
-                            "confidence_score": event.get("confidence_score", 0.0),
-                            "impact_score": event.get("impact_score", 0.0),
-                            "time_saved_or_wasted_ms": event.get("time_saved_or_wasted_ms", 0),
-                            "user_satisfaction_delta": event.get("user_satisfaction_delta", 0.0),
-                            "created_rule": event.get("created_rule", False),
-                            "pattern_detected": event.get("pattern_detected", False),
-                            "needs_review": event.get("needs_review", False),
-                            "details": json.dumps(event.get("details", {}))
-                        }
-
-                        await cur.execute(insert_sql, params)
-                        imported += 1
-
-                    except Exception as e:
-                        errors += 1
-                        print(f"Error importing line {line_num}: {e}")
-                        continue
-
-                await self._conn.commit()
+        with open_log(jsonl_path) as f:
+            async with self._pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    for line_num, line in enumerate(f, 1):
+                        try:
+                            event = json.loads(line.strip())
+
+                            # Extract fields matching schema
+                            insert_sql = """
+                                INSERT INTO madf_events (
+                                    timestamp, event_type, category, session_id, story_id,
+                                    agent_name, workflow_id, thread_id, trace_id,
+                                    duration_ms, tokens_used, context_percent, success,
+                                    confidence_score, impact_score, time_saved_or_wasted_ms,
+                                    user_satisfaction_delta, created_rule, pattern_detected,
+                                    needs_review, details
+                                ) VALUES (
+                                    %(timestamp)s, %(event_type)s, %(category)s, %(session_id)s,
+                                    %(story_id)s, %(agent_name)s, %(workflow_id)s, %(thread_id)s,
+                                    %(trace_id)s, %(duration_ms)s, %(tokens_used)s, %(context_percent)s,
+                                    %(success)s, %(confidence_score)s, %(impact_score)s,
+                                    %(time_saved_or_wasted_ms)s, %(user_satisfaction_delta)s,
+                                    %(created_rule)s, %(pattern_detected)s, %(needs_review)s,
+                                    %(details)s::jsonb
+                                )
+                                """
+
+                            # Build parameters with defaults
+                            params = {
+                                "timestamp": event.get("timestamp"),
+                                "event_type": event.get("event_type"),
+                                "category": event.get("category"),
+                                "session_id": event.get("session_id"),
+                                "story_id": event.get("story_id"),
+                                "agent_name": event.get("agent_name"),
+                                "workflow_id": event.get("workflow_id"),
+                                "thread_id": event.get("thread_id"),
+                                "trace_id": event.get("trace_id"),
+                                "duration_ms": event.get("duration_ms", 0),
+                                "tokens_used": event.get("tokens_used", 0),
+                                "context_percent": event.get("context_percent", 0.0),
+                                "success": event.get("success", True),
+                                "confidence_score": event.get("confidence_score", 0.0),
+                                "impact_score": event.get("impact_score", 0.0),
+                                "time_saved_or_wasted_ms": event.get("time_saved_or_wasted_ms", 0),
+                                "user_satisfaction_delta": event.get("user_satisfaction_delta", 0.0),
+                                "created_rule": event.get("created_rule", False),
+                                "pattern_detected": event.get("pattern_detected", False),
+                                "needs_review": event.get("needs_review", False),
+                                "details": json.dumps(fingerprint_details(event))
+                            }
+
+                            await cur.execute(insert_sql, params)
+                            imported += 1
+
+                        except Exception as e:
+                            errors += 1
+                            print(f"Error importing line {line_num}: {e}")
+                            continue
+
+                    await conn.commit()
 
         return {
             "imported": imported,
@@ -182,7 +188,8 @@ class PostgresManager:
     async def execute_query(
         self,
         query: str,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        timeout_ms: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Execute SQL query with optional parameters
@@ -190,6 +197,7 @@ class PostgresManager:
         Args:
             query: SQL query string
             params: Query parameters
+            timeout_ms: Statement timeout for this query (default: self.statement_timeout_ms)
 
         Returns:
             List of result rows as dictionaries
@@ -197,10 +205,13 @@ class PostgresManager:
         if not self._initialized:
             await self.initialize()
 
-        async with self._conn.cursor() as cur:
-            await cur.execute(query, params or {})
-            results = await cur.fetchall()
-            return results
+        timeout_ms = self.statement_timeout_ms if timeout_ms is None else timeout_ms
+        async with self._pool.connection() as conn:
+            async with async_statement_timeout(conn, timeout_ms):
+                async with conn.cursor() as cur:
+                    await cur.execute(query, params or {})
+                    results = await cur.fetchall()
+        return results
 
     async def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """Get statistics for a specific session"""
@@ -260,15 +271,15 @@ class PostgresManager:
         """Find recurring error patterns"""
         query = """
         SELECT
-            details->>'error' as error_message,
+            details->>'error_fingerprint' as fingerprint,
+            MIN(details->>'error') as error_message,
             COUNT(*) as occurrence_count,
             array_agg(DISTINCT agent_name) as affected_agents,
             MIN(timestamp) as first_seen,
             MAX(timestamp) as last_seen
         FROM madf_events
-        WHERE success = false
-          AND details->>'error' IS NOT NULL
-        GROUP BY details->>'error'
+        WHERE details->>'error_fingerprint' IS NOT NULL
+        GROUP BY details->>'error_fingerprint'
         HAVING COUNT(*) >= %(min_count)s
         ORDER BY occurrence_count DESC
         """
@@ -276,7 +287,6 @@ class PostgresManager:
         return await self.execute_query(query, {"min_count": min_occurrences})
 
     async def close(self):
-        """Close database connection"""
-        if self._conn:
-            await self._conn.close()
-            self._initialized = False
+        """Release the shared pool (closed with close_async_postgres_pools)"""
+        self._pool = None
+        self._initialized = False
@@ -8,10 +8,192 @@ Synchronous implementation for Windows compatibility
 
 import os
 import json
-from typing import Optional, Dict, Any, List
+import time
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 import psycopg
+from psycopg import sql
+from psycopg.pq import TransactionStatus
 from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+
+from .quick_logger import compute_event_hash, validate_event
+from .error_fingerprint import fingerprint_details
+from .log_rotation import is_compressed, iter_log_files, open_log
+from .postgres_pool import get_postgres_pool, statement_timeout, is_idle
+
+
+# Columns loaded from JSONL events (order shared by COPY and INSERT fallback)
+IMPORT_COLUMNS = (
+    "timestamp", "event_type", "category", "session_id", "story_id",
+    "agent_name", "workflow_id", "thread_id", "trace_id",
+    "duration_ms", "tokens_used", "context_percent",
+    "success", "confidence_score", "impact_score", "details", "event_hash"
+)
+REQUIRED_COLUMNS = ("timestamp", "event_type", "category", "session_id", "story_id")
+
+# Hot details keys promoted to stored generated columns (column -> JSONB key),
+# so pattern queries group/filter on indexed columns instead of extracting JSONB per row
+DETAIL_COLUMNS = {
+    "detail_error": "error",
+    "detail_error_type": "error_type",
+    "detail_action": "action",
+    "detail_tool": "tool",
+    "detail_error_fingerprint": "error_fingerprint"
+}
+_DETAIL_COLUMNS_SQL = "".join(
+    f"    {column} TEXT GENERATED ALWAYS AS (details->>'{key}') STORED,\n"
+    for column, key in DETAIL_COLUMNS.items()
+)
+
+EVENTS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS madf_events (
+    id BIGSERIAL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    session_id VARCHAR(100) NOT NULL,
+    story_id VARCHAR(20) NOT NULL,
+    agent_name VARCHAR(50),
+    workflow_id VARCHAR(100),
+    thread_id VARCHAR(100),
+    trace_id VARCHAR(100),
+    duration_ms INTEGER DEFAULT 0,
+    tokens_used INTEGER DEFAULT 0,
+    context_percent REAL DEFAULT 0.0,
+    success BOOLEAN DEFAULT true,
+    confidence_score REAL,
+    impact_score REAL,
+    details JSONB,
+    event_hash CHAR(64),
+""" + _DETAIL_COLUMNS_SQL + """    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+"""
+
+_PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+# Additive rollup metrics (name -> aggregate over raw madf_events rows).
+# Averages are derived as sum / count so buckets can be merged exactly.
+ROLLUP_METRICS = {
+    "event_count": "COUNT(*)",
+    "success_count": "COUNT(*) FILTER (WHERE success = true)",
+    "failure_count": "COUNT(*) FILTER (WHERE success = false)",
+    "duration_sum": "COALESCE(SUM(duration_ms), 0)",
+    "duration_count": "COUNT(duration_ms)",
+    "tokens_sum": "COALESCE(SUM(tokens_used), 0)",
+    "tokens_count": "COUNT(tokens_used)",
+    "token_events": "COUNT(*) FILTER (WHERE tokens_used > 0)",
+    "context_sum": "COALESCE(SUM(context_percent), 0)",
+    "context_count": "COUNT(context_percent)",
+    "confidence_sum": "COALESCE(SUM(confidence_score), 0)",
+    "confidence_count": "COUNT(confidence_score)"
+}
+ROLLUP_DIMENSIONS = ("story_id", "agent_name", "event_type")
+ROLLUP_TABLES = {"hour": "madf_rollup_hourly", "day": "madf_rollup_daily"}
+
+_ROLLUP_METRIC_COLUMNS = ", ".join(ROLLUP_METRICS)
+_RAW_METRICS_SQL = ", ".join(f"{expr} AS {name}" for name, expr in ROLLUP_METRICS.items())
+_SUM_METRICS_SQL = ", ".join(f"SUM({name}) AS {name}" for name in ROLLUP_METRICS)
+
+
+def _rollup_table_sql(table: str) -> str:
+    metric_columns = ",\n    ".join(
+        f"{name} {'DOUBLE PRECISION' if name in ('context_sum', 'confidence_sum') else 'BIGINT'} NOT NULL DEFAULT 0"
+        for name in ROLLUP_METRICS
+    )
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    story_id VARCHAR(20) NOT NULL,
+    agent_name VARCHAR(50) NOT NULL DEFAULT '',
+    event_type VARCHAR(50) NOT NULL,
+    {metric_columns},
+    PRIMARY KEY (bucket_start, story_id, agent_name, event_type)
+);
+"""
+
+
+def _rollup_upsert_sql(table: str, unit: str, source: str) -> str:
+    """Aggregate source rows into table buckets, adding to existing totals"""
+    updates = ", ".join(f"{name} = {table}.{name} + EXCLUDED.{name}" for name in ROLLUP_METRICS)
+    return f"""
+    INSERT INTO {table} (bucket_start, story_id, agent_name, event_type, {_ROLLUP_METRIC_COLUMNS})
+    SELECT date_trunc('{unit}', timestamp, 'UTC'), story_id, COALESCE(agent_name, ''), event_type,
+           {_RAW_METRICS_SQL}
+    FROM {source}
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (bucket_start, story_id, agent_name, event_type) DO UPDATE SET {updates}
+    """
+
+
+# Session membership per hour (COUNT(DISTINCT session_id) is not additive)
+ROLLUP_SESSIONS_SQL = """
+CREATE TABLE IF NOT EXISTS madf_rollup_sessions (
+    bucket_start TIMESTAMPTZ NOT NULL,
+    story_id VARCHAR(20) NOT NULL,
+    agent_name VARCHAR(50) NOT NULL DEFAULT '',
+    event_type VARCHAR(50) NOT NULL,
+    session_id VARCHAR(100) NOT NULL,
+    PRIMARY KEY (bucket_start, story_id, agent_name, event_type, session_id)
+);
+"""
+
+
+def _rollup_sessions_insert_sql(source: str) -> str:
+    return f"""
+    INSERT INTO madf_rollup_sessions (bucket_start, story_id, agent_name, event_type, session_id)
+    SELECT DISTINCT date_trunc('hour', timestamp, 'UTC'), story_id, COALESCE(agent_name, ''), event_type, session_id
+    FROM {source}
+    ON CONFLICT DO NOTHING
+    """
+
+
+# Single-row insert shared by import_jsonl_file and the COPY fallback
+ROW_INSERT_SQL = (
+    f"INSERT INTO madf_events ({', '.join(IMPORT_COLUMNS)}) "
+    f"VALUES ({', '.join(['%s'] * len(IMPORT_COLUMNS))}) "
+    "ON CONFLICT (event_hash, timestamp) DO NOTHING RETURNING timestamp"
+)
+
+# Chunk load for the COPY path: insert new events and fold exactly those rows
+# into the rollups in one statement (duplicates skipped by ON CONFLICT never count)
+COPY_INSERT_WITH_ROLLUPS_SQL = f"""
+WITH inserted AS (
+    INSERT INTO madf_events ({", ".join(IMPORT_COLUMNS)})
+    SELECT {", ".join(IMPORT_COLUMNS)} FROM madf_events_stage
+    ON CONFLICT (event_hash, timestamp) DO NOTHING
+    RETURNING timestamp, story_id, agent_name, event_type, session_id, success,
+              duration_ms, tokens_used, context_percent, confidence_score
+),
+hourly AS ({_rollup_upsert_sql("madf_rollup_hourly", "hour", "inserted")}),
+daily AS ({_rollup_upsert_sql("madf_rollup_daily", "day", "inserted")}),
+sessions AS ({_rollup_sessions_insert_sql("inserted")})
+SELECT COUNT(*) AS inserted FROM inserted
+"""
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _floor_day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil(ts: datetime, floor, step: timedelta) -> datetime:
+    floored = floor(ts)
+    return floored if floored == ts else floored + step
+
+
+def _as_utc(ts: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to aware UTC (naive values are treated as local time)"""
+    if ts is None:
+        return None
+    return ts.astimezone(timezone.utc)
 
 
 class PostgresManager:
@@ -20,64 +202,120 @@ class PostgresManager:
 
     Synchronous implementation (Windows compatible)
     Primary operations use direct psycopg3 for performance
+
+    By default connections are borrowed from the process-wide pool
+    (postgres_pool.get_postgres_pool) and returned whenever no transaction
+    is open, so many managers/analyzers share a few connections.
     """
 
     def __init__(
         self,
-        connection_string: Optional[str] = None
+        connection_string: Optional[str] = None,
+        partition_interval: Optional[str] = None,
+        retention_days: Optional[int] = None,
+        retention_action: Optional[str] = None,
+        use_pool: Optional[bool] = None,
+        statement_timeout_ms: Optional[int] = None
     ):
         """
         Initialize Postgres manager with direct connection
 
         Args:
             connection_string: PostgreSQL connection string (default: from env)
+            partition_interval: "month" or "week" (default: MADF_PARTITION_INTERVAL or month)
+            retention_days: Remove partitions older than N days (default: MADF_RETENTION_DAYS, 0 = keep all)
+            retention_action: "detach" or "drop" expired partitions (default: MADF_RETENTION_ACTION or detach)
+            use_pool: Borrow connections from the shared pool (default: MADF_PG_POOL, enabled)
+            statement_timeout_ms: Default timeout for execute_query (default: MADF_PG_QUERY_TIMEOUT_MS, 0 = none)
         """
         self.connection_string = connection_string or os.getenv(
             "POSTGRES_CONNECTION_STRING",
             "host=localhost port=5433 user=madf password=test_password dbname=madf_logs"
         )
-        self._conn: Optional[psycopg.Connection] = None
+        self.partition_interval = partition_interval or os.getenv("MADF_PARTITION_INTERVAL", "month")
+        if self.partition_interval not in ("month", "week"):
+            raise ValueError(f"Unsupported partition interval: {self.partition_interval}")
+        self.partition_premake = int(os.getenv("MADF_PARTITION_PREMAKE", "2"))
+        self.retention_days = retention_days if retention_days is not None else int(
+            os.getenv("MADF_RETENTION_DAYS", "0"))
+        self.retention_action = retention_action or os.getenv("MADF_RETENTION_ACTION", "detach")
+        self.use_pool = use_pool if use_pool is not None else (
+            os.getenv("MADF_PG_POOL", "1").lower() not in ("0", "false", "no"))
+        self.statement_timeout_ms = statement_timeout_ms if statement_timeout_ms is not None else int(
+            os.getenv("MADF_PG_QUERY_TIMEOUT_MS", "0"))
+        self._pool = None
+        self._connection: Optional[psycopg.Connection] = None
         self._initialized = False
+        self._partitioned = False
+        self._known_partitions: Optional[set] = None
 
     def initialize(self):
         """Initialize connection and create schema"""
         if self._initialized:
             return
 
-        # Create sync connection (Windows compatible)
-        self._conn = psycopg.connect(
-            self.connection_string,
-            row_factory=dict_row
-        )
+        if self.use_pool:
+            self._pool = get_postgres_pool(self.connection_string)
+        else:
+            # Create sync connection (Windows compatible)
+            self._conn = psycopg.connect(
+                self.connection_string,
+                row_factory=dict_row
+            )
 
         # Create schema if not exists
         self.create_schema()
+        if self.retention_days:
+            self.apply_retention()
         self._initialized = True
+        self._release()
+
+    @property
+    def _conn(self) -> Optional[psycopg.Connection]:
+        """Current connection (borrowed from the pool on first use)"""
+        if self._connection is None and self._pool is not None:
+            self._connection = self._pool.getconn()
+        return self._connection
+
+    @_conn.setter
+    def _conn(self, conn: Optional[psycopg.Connection]):
+        self._connection = conn
+
+    def _release(self):
+        """Return a pooled connection once no transaction is open on it"""
+        if self._pool is not None and self._connection is not None and is_idle(self._connection):
+            self._pool.putconn(self._connection)
+            self._connection = None
 
     def create_schema(self):
-        """Create MADF logging events table schema"""
-        schema_sql = """
-        CREATE TABLE IF NOT EXISTS madf_events (
-            id BIGSERIAL PRIMARY KEY,
-            timestamp TIMESTAMPTZ NOT NULL,
-            event_type VARCHAR(50) NOT NULL,
-            category VARCHAR(50) NOT NULL,
-            session_id VARCHAR(100) NOT NULL,
-            story_id VARCHAR(20) NOT NULL,
-            agent_name VARCHAR(50),
-            workflow_id VARCHAR(100),
-            thread_id VARCHAR(100),
-            trace_id VARCHAR(100),
-            duration_ms INTEGER DEFAULT 0,
-            tokens_used INTEGER DEFAULT 0,
-            context_percent REAL DEFAULT 0.0,
-            success BOOLEAN DEFAULT true,
-            confidence_score REAL,
-            impact_score REAL,
-            details JSONB,
-            created_at TIMESTAMPTZ DEFAULT NOW()
-        );
+        """
+        Create MADF logging events table schema
+
+        madf_events is range-partitioned on timestamp (monthly or weekly) so
+        time-bounded queries only scan matching partitions. A legacy
+        unpartitioned table is left as is (see migrate_to_partitioned).
+        """
+        with self._conn.cursor() as cur:
+            cur.execute(EVENTS_TABLE_SQL)
+            self._conn.commit()
 
+        self._partitioned = self.is_partitioned()
+        self._create_indexes()
+        self.ensure_partitions()
+
+        # Backfill rollups for events imported before they existed
+        with self._conn.cursor() as cur:
+            cur.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM madf_rollup_hourly) "
+                "AND EXISTS (SELECT 1 FROM madf_events) AS needs_backfill"
+            )
+            needs_backfill = cur.fetchone()["needs_backfill"]
+        if needs_backfill:
+            self._rebuild_rollups()
+
+    def _create_indexes(self):
+        """Create indexes and side tables (propagated to partitions)"""
+        schema_sql = """
         -- Indexes for common queries
         CREATE INDEX IF NOT EXISTS idx_madf_session_id ON madf_events(session_id);
         CREATE INDEX IF NOT EXISTS idx_madf_story_id ON madf_events(story_id);
@@ -85,18 +323,539 @@ class PostgresManager:
         CREATE INDEX IF NOT EXISTS idx_madf_event_type ON madf_events(event_type);
         CREATE INDEX IF NOT EXISTS idx_madf_timestamp ON madf_events(timestamp DESC);
         CREATE INDEX IF NOT EXISTS idx_madf_success ON madf_events(success) WHERE success = false;
+
+        -- Idempotent ingestion: deterministic hash of the source event
+        -- (unique indexes on partitioned tables must include the partition key)
+        ALTER TABLE madf_events ADD COLUMN IF NOT EXISTS event_hash CHAR(64);
+        DROP INDEX IF EXISTS idx_madf_event_hash;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_madf_event_hash_ts ON madf_events(event_hash, timestamp);
+
+        -- Pattern queries: indexes on generated details columns (see DETAIL_COLUMNS)
+        -- Error patterns group on the ingest-time fingerprint, not the raw message text
+        -- (every fingerprinted event is an error, so that is the only predicate)
+        DROP INDEX IF EXISTS idx_madf_error_pattern;
+        DROP INDEX IF EXISTS idx_madf_error_fingerprint;
+        CREATE INDEX IF NOT EXISTS idx_madf_fingerprint ON madf_events(detail_error_fingerprint)
+            INCLUDE (detail_error_type, agent_name, event_type, session_id, duration_ms, timestamp)
+            WHERE detail_error_fingerprint IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_madf_detail_action ON madf_events(detail_action);
+        CREATE INDEX IF NOT EXISTS idx_madf_detail_tool ON madf_events(detail_tool);
+        -- Covering index: slow-operation query runs as an index-only scan
+        CREATE INDEX IF NOT EXISTS idx_madf_slow_ops ON madf_events(duration_ms)
+            INCLUDE (agent_name, event_type, detail_action, timestamp);
+        -- Ad-hoc containment queries on other keys (details @> '{...}')
+        CREATE INDEX IF NOT EXISTS idx_madf_details_gin ON madf_events USING gin(details jsonb_path_ops);
+
+        -- Resumable ingestion: last imported byte offset per JSONL file
+        CREATE TABLE IF NOT EXISTS madf_ingest_ledger (
+            file_path TEXT PRIMARY KEY,
+            inode BIGINT NOT NULL,
+            file_size BIGINT NOT NULL,
+            byte_offset BIGINT NOT NULL,
+            lines_read BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
         """
+        detail_columns_sql = "".join(
+            f"ALTER TABLE madf_events ADD COLUMN IF NOT EXISTS {column} TEXT "
+            f"GENERATED ALWAYS AS (details->>'{key}') STORED;\n"
+            for column, key in DETAIL_COLUMNS.items()
+        )
+        rollup_sql = "".join(_rollup_table_sql(table) for table in ROLLUP_TABLES.values())
 
         with self._conn.cursor() as cur:
+            # Generated columns first (no-op on current tables; one-time rewrite on older ones)
+            cur.execute(detail_columns_sql)
             cur.execute(schema_sql)
+            cur.execute(rollup_sql + ROLLUP_SESSIONS_SQL)
             self._conn.commit()
 
-    def import_jsonl_file(self, jsonl_path: Path) -> Dict[str, Any]:
+    def is_partitioned(self) -> bool:
+        """Check whether madf_events is a partitioned table"""
+        with self._conn.cursor() as cur:
+            cur.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'madf_events'::regclass"
+            )
+            return cur.fetchone() is not None
+
+    def _end_implicit_transaction(self):
         """
-        Import JSONL log file to Postgres
+        Commit a transaction implicitly opened by an earlier query
+
+        conn.transaction() blocks entered inside an open transaction become
+        savepoints and would not commit, so close it first.
+        """
+        if self._conn.info.transaction_status == TransactionStatus.INTRANS:
+            self._conn.commit()
+
+    def _partition_for(self, ts: datetime) -> Tuple[str, datetime, datetime]:
+        """Partition name and [start, end) bounds containing ts (UTC)"""
+        ts = ts.astimezone(timezone.utc) if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+        day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.partition_interval == "week":
+            start = day - timedelta(days=day.weekday())
+            end = start + timedelta(days=7)
+            iso_year, iso_week, _ = start.isocalendar()
+            return f"madf_events_p{iso_year}w{iso_week:02d}", start, end
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return f"madf_events_p{start:%Y_%m}", start, end
+
+    def list_partitions(self) -> List[Dict[str, Any]]:
+        """
+        List attached partitions of madf_events
+
+        Returns:
+            Partition name with start/end bounds, oldest first
+        """
+        query = """
+        SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'madf_events'::regclass
+        """
+        with self._conn.cursor() as cur:
+            cur.execute(query)
+            rows = cur.fetchall()
+
+        partitions = []
+        for row in rows:
+            match = _PARTITION_UPPER_BOUND.search(row["bound"] or "")
+            partitions.append({
+                "name": row["name"],
+                "bound": row["bound"],
+                "end": datetime.fromisoformat(match.group(1)) if match else None
+            })
+        partitions.sort(key=lambda p: (p["end"] is None, p["end"] or datetime.max.replace(tzinfo=timezone.utc)))
+        return partitions
+
+    def ensure_partitions(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create missing partitions covering [start, end] plus the next
+        partition_premake intervals after now (commits if any were created)
 
         Args:
-            jsonl_path: Path to JSONL log file
+            start: Earliest timestamp to cover (default: now)
+            end: Latest timestamp to cover (default: now)
+
+        Returns:
+            Names of partitions created
+        """
+        created = self._create_partitions(start, end)
+        if created:
+            self._conn.commit()
+        return created
+
+    def _create_partitions(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[str]:
+        """Create missing partitions in the current transaction"""
+        if not self._partitioned:
+            return []
+
+        if self._known_partitions is None:
+            self._known_partitions = {p["name"] for p in self.list_partitions()}
+
+        now = datetime.now(timezone.utc)
+        start = start or now
+        end = max(end or now, now)
+        _, _, premake_end = self._partition_for(now)
+        for _ in range(self.partition_premake):
+            _, _, premake_end = self._partition_for(premake_end)
+        end = max(end, premake_end - timedelta(microseconds=1))
+
+        created = []
+        cursor = start
+        with self._conn.cursor() as cur:
+            while True:
+                name, lower, upper = self._partition_for(cursor)
+                if name not in self._known_partitions:
+                    cur.execute(sql.SQL(
+                        "CREATE TABLE IF NOT EXISTS {} PARTITION OF madf_events "
+                        "FOR VALUES FROM ({}) TO ({})"
+                    ).format(sql.Identifier(name), sql.Literal(lower), sql.Literal(upper)))
+                    self._known_partitions.add(name)
+                    created.append(name)
+                if upper > end:
+                    break
+                cursor = upper
+        return created
+
+    def _ensure_partitions_for_rows(self, rows: List[Tuple]):
+        """Create partitions for the timestamp range of import rows"""
+        if not self._partitioned or not rows:
+            return
+        timestamps = []
+        for row in rows:
+            try:
+                timestamps.append(datetime.fromisoformat(row[0]))
+            except (TypeError, ValueError):
+                # Unparseable timestamps are rejected by COPY/INSERT
+                continue
+        if timestamps:
+            timestamps = [t if t.tzinfo else t.replace(tzinfo=timezone.utc) for t in timestamps]
+            self.ensure_partitions(min(timestamps), max(timestamps))
+
+    def apply_retention(
+        self,
+        retention_days: Optional[int] = None,
+        action: Optional[str] = None
+    ) -> List[str]:
+        """
+        Detach or drop partitions entirely older than the retention window
+
+        Args:
+            retention_days: Keep partitions ending within N days (default: self.retention_days)
+            action: "detach" (keep as standalone table) or "drop" (default: self.retention_action)
+
+        Returns:
+            Names of partitions removed from madf_events
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        action = action or self.retention_action
+        if not self._partitioned or not retention_days:
+            return []
+        if action not in ("detach", "drop"):
+            raise ValueError(f"Unsupported retention action: {action}")
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        expired = [p["name"] for p in self.list_partitions() if p["end"] and p["end"] <= cutoff]
+
+        with self._conn.cursor() as cur:
+            for name in expired:
+                if action == "drop":
+                    cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+                else:
+                    cur.execute(sql.SQL("ALTER TABLE madf_events DETACH PARTITION {}").format(
+                        sql.Identifier(name)))
+                self._known_partitions.discard(name)
+        self._conn.commit()
+        self._release()
+        return expired
+
+    def migrate_to_partitioned(self) -> int:
+        """
+        Convert a legacy unpartitioned madf_events table in one transaction
+
+        Returns:
+            Number of rows moved (0 if already partitioned)
+        """
+        if self._partitioned:
+            return 0
+
+        columns = ", ".join(("id", "created_at") + IMPORT_COLUMNS)
+        self._end_implicit_transaction()
+        try:
+            with self._conn.transaction():
+                with self._conn.cursor() as cur:
+                    cur.execute("ALTER TABLE madf_events RENAME TO madf_events_legacy")
+                    cur.execute(EVENTS_TABLE_SQL)
+                    cur.execute("SELECT MIN(timestamp) AS first, MAX(timestamp) AS last FROM madf_events_legacy")
+                    bounds = cur.fetchone()
+
+                    self._partitioned = True
+                    self._known_partitions = set()
+                    self._create_partitions(bounds["first"], bounds["last"])
+
+                    cur.execute(f"INSERT INTO madf_events ({columns}) SELECT {columns} FROM madf_events_legacy")
+                    moved = cur.rowcount
+                    cur.execute(
+                        "SELECT setval(pg_get_serial_sequence('madf_events', 'id'), "
+                        "COALESCE((SELECT MAX(id) FROM madf_events), 1))"
+                    )
+                    # Drops the legacy indexes too, freeing their names
+                    cur.execute("DROP TABLE madf_events_legacy")
+        except psycopg.Error:
+            self._partitioned = False
+            self._known_partitions = None
+            raise
+
+        self._create_indexes()
+        return moved
+
+    def refresh_rollups(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Recompute hourly/daily rollups from raw events
+
+        Ingestion keeps rollups current; use this after deleting or editing
+        raw events, or to rebuild them after a retention change.
+
+        Args:
+            start: First timestamp to recompute (default: oldest event)
+            end: Last timestamp to recompute (default: newest event)
+
+        Returns:
+            Number of hourly and daily buckets written
+        """
+        if not self._initialized:
+            self.initialize()
+        counts = self._rebuild_rollups(start, end)
+        self._release()
+        return counts
+
+    def _rebuild_rollups(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        self._end_implicit_transaction()
+        with self._conn.transaction():
+            with self._conn.cursor() as cur:
+                if start is None or end is None:
+                    cur.execute("SELECT MIN(timestamp) AS first, MAX(timestamp) AS last FROM madf_events")
+                    bounds = cur.fetchone()
+                    start = start or bounds["first"]
+                    end = end or bounds["last"]
+                if start is None or end is None:
+                    return {"hourly_buckets": 0, "daily_buckets": 0}
+                return self._refresh_rollups(cur, start, end)
+
+    def _refresh_rollups(self, cur, start: datetime, end: datetime) -> Dict[str, int]:
+        """
+        Replace rollup buckets covering [start, end] (inside the caller's transaction)
+
+        Hourly buckets and session membership are re-aggregated from raw
+        events; daily buckets are rebuilt from the hourly ones.
+        """
+        start = _as_utc(start)
+        end = _as_utc(end)
+        hour_range = {"start": _floor_hour(start), "end": _floor_hour(end) + timedelta(hours=1)}
+        day_range = {"start": _floor_day(start), "end": _floor_day(end) + timedelta(days=1)}
+        raw_source = "(SELECT * FROM madf_events WHERE timestamp >= %(start)s AND timestamp < %(end)s) e"
+
+        cur.execute(
+            "DELETE FROM madf_rollup_hourly WHERE bucket_start >= %(start)s AND bucket_start < %(end)s",
+            hour_range
+        )
+        cur.execute(_rollup_upsert_sql("madf_rollup_hourly", "hour", raw_source), hour_range)
+        hourly_buckets = cur.rowcount
+        cur.execute(
+            "DELETE FROM madf_rollup_sessions WHERE bucket_start >= %(start)s AND bucket_start < %(end)s",
+            hour_range
+        )
+        cur.execute(_rollup_sessions_insert_sql(raw_source), hour_range)
+
+        cur.execute(
+            "DELETE FROM madf_rollup_daily WHERE bucket_start >= %(start)s AND bucket_start < %(end)s",
+            day_range
+        )
+        cur.execute(
+            f"""
+            INSERT INTO madf_rollup_daily (bucket_start, story_id, agent_name, event_type, {_ROLLUP_METRIC_COLUMNS})
+            SELECT date_trunc('day', bucket_start, 'UTC'), story_id, agent_name, event_type, {_SUM_METRICS_SQL}
+            FROM madf_rollup_hourly
+            WHERE bucket_start >= %(start)s AND bucket_start < %(end)s
+            GROUP BY 1, 2, 3, 4
+            """,
+            day_range
+        )
+        return {"hourly_buckets": hourly_buckets, "daily_buckets": cur.rowcount}
+
+    def _rollup_segments(self, start: datetime, end: datetime) -> List[Tuple[str, datetime, datetime]]:
+        """
+        Split [start, end) into raw, hourly and daily segments
+
+        Whole UTC days come from madf_rollup_daily, remaining whole hours from
+        madf_rollup_hourly, and partial hours at the edges - including the
+        current open hour - from raw madf_events.
+        """
+        open_hour = _floor_hour(datetime.now(timezone.utc))
+        first_hour = _ceil(start, _floor_hour, timedelta(hours=1))
+        last_hour = _floor_hour(min(end, open_hour))
+        if first_hour >= last_hour:
+            return [("raw", start, end)]
+
+        segments = [("raw", start, first_hour)]
+        first_day = _ceil(first_hour, _floor_day, timedelta(days=1))
+        last_day = _floor_day(last_hour)
+        if first_day < last_day:
+            segments += [("hour", first_hour, first_day), ("day", first_day, last_day),
+                         ("hour", last_day, last_hour)]
+        else:
+            segments.append(("hour", first_hour, last_hour))
+        segments.append(("raw", last_hour, end))
+        return [seg for seg in segments if seg[1] < seg[2]]
+
+    def query_rollups(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        group_by: Optional[List[str]] = None,
+        include_sessions: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate event metrics from the rollup tables
+
+        Closed hours/days are read from pre-aggregated rollups; only partial
+        hours at the range edges and the current open hour touch raw events.
+
+        Args:
+            start: Range start (default: oldest rollup bucket)
+            end: Range end, exclusive (default: now)
+            filters: Equality filters on story_id / agent_name / event_type
+                (a list or tuple value matches any of its items)
+            group_by: Dimension columns to group by (default: single total row)
+            include_sessions: Also count distinct sessions (reads session membership)
+
+        Returns:
+            One row per group with summed ROLLUP_METRICS plus distinct
+            "stories" and "agents" counts (and "sessions" if requested)
+        """
+        if not self._initialized:
+            self.initialize()
+
+        filters = filters or {}
+        group_by = list(group_by or [])
+        unknown = [c for c in list(filters) + group_by if c not in ROLLUP_DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unsupported rollup dimensions: {', '.join(unknown)}")
+
+        end = _as_utc(end) or datetime.now(timezone.utc) + timedelta(seconds=1)
+        if start is None:
+            first = self.execute_query("SELECT MIN(bucket_start) AS first FROM madf_rollup_daily")[0]["first"]
+            start = first or _floor_hour(datetime.now(timezone.utc))
+        start = _as_utc(start)
+        segments = self._rollup_segments(start, end) if start < end else []
+
+        def filter_sql(raw: bool) -> Tuple[str, List[Any]]:
+            clauses, params = [], []
+            for column, value in filters.items():
+                expr = "COALESCE(agent_name, '')" if raw and column == "agent_name" else column
+                if isinstance(value, (list, tuple)):
+                    clauses.append(f"{expr} = ANY(%s)")
+                    params.append([v or "" for v in value] if column == "agent_name" else list(value))
+                else:
+                    clauses.append(f"{expr} = %s")
+                    params.append((value or "") if column == "agent_name" else value)
+            return "".join(f" AND {c}" for c in clauses), params
+
+        def union(metric_parts: bool) -> Tuple[str, List[Any]]:
+            parts, params = [], []
+            for kind, seg_start, seg_end in segments:
+                where, where_params = filter_sql(raw=kind == "raw")
+                if kind == "raw":
+                    select = ("story_id, COALESCE(agent_name, '') AS agent_name, event_type, "
+                              + (_RAW_METRICS_SQL if metric_parts else "session_id"))
+                    tail = " GROUP BY 1, 2, 3" if metric_parts else ""
+                    parts.append(f"SELECT {select} FROM madf_events "
+                                 f"WHERE timestamp >= %s AND timestamp < %s{where}{tail}")
+                else:
+                    table = ROLLUP_TABLES[kind] if metric_parts else "madf_rollup_sessions"
+                    columns = _ROLLUP_METRIC_COLUMNS if metric_parts else "session_id"
+                    parts.append(f"SELECT story_id, agent_name, event_type, {columns} FROM {table} "
+                                 f"WHERE bucket_start >= %s AND bucket_start < %s{where}")
+                params += [seg_start, seg_end] + where_params
+            return " UNION ALL ".join(parts), params
+
+        if not segments:
+            return []
+
+        group_sql = ", ".join(group_by)
+        select_groups = f"{group_sql}, " if group_by else ""
+        group_clause = f" GROUP BY {group_sql}" if group_by else ""
+
+        metrics_union, params = union(metric_parts=True)
+        sums = ", ".join(f"COALESCE(SUM({name}), 0) AS {name}" for name in ROLLUP_METRICS)
+        rows = self.execute_query(
+            f"SELECT {select_groups}{sums}, COUNT(DISTINCT story_id) AS stories, "
+            f"COUNT(DISTINCT NULLIF(agent_name, '')) AS agents "
+            f"FROM ({metrics_union}) segments{group_clause}",
+            tuple(params)
+        )
+
+        if include_sessions:
+            sessions_union, params = union(metric_parts=False)
+            session_rows = self.execute_query(
+                f"SELECT {select_groups}COUNT(DISTINCT session_id) AS sessions "
+                f"FROM ({sessions_union}) segments{group_clause}",
+                tuple(params)
+            )
+            sessions = {tuple(r[c] for c in group_by): r["sessions"] for r in session_rows}
+            for row in rows:
+                row["sessions"] = sessions.get(tuple(row[c] for c in group_by), 0)
+
+        return [row for row in rows if row["event_count"]]
+
+    def backfill_error_fingerprints(self, batch_size: int = 1000) -> int:
+        """
+        Fingerprint error events imported before fingerprinting existed
+
+        New events are fingerprinted at import time; this fills
+        details.error_fingerprint (and so detail_error_fingerprint) for
+        older rows, one batch per transaction.
+
+        Args:
+            batch_size: Rows read per batch
+
+        Returns:
+            Number of events updated
+        """
+        if not self._initialized:
+            self.initialize()
+
+        updated = 0
+        last_id = 0
+        self._end_implicit_transaction()
+        while True:
+            with self._conn.transaction():
+                with self._conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT id, timestamp, event_type, category, success, details
+                        FROM madf_events
+                        WHERE id > %s
+                          AND detail_error_fingerprint IS NULL
+                          AND (category = 'error' OR event_type = 'error'
+                               OR (success = false AND detail_error IS NOT NULL))
+                        ORDER BY id
+                        LIMIT %s
+                        """,
+                        (last_id, batch_size)
+                    )
+                    rows = cur.fetchall()
+                    patches = []
+                    for row in rows:
+                        details = fingerprint_details(row)
+                        if isinstance(details, dict) and "error_fingerprint" in details:
+                            patches.append((Jsonb(details), row["id"], row["timestamp"]))
+                    if patches:
+                        cur.executemany(
+                            "UPDATE madf_events SET details = %s WHERE id = %s AND timestamp = %s",
+                            patches
+                        )
+            updated += len(patches)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
+
+        self._release()
+        return updated
+
+    def import_jsonl_file(self, jsonl_path: Path, validate: bool = False) -> Dict[str, Any]:
+        """
+        Import JSONL log file to Postgres (one INSERT per line)
+
+        Rows are keyed by the same event hash as the bulk and incremental paths
+        and inserted with ON CONFLICT DO NOTHING, so re-importing a file (with
+        any of the import methods) skips events that are already stored. Each
+        row runs in its own savepoint, so a bad line only fails that line.
+
+        Args:
+            jsonl_path: Path to JSONL log file (.jsonl or zstd-compressed .jsonl.zst)
+            validate: Validate events against UniversalEventSchema during import
+                (offline validation for loggers running with validation off or sampled).
+                Invalid events are still imported with details.schema_validation_error set.
 
         Returns:
             Import statistics
@@ -106,64 +865,488 @@ class PostgresManager:
 
         total_events = 0
         successful_imports = 0
+        duplicate_events = 0
         failed_imports = 0
+        invalid_events = 0
+        timestamps = []
 
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
+        with open_log(jsonl_path) as f:
             with self._conn.cursor() as cur:
                 for line_num, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
                     total_events += 1
                     try:
-                        event = json.loads(line.strip())
-
-                        # Extract fields
-                        insert_sql = """
-                        INSERT INTO madf_events (
-                            timestamp, event_type, category, session_id, story_id,
-                            agent_name, workflow_id, thread_id, trace_id,
-                            duration_ms, tokens_used, context_percent,
-                            success, confidence_score, impact_score, details
-                        ) VALUES (
-                            %(timestamp)s, %(event_type)s, %(category)s, %(session_id)s, %(story_id)s,
-                            %(agent_name)s, %(workflow_id)s, %(thread_id)s, %(trace_id)s,
-                            %(duration_ms)s, %(tokens_used)s, %(context_percent)s,
-                            %(success)s, %(confidence_score)s, %(impact_score)s, %(details)s
-                        )
-                        """
-
-                        params = {
-                            "timestamp": event.get("timestamp"),
-                            "event_type": event.get("event_type"),
-                            "category": event.get("category"),
-                            "session_id": event.get("session_id"),
-                            "story_id": event.get("story_id"),
-                            "agent_name": event.get("agent_name"),
-                            "workflow_id": event.get("workflow_id"),
-                            "thread_id": event.get("thread_id"),
-                            "trace_id": event.get("trace_id"),
-                            "duration_ms": event.get("duration_ms", 0),
-                            "tokens_used": event.get("tokens_used", 0),
-                            "context_percent": event.get("context_percent", 0.0),
-                            "success": event.get("success", True),
-                            "confidence_score": event.get("confidence_score"),
-                            "impact_score": event.get("impact_score"),
-                            "details": json.dumps(event.get("details", {}))
-                        }
-
-                        cur.execute(insert_sql, params)
-                        successful_imports += 1
-
+                        event, event_hash, error = self._parse_event(line, validate)
+                        row = self._event_row(event, event_hash)
                     except Exception as e:
                         failed_imports += 1
                         print(f"Line {line_num} import failed: {e}")
+                        continue
+                    if error is not None:
+                        invalid_events += 1
+
+                    self._ensure_partitions_for_rows([row])
+                    cur.execute("SAVEPOINT madf_import_row")
+                    try:
+                        cur.execute(ROW_INSERT_SQL, row)
+                        returned = cur.fetchone()
+                    except psycopg.Error as e:
+                        cur.execute("ROLLBACK TO SAVEPOINT madf_import_row")
+                        failed_imports += 1
+                        print(f"Line {line_num} import failed: {e}")
+                        continue
+                    cur.execute("RELEASE SAVEPOINT madf_import_row")
+                    if returned:
+                        timestamps.append(returned["timestamp"])
+                        successful_imports += 1
+                    else:
+                        duplicate_events += 1
 
+                if timestamps and self._conn.info.transaction_status == TransactionStatus.INTRANS:
+                    self._refresh_rollups(cur, min(timestamps), max(timestamps))
                 self._conn.commit()
+        self._release()
 
         return {
             "total_events": total_events,
             "successful_imports": successful_imports,
+            "duplicate_events": duplicate_events,
             "failed_imports": failed_imports,
+            "invalid_events": invalid_events,
+            "file_path": str(jsonl_path)
+        }
+
+    @staticmethod
+    def compute_event_hash(event: Dict[str, Any]) -> str:
+        """Deterministic event hash (idempotency key, see quick_logger.compute_event_hash)"""
+        return compute_event_hash(event)
+
+    @staticmethod
+    def _event_row(event: Dict[str, Any], event_hash: str) -> Tuple:
+        """Map a JSONL event to an IMPORT_COLUMNS row (missing optional fields get defaults)"""
+        missing = [c for c in REQUIRED_COLUMNS if event.get(c) is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        return (
+            event["timestamp"],
+            event["event_type"],
+            event["category"],
+            event["session_id"],
+            event["story_id"],
+            event.get("agent_name"),
+            event.get("workflow_id"),
+            event.get("thread_id"),
+            event.get("trace_id"),
+            event.get("duration_ms", 0),
+            event.get("tokens_used", 0),
+            event.get("context_percent", 0.0),
+            event.get("success", True),
+            event.get("confidence_score"),
+            event.get("impact_score"),
+            Jsonb(fingerprint_details(event)),
+            event_hash
+        )
+
+    def _parse_event(self, line: str, validate: bool) -> Tuple[Dict[str, Any], str, Optional[str]]:
+        """
+        Parse one JSONL line (raises on bad input)
+
+        Returns:
+            (event, event hash, schema validation error or None)
+        """
+        event = json.loads(line)
+        if not isinstance(event, dict):
+            raise ValueError("Event is not a JSON object")
+
+        # Hash before validation tagging so the key only depends on the logged event
+        event_hash = self.compute_event_hash(event)
+
+        error = None
+        if validate:
+            error = validate_event(event)
+            if error is not None:
+                details = event.get("details")
+                event["details"] = {
+                    **(details if isinstance(details, dict) else {}),
+                    "schema_validation_error": error
+                }
+
+        return event, event_hash, error
+
+    def _parse_line(self, line: str, validate: bool) -> Tuple:
+        """Parse one JSONL line into an import row (raises on bad input)"""
+        event, event_hash, _ = self._parse_event(line, validate)
+        return self._event_row(event, event_hash)
+
+    def bulk_import_jsonl_file(
+        self,
+        jsonl_path: Path,
+        chunk_size: int = 5000,
+        reject_path: Optional[Path] = None,
+        validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bulk import JSONL log file with COPY FROM STDIN
+
+        Lines are parsed as they stream from disk and loaded one chunk per COPY
+        and commit. Lines that fail to parse or load are appended to a reject
+        sidecar file (JSONL with line number, error and raw line) instead of
+        aborting the import. Events already present (same event hash) are skipped.
+
+        Args:
+            jsonl_path: Path to JSONL log file
+            chunk_size: Rows per COPY/commit
+            reject_path: Reject sidecar file (default: <jsonl_path>.rejects)
+            validate: Tag schema-invalid events in details (see import_jsonl_file)
+
+        Returns:
+            Import statistics including rows_per_second
+        """
+        if not self._initialized:
+            self.initialize()
+
+        jsonl_path = Path(jsonl_path)
+        with open_log(jsonl_path) as f:
+            lines = ((line_num, line, None) for line_num, line in enumerate(f, 1))
+            return self._ingest_lines(jsonl_path, lines, chunk_size, reject_path, validate)
+
+    def incremental_import_jsonl_file(
+        self,
+        jsonl_path: Path,
+        chunk_size: int = 5000,
+        reject_path: Optional[Path] = None,
+        validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import only what was appended since the last run (resumable)
+
+        Resumes from the byte offset recorded in madf_ingest_ledger. The offset is
+        committed in the same transaction as each chunk, so an interrupted import
+        resumes exactly where it stopped. A changed inode or a file shorter than
+        the recorded offset (rotation/truncation) restarts from the beginning;
+        the event hash keeps that idempotent. A trailing line without a newline
+        (still being written) is left for the next run. Compressed (.jsonl.zst)
+        files are immutable: they are imported whole once, with the compressed
+        size recorded as the offset when the last chunk commits.
+
+        Args:
+            jsonl_path: Path to JSONL log file
+            chunk_size: Rows per COPY/commit
+            reject_path: Reject sidecar file (default: <jsonl_path>.rejects)
+            validate: Tag schema-invalid events in details (see import_jsonl_file)
+
+        Returns:
+            Import statistics including start/end byte offsets
+        """
+        if not self._initialized:
+            self.initialize()
+
+        jsonl_path = Path(jsonl_path).resolve()
+        file_stat = jsonl_path.stat()
+        position = self.get_ingest_position(jsonl_path)
+
+        start_offset = 0
+        start_line = 0
+        if position and position["inode"] == file_stat.st_ino and position["byte_offset"] <= file_stat.st_size:
+            start_offset = position["byte_offset"]
+            start_line = position["lines_read"]
+
+        ledger = {
+            "file_path": str(jsonl_path),
+            "inode": file_stat.st_ino,
+            "file_size": file_stat.st_size,
+            "byte_offset": start_offset,
+            "lines_read": start_line
+        }
+
+        if start_offset == file_stat.st_size:
+            # Nothing appended since last run
+            result = self._ingest_stats(jsonl_path, None, time.perf_counter(), ledger=ledger)
+        elif is_compressed(jsonl_path):
+            start_offset, ledger["byte_offset"], ledger["lines_read"] = 0, 0, 0
+            with open_log(jsonl_path) as f:
+                result = self._ingest_lines(
+                    jsonl_path, self._whole_file_lines(f, file_stat.st_size),
+                    chunk_size, reject_path, validate, ledger=ledger
+                )
+        else:
+            with open(jsonl_path, 'rb') as f:
+                f.seek(start_offset)
+                result = self._ingest_lines(
+                    jsonl_path, self._complete_lines(f, start_offset, start_line),
+                    chunk_size, reject_path, validate, ledger=ledger
+                )
+        result["start_offset"] = start_offset
+        return result
+
+    @staticmethod
+    def _complete_lines(f, offset: int, line_num: int):
+        """Yield (line_num, line, end_offset) for newline-terminated lines only"""
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            line_num += 1
+            yield line_num, raw.decode("utf-8", errors="replace"), offset
+
+    @staticmethod
+    def _whole_file_lines(f, size: int):
+        """Yield (line_num, line, end_offset); end_offset is 0 until the last line, which gets size"""
+        previous = None
+        for entry in enumerate(f, 1):
+            if previous:
+                yield previous[0], previous[1], 0
+            previous = entry
+        if previous:
+            yield previous[0], previous[1], size
+
+    def follow_jsonl_files(
+        self,
+        log_dir: Optional[Path] = None,
+        pattern: str = "story_*.jsonl",
+        poll_interval: float = 1.0,
+        stop_event: Optional[threading.Event] = None,
+        max_polls: Optional[int] = None,
+        chunk_size: int = 5000
+    ) -> Dict[str, Any]:
+        """
+        Tail QuickLogger files and stream new lines into madf_events
+
+        Polls log_dir for files matching pattern and incrementally imports each
+        file that grew since the last poll (new daily files are picked up
+        automatically). Runs until stop_event is set or max_polls is reached.
+
+        Args:
+            log_dir: Directory to watch (default: MADF_LOG_PATH)
+            pattern: Glob for QuickLogger JSONL files
+            poll_interval: Seconds between polls
+            stop_event: Event that ends the loop when set
+            max_polls: Stop after this many polls (None = run until stopped)
+            chunk_size: Rows per COPY/commit
+
+        Returns:
+            Totals across all polls
+        """
+        log_dir = Path(log_dir or os.getenv("MADF_LOG_PATH", "D:/Logs/MADF"))
+        stop_event = stop_event or threading.Event()
+        seen_sizes: Dict[str, int] = {}
+        totals = {"polls": 0, "files": 0, "successful_imports": 0, "failed_imports": 0, "duplicate_events": 0}
+
+        while not stop_event.is_set():
+            for path in iter_log_files(log_dir, pattern):
+                size = path.stat().st_size
+                if seen_sizes.get(str(path)) == size:
+                    continue
+                result = self.incremental_import_jsonl_file(path, chunk_size=chunk_size)
+                seen_sizes[str(path)] = size
+                totals["files"] += 1
+                for key in ("successful_imports", "failed_imports", "duplicate_events"):
+                    totals[key] += result[key]
+
+            totals["polls"] += 1
+            if max_polls is not None and totals["polls"] >= max_polls:
+                break
+            stop_event.wait(poll_interval)
+
+        return totals
+
+    def get_ingest_position(self, jsonl_path: Path) -> Optional[Dict[str, Any]]:
+        """Get ledger entry (inode, size, byte offset) for a file"""
+        if not self._initialized:
+            self.initialize()
+
+        with self._conn.cursor() as cur:
+            cur.execute(
+                "SELECT * FROM madf_ingest_ledger WHERE file_path = %s",
+                (str(Path(jsonl_path).resolve()),)
+            )
+            row = cur.fetchone()
+        # Read-only lookup - don't leave a transaction open
+        self._conn.commit()
+        self._release()
+        return row
+
+    def _ingest_lines(
+        self,
+        jsonl_path: Path,
+        lines,
+        chunk_size: int,
+        reject_path: Optional[Path],
+        validate: bool,
+        ledger: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Shared chunked COPY loop for bulk and incremental import"""
+        reject_path = Path(reject_path) if reject_path else jsonl_path.with_name(jsonl_path.name + ".rejects")
+        counts = {"total_events": 0, "successful_imports": 0, "duplicate_events": 0,
+                  "failed_imports": 0, "chunks": 0}
+        chunk: List[Tuple[int, str, Tuple]] = []
+        rejects: List[Tuple[int, str, str]] = []
+        advanced = False
+        start_time = time.perf_counter()
+
+
+        for line_num, line, end_offset in lines:
+            if ledger is not None:
+                ledger["byte_offset"] = end_offset
+                ledger["lines_read"] = line_num
+                advanced = True
+            if not line.strip():
+                continue
+            counts["total_events"] += 1
+            try:
+                chunk.append((line_num, line, self._parse_line(line, validate)))
+            except Exception as e:
+                rejects.append((line_num, line, str(e)))
+
+            if len(chunk) >= chunk_size:
+                self._flush_chunk(chunk, rejects, counts, reject_path, ledger)
+                chunk = []
+                rejects = []
+                advanced = False
+
+        if chunk or rejects or advanced:
+            self._flush_chunk(chunk, rejects, counts, reject_path, ledger)
+        self._release()
+
+        return self._ingest_stats(jsonl_path, reject_path, start_time, counts=counts, ledger=ledger)
+
+    def _flush_chunk(
+        self,
+        chunk: List[Tuple[int, str, Tuple]],
+        rejects: List[Tuple[int, str, str]],
+        counts: Dict[str, int],
+        reject_path: Path,
+        ledger: Optional[Dict[str, Any]]
+    ):
+        """Load one chunk (plus ledger offset) and record its rejects"""
+        self._ensure_partitions_for_rows([row for _, _, row in chunk])
+        inserted, load_rejects = self._copy_chunk(chunk, ledger)
+        rejects = rejects + load_rejects
+
+        counts["successful_imports"] += inserted
+        counts["duplicate_events"] += len(chunk) - len(load_rejects) - inserted
+        counts["failed_imports"] += len(rejects)
+        if chunk:
+            counts["chunks"] += 1
+        if rejects:
+            self._write_rejects(reject_path, rejects)
+
+    def _copy_chunk(
+        self,
+        chunk: List[Tuple[int, str, Tuple]],
+        ledger: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, List[Tuple[int, str, str]]]:
+        """
+        Load one chunk in a single transaction
+
+        Rows are COPYed into a temp staging table and moved with
+        INSERT ... ON CONFLICT (event_hash, timestamp) DO NOTHING, so re-imported events are
+        skipped. The newly inserted rows are added to the hourly/daily rollups
+        in the same statement. COPY is all-or-nothing, so a failing chunk is
+        retried row by row (one savepoint per row) to isolate the bad rows, and
+        the rollups for the affected hours are then recomputed. The ledger
+        offset (if any) is saved in the same transaction.
+
+        Returns:
+            (rows inserted, rejected (line_num, raw_line, error) tuples)
+        """
+        columns = ", ".join(IMPORT_COLUMNS)
+        self._end_implicit_transaction()
+        try:
+            with self._conn.transaction():
+                with self._conn.cursor() as cur:
+                    inserted = 0
+                    if chunk:
+                        cur.execute(
+                            "CREATE TEMP TABLE IF NOT EXISTS madf_events_stage ON COMMIT DELETE ROWS AS "
+                            f"SELECT {columns} FROM madf_events WITH NO DATA"
+                        )
+                        with cur.copy(f"COPY madf_events_stage ({columns}) FROM STDIN") as copy:
+                            for _, _, row in chunk:
+                                copy.write_row(row)
+                        cur.execute(COPY_INSERT_WITH_ROLLUPS_SQL)
+                        inserted = cur.fetchone()["inserted"]
+                    self._save_ledger(cur, ledger)
+            return inserted, []
+        except psycopg.Error:
+            # Transaction block already rolled back
+            pass
+
+        rejects = []
+        inserted = 0
+        timestamps = []
+        with self._conn.transaction():
+            with self._conn.cursor() as cur:
+                for line_num, line, row in chunk:
+                    try:
+                        with self._conn.transaction():
+                            cur.execute(ROW_INSERT_SQL, row)
+                            returned = cur.fetchone()
+                    except psycopg.Error as e:
+                        rejects.append((line_num, line, str(e).strip()))
+                        continue
+                    if returned:
+                        timestamps.append(returned["timestamp"])
+                        inserted += 1
+                if timestamps:
+                    self._refresh_rollups(cur, min(timestamps), max(timestamps))
+                self._save_ledger(cur, ledger)
+        return inserted, rejects
+
+    @staticmethod
+    def _save_ledger(cur, ledger: Optional[Dict[str, Any]]):
+        """Upsert ingestion ledger position (inside the chunk transaction)"""
+        if ledger is None:
+            return
+        cur.execute(
+            """
+            INSERT INTO madf_ingest_ledger (file_path, inode, file_size, byte_offset, lines_read, updated_at)
+            VALUES (%(file_path)s, %(inode)s, %(file_size)s, %(byte_offset)s, %(lines_read)s, NOW())
+            ON CONFLICT (file_path) DO UPDATE SET
+                inode = EXCLUDED.inode,
+                file_size = EXCLUDED.file_size,
+                byte_offset = EXCLUDED.byte_offset,
+                lines_read = EXCLUDED.lines_read,
+                updated_at = NOW()
+            """,
+            ledger
+        )
+
+    @staticmethod
+    def _write_rejects(reject_path: Path, rejects: List[Tuple[int, str, str]]) -> int:
+        """Append rejected lines to the sidecar file"""
+        with open(reject_path, 'a', encoding='utf-8') as f:
+            for line_num, line, error in rejects:
+                f.write(json.dumps({
+                    "line": line_num,
+                    "error": error,
+                    "raw": line.rstrip("\n")
+                }, ensure_ascii=True) + "\n")
+        return len(rejects)
+
+    @staticmethod
+    def _ingest_stats(
+        jsonl_path: Path,
+        reject_path: Optional[Path],
+        start_time: float,
+        counts: Optional[Dict[str, int]] = None,
+        ledger: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        counts = counts or {"total_events": 0, "successful_imports": 0, "duplicate_events": 0,
+                            "failed_imports": 0, "chunks": 0}
+        duration = time.perf_counter() - start_time
+        stats = {
+            **counts,
+            "duration_seconds": round(duration, 3),
+            "rows_per_second": round(counts["successful_imports"] / duration, 1) if duration > 0 else 0.0,
+            "reject_path": str(reject_path) if counts["failed_imports"] else None,
             "file_path": str(jsonl_path)
         }
+        if ledger is not None:
+            stats["end_offset"] = ledger["byte_offset"]
+        return stats
 
     def get_session_stats(self, session_id: str) -> Dict[str, Any]:
         """
@@ -175,10 +1358,51 @@ class PostgresManager:
         Returns:
             Session statistics dictionary
         """
+        results = self.get_sessions_stats(session_ids=[session_id], limit=1)
+        return results[0] if results else {}
+
+    def get_sessions_stats(
+        self,
+        session_ids: Optional[List[str]] = None,
+        story_id: Optional[str] = None,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Summary statistics for many sessions in one grouped query
+
+        Sessions are ordered by last activity, newest first. Pass the
+        (end_time, session_id) of the last row as `before` to fetch the
+        next page (keyset pagination, stable while new events arrive).
+
+        Args:
+            session_ids: Sessions to include (None = all)
+            story_id: Only sessions of this story
+            limit: Maximum sessions per page
+            before: Cursor from the previous page's last row
+
+        Returns:
+            List of session statistics dictionaries (same keys as get_session_stats)
+        """
         if not self._initialized:
             self.initialize()
+        if session_ids is not None and not session_ids:
+            return []
 
-        query = """
+        conditions, params = [], []
+        if session_ids is not None:
+            conditions.append("session_id = ANY(%s)")
+            params.append(list(session_ids))
+        if story_id is not None:
+            conditions.append("story_id = %s")
+            params.append(story_id)
+        having = ""
+        if before is not None:
+            having = "HAVING (MAX(timestamp), session_id) < (%s, %s)"
+            params.extend(before)
+        params.append(limit)
+
+        query = f"""
         SELECT
             session_id,
             story_id,
@@ -192,22 +1416,34 @@ class PostgresManager:
             MIN(timestamp) as start_time,
             MAX(timestamp) as end_time
         FROM madf_events
-        WHERE session_id = %s
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
         GROUP BY session_id, story_id
+        {having}
+        ORDER BY end_time DESC, session_id DESC
+        LIMIT %s
         """
 
-        with self._conn.cursor() as cur:
-            cur.execute(query, (session_id,))
-            result = cur.fetchone()
-            return result or {}
+        return self.execute_query(query, tuple(params))
 
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+    def execute_query(
+        self,
+        query: str,
+        params: tuple = None,
+        timeout_ms: Optional[int] = None,
+        prepare: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Execute arbitrary SQL query
 
+        Runs in its own transaction (committed, and the pooled connection
+        returned) unless the caller already has one open.
+
         Args:
             query: SQL query string
             params: Query parameters
+            timeout_ms: Statement timeout for this query (default: self.statement_timeout_ms)
+            prepare: True to prepare server-side on first use (cached per connection),
+                None to let psycopg prepare after repeated use
 
         Returns:
             List of result dictionaries
@@ -215,13 +1451,33 @@ class PostgresManager:
         if not self._initialized:
             self.initialize()
 
-        with self._conn.cursor() as cur:
-            cur.execute(query, params or ())
-            return cur.fetchall()
+        timeout_ms = self.statement_timeout_ms if timeout_ms is None else timeout_ms
+        owns_transaction = self._connection is None or is_idle(self._connection)
+        try:
+            with statement_timeout(self._conn, timeout_ms):
+                with self._conn.cursor() as cur:
+                    cur.execute(query, params or (), prepare=prepare)
+                    results = cur.fetchall()
+        except Exception:
+            if owns_transaction:
+                self._conn.rollback()
+                self._release()
+            raise
+
+        if owns_transaction:
+            self._conn.commit()
+            self._release()
+        return results
 
     def close(self):
-        """Close Postgres connection"""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
-            self._initialized = False
+        """Close Postgres connection (or return it to the pool)"""
+        if self._connection is not None:
+            if self._pool is not None:
+                if not self._connection.closed and not is_idle(self._connection):
+                    self._connection.rollback()
+                self._pool.putconn(self._connection)
+            else:
+                self._connection.close()
+            self._connection = None
+        self._pool = None
+        self._initialized = False
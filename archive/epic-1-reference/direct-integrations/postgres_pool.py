@@ -0,0 +1,182 @@
+"""
+Postgres Connection Pools - Process-wide psycopg_pool pools for MADF analytics
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+PostgresManager instances (and the LogAnalyzer / PatternExtractor /
+WeeklyRevision / MADFOptimizer / ValidatorAgentEnhanced components built on
+them) borrow connections from one pool per connection string instead of
+each opening a dedicated psycopg.connect.
+
+Configuration (environment):
+    MADF_PG_POOL_MIN: Connections kept open (default: 1)
+    MADF_PG_POOL_MAX: Upper bound on open connections (default: 5)
+    MADF_PG_POOL_TIMEOUT: Seconds to wait for a free connection (default: 30)
+    MADF_PG_POOL_MAX_IDLE: Seconds before idle extra connections close (default: 300)
+    MADF_PG_STATEMENT_TIMEOUT_MS: Default statement_timeout for pooled connections (default: 0 = none)
+"""
+
+import os
+import atexit
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Any, Optional, Tuple
+
+from psycopg.rows import dict_row
+from psycopg.pq import TransactionStatus
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
+
+
+def pool_settings() -> Dict[str, Any]:
+    """Pool sizing and timeouts from environment"""
+    return {
+        "min_size": int(os.getenv("MADF_PG_POOL_MIN", "1")),
+        "max_size": int(os.getenv("MADF_PG_POOL_MAX", "5")),
+        "timeout": float(os.getenv("MADF_PG_POOL_TIMEOUT", "30")),
+        "max_idle": float(os.getenv("MADF_PG_POOL_MAX_IDLE", "300")),
+        "statement_timeout_ms": int(os.getenv("MADF_PG_STATEMENT_TIMEOUT_MS", "0"))
+    }
+
+
+def _pool_kwargs(settings: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split settings into pool arguments and per-connection kwargs"""
+    connection_kwargs: Dict[str, Any] = {"row_factory": dict_row}
+    if settings["statement_timeout_ms"]:
+        connection_kwargs["options"] = f"-c statement_timeout={settings['statement_timeout_ms']}"
+    pool_args = {
+        "min_size": settings["min_size"],
+        "max_size": max(settings["max_size"], settings["min_size"]),
+        "timeout": settings["timeout"],
+        "max_idle": settings["max_idle"]
+    }
+    return pool_args, connection_kwargs
+
+
+# Global pools shared by all PostgresManager instances
+_pools: Dict[str, ConnectionPool] = {}
+_async_pools: Dict[Tuple[str, int], AsyncConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_postgres_pool(connection_string: str) -> ConnectionPool:
+    """
+    Get or create the process-wide sync pool for a connection string
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        Open ConnectionPool (connections use dict_row)
+    """
+    pool = _pools.get(connection_string)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(connection_string)
+            if pool is None:
+                pool_args, connection_kwargs = _pool_kwargs(pool_settings())
+                pool = ConnectionPool(
+                    connection_string,
+                    kwargs=connection_kwargs,
+                    name=f"madf-{len(_pools)}",
+                    open=True,
+                    **pool_args
+                )
+                _pools[connection_string] = pool
+    return pool
+
+
+async def get_async_postgres_pool(connection_string: str) -> AsyncConnectionPool:
+    """
+    Get or create the async pool for a connection string
+
+    Async pools are bound to the event loop that opened them, so one pool
+    is kept per (connection string, running loop).
+
+    Args:
+        connection_string: PostgreSQL connection string
+
+    Returns:
+        Open AsyncConnectionPool (connections use dict_row)
+    """
+    key = (connection_string, id(asyncio.get_running_loop()))
+    pool = _async_pools.get(key)
+    if pool is None:
+        pool_args, connection_kwargs = _pool_kwargs(pool_settings())
+        pool = AsyncConnectionPool(
+            connection_string,
+            kwargs=connection_kwargs,
+            name=f"madf-async-{len(_async_pools)}",
+            open=False,
+            **pool_args
+        )
+        if _async_pools.setdefault(key, pool) is pool:
+            await pool.open()
+        else:
+            pool = _async_pools[key]
+    return pool
+
+
+def _set_local_timeout(cur, timeout_ms: int):
+    cur.execute("SELECT set_config('statement_timeout', %s, true)", (str(int(timeout_ms)),))
+
+
+@contextmanager
+def statement_timeout(conn, timeout_ms: Optional[int]):
+    """
+    Apply a statement timeout to the queries run inside the block
+
+    Uses a transaction-local setting, so the pooled connection's default is
+    restored afterwards. Opens a transaction (or savepoint) for the block.
+
+    Args:
+        conn: psycopg Connection
+        timeout_ms: Timeout in milliseconds (None or 0 = keep connection default)
+    """
+    if not timeout_ms:
+        yield conn
+        return
+    with conn.transaction():
+        with conn.cursor() as cur:
+            _set_local_timeout(cur, timeout_ms)
+        yield conn
+
+
+@asynccontextmanager
+async def async_statement_timeout(conn, timeout_ms: Optional[int]):
+    """Async variant of statement_timeout for AsyncConnection"""
+    if not timeout_ms:
+        yield conn
+        return
+    async with conn.transaction():
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT set_config('statement_timeout', %s, true)", (str(int(timeout_ms)),))
+        yield conn
+
+
+def is_idle(conn) -> bool:
+    """True if the connection has no open transaction (safe to return to the pool)"""
+    return conn.info.transaction_status == TransactionStatus.IDLE
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Usage counters for every sync pool (psycopg_pool get_stats)"""
+    return {pool.name: pool.get_stats() for pool in list(_pools.values())}
+
+
+def close_postgres_pools(timeout: float = 5.0):
+    """Close all sync pools (async pools close with their event loop)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close(timeout=timeout)
+
+
+async def close_async_postgres_pools():
+    """Close async pools opened on the running event loop"""
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _async_pools if k[1] == loop_id]:
+        await _async_pools.pop(key).close()
+
+
+atexit.register(close_postgres_pools)
@@ -17,6 +17,7 @@ from sentry_sdk.integrations.logging import LoggingIntegration
 from pathlib import Path
 
 from .quick_logger import QuickLogger
+from .error_fingerprint import error_fingerprint
 
 
 class SentryManager:
@@ -171,12 +172,19 @@ class SentryManager:
             story_id: Story being executed
             session_id: Session identifier
             context: Additional context dictionary
+
+        Errors are grouped in Sentry by the same fingerprint that
+        error-pattern queries use (see error_fingerprint).
         """
         if not self._initialized:
             return
 
+        fingerprint = error_fingerprint(type(error).__name__, str(error))
+
         # Set context tags
         with sentry_sdk.push_scope() as scope:
+            scope.fingerprint = ["madf", fingerprint]
+            scope.set_tag("error_fingerprint", fingerprint)
             if agent_name:
                 scope.set_tag("agent", agent_name)
             if story_id:
@@ -200,6 +208,7 @@ class SentryManager:
             details={
                 "error_type": type(error).__name__,
                 "error_message": str(error),
+                "error_fingerprint": fingerprint,
                 "sentry_event_id": event_id,
                 "story_id": story_id,
                 "session_id": session_id,
@@ -215,7 +224,8 @@ class SentryManager:
         level: str = "info",
         agent_name: Optional[str] = None,
         story_id: Optional[str] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        fingerprint: Optional[str] = None
     ):
         """
         Capture custom message/event
@@ -226,11 +236,16 @@ class SentryManager:
             agent_name: Agent sending message
             story_id: Story being executed
             context: Additional context
+            fingerprint: Error fingerprint to group this event under
+                (default: Sentry groups by message text)
         """
         if not self._initialized:
             return
 
         with sentry_sdk.push_scope() as scope:
+            if fingerprint:
+                scope.fingerprint = ["madf", fingerprint]
+                scope.set_tag("error_fingerprint", fingerprint)
             if agent_name:
                 scope.set_tag("agent", agent_name)
             if story_id:
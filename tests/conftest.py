@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the Postgres-backed analytics tests
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+and are skipped without one; pure-Python tests in the same modules always run.
+Rows are tagged with the test module's STORY_ID and removed after each test.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+
+# Tables with a story_id column that tests write to
+STORY_TABLES = ("madf_events", "madf_rollup_hourly", "madf_rollup_daily", "madf_rollup_sessions")
+
+
+def _delete_story_rows(manager, story_id: str):
+    for table in STORY_TABLES:
+        manager.execute_query(f"DELETE FROM {table} WHERE story_id = %s RETURNING story_id", (story_id,))
+    manager.execute_query("DELETE FROM madf_ingest_ledger WHERE file_path LIKE %s RETURNING file_path",
+                          (f"%story_{story_id}_%",))
+
+
+@pytest.fixture
+def manager(request):
+    """
+    Initialized sync PostgresManager
+
+    Pooled by default; pass PostgresManager options with indirect
+    parametrisation, e.g. parametrize("manager", [{"use_pool": False}], indirect=True)
+    for a dedicated connection.
+    """
+    if not os.getenv("POSTGRES_CONNECTION_STRING"):
+        pytest.skip("Postgres not configured (set POSTGRES_CONNECTION_STRING)")
+    from src.core.postgres_manager_sync import PostgresManager
+
+    manager = PostgresManager(**getattr(request, "param", {}))
+    manager.initialize()
+    story_id = getattr(request.module, "STORY_ID", None)
+    if story_id:
+        _delete_story_rows(manager, story_id)
+    yield manager
+    if story_id:
+        _delete_story_rows(manager, story_id)
+    manager.close()
+
+
+@pytest.fixture
+def make_event(request):
+    """Factory for valid events tagged with the test module's STORY_ID"""
+    story_id = request.module.STORY_ID
+
+    def make(i: int, timestamp: Optional[datetime] = None, **fields) -> dict:
+        event = {
+            "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
+            "event_type": "tool_call" if i % 2 == 0 else "agent_action",
+            "category": "execution",
+            "session_id": f"{story_id}_session_{i % 3}",
+            "story_id": story_id,
+            "agent_name": f"{story_id}_agent_{i % 2}",
+            "duration_ms": 100 + i,
+            "tokens_used": 10 * (i % 4),
+            "context_percent": 0.5,
+            "success": i % 5 != 0,
+            "confidence_score": 0.9,
+            "details": {"iteration": i}
+        }
+        event.update(fields)
+        return event
+
+    return make
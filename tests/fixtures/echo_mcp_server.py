@@ -0,0 +1,44 @@
+"""
+Minimal stdio MCP server for MCPBridge pool/registry tests
+
+Runs as a real MCP server process (no mocks) so tests exercise the actual
+stdio transport. Start with: python tests/fixtures/echo_mcp_server.py
+"""
+
+import asyncio
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("madf-echo")
+_call_counts = {"slow_count": 0}
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Echo text back to caller"""
+    return text
+
+
+@mcp.tool()
+def server_pid() -> str:
+    """Return server process id (identifies which pooled process served the call)"""
+    return str(os.getpid())
+
+
+@mcp.tool()
+async def slow_count(delay: float = 0.3) -> str:
+    """Sleep, then return how many times this tool has been executed in this process"""
+    _call_counts["slow_count"] += 1
+    await asyncio.sleep(delay)
+    return str(_call_counts["slow_count"])
+
+
+@mcp.tool()
+def crash() -> str:
+    """Terminate server process to simulate a crashed MCP server"""
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -8,11 +8,14 @@ import numpy as np
 import time
 from typing import Dict, List, Optional, Callable, Any
 
+from src.core.latency_sketch import LatencySketch
+
 
 class LatencyTracker:
     """Track latency measurements
 
-    Collects timing data and calculates percentile statistics.
+    Collects timing data in a mergeable quantile sketch (constant memory,
+    percentiles within 1% relative error) instead of keeping every sample.
 
     Example:
         >>> tracker = LatencyTracker()
@@ -23,7 +26,7 @@ class LatencyTracker:
 
     def __init__(self):
         """Initialize latency tracker"""
-        self.measurements: List[float] = []
+        self.sketch = LatencySketch()
 
     def measure(self, func: Callable, *args, **kwargs) -> Any:
         """Measure function execution time
@@ -40,7 +43,7 @@ class LatencyTracker:
         result = func(*args, **kwargs)
         end = time.perf_counter()
         latency = (end - start) * 1000  # milliseconds
-        self.measurements.append(latency)
+        self.sketch.add(latency)
         return result
 
     def record(self, latency_ms: float):
@@ -49,7 +52,15 @@ class LatencyTracker:
         Args:
             latency_ms: Latency in milliseconds
         """
-        self.measurements.append(latency_ms)
+        self.sketch.add(latency_ms)
+
+    def merge(self, other: "LatencyTracker"):
+        """Combine another tracker's measurements into this one
+
+        Args:
+            other: Tracker to merge (e.g. from another run or worker)
+        """
+        self.sketch.merge(other.sketch)
 
     def stats(self) -> Dict:
         """Calculate statistics
@@ -60,17 +71,7 @@ class LatencyTracker:
             - mean, min, max: Aggregate latencies in ms
             - count: Number of measurements
         """
-        if not self.measurements:
-            return {}
-        return {
-            "p50": float(np.percentile(self.measurements, 50)),
-            "p90": float(np.percentile(self.measurements, 90)),
-            "p99": float(np.percentile(self.measurements, 99)),
-            "mean": float(np.mean(self.measurements)),
-            "min": float(np.min(self.measurements)),
-            "max": float(np.max(self.measurements)),
-            "count": len(self.measurements)
-        }
+        return self.sketch.stats(quantiles=(0.5, 0.9, 0.99))
 
 
 class TokenTracker:
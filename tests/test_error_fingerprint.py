@@ -0,0 +1,107 @@
+"""
+Tests for error fingerprinting - normalised error grouping keys
+Covers the normaliser, QuickLogger.log_error and import-time fingerprints
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.core.error_fingerprint import (
+    normalize_error_message,
+    error_fingerprint,
+    fingerprint_details
+)
+from src.core.local_analytics import LocalAnalyticsBackend
+from src.core.pattern_extractor_sync import PatternExtractor
+
+
+class TestNormalizer:
+    """Test volatile token stripping"""
+
+    @pytest.mark.parametrize("message, expected", [
+        ("File /tmp/run_1/a.txt not found at line 42", "File <path> not found at line <n>"),
+        ("File C:\\Users\\dev\\a.py not found", "File <path> not found"),
+        ("Request 3f2a1b9c-1234-4abc-8def-0123456789ab timed out after 30.5s",
+         "Request <uuid> timed out after <n>s"),
+        ("Lock held since 2025-10-01T08:00:00+00:00", "Lock held since <ts>"),
+        ("<object at 0x7f3a2b10> is not callable", "<object at <hex>> is not callable"),
+        ("GET https://api.example.com/v1/items?page=2 failed", "GET <url> failed"),
+        ("KeyError: 'user_42'", "KeyError: 'user_42'"),
+    ])
+    def test_normalize(self, message, expected):
+        assert normalize_error_message(message) == expected
+
+    def test_fingerprint_stable_across_volatile_tokens(self):
+        a = error_fingerprint("FileNotFoundError", "File /runs/1/out.json not found (attempt 1)")
+        b = error_fingerprint("FileNotFoundError", "File /runs/2/log.json not found (attempt 3)")
+        assert a == b
+        assert len(a) == 16
+        assert a != error_fingerprint("PermissionError", "File /runs/1/out.json not found (attempt 1)")
+
+
+class TestFingerprintDetails:
+    """Test the import-time normaliser"""
+
+    def test_non_error_event_unchanged(self):
+        event = {"category": "execution", "details": {"action": "search"}}
+        assert fingerprint_details(event) is event["details"]
+
+    def test_log_error_layout(self):
+        """Top-level error_type/error_message are fingerprinted and copied into details"""
+        event = {"event_type": "error", "category": "error",
+                 "error_type": "ValueError", "error_message": "bad id 17", "details": {}}
+        details = fingerprint_details(event)
+        assert details["error_fingerprint"] == error_fingerprint("ValueError", "bad id 17")
+        assert details["error"] == "bad id 17"
+        assert details["error_type"] == "ValueError"
+
+    def test_existing_fingerprint_kept(self):
+        event = {"category": "error", "details": {"error": "boom", "error_fingerprint": "abc"}}
+        assert fingerprint_details(event)["error_fingerprint"] == "abc"
+
+
+def test_quick_logger_log_error_writes_fingerprint(tmp_path):
+    from src.core.quick_logger import QuickLogger
+
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+        logger = QuickLogger(story_id="test_fp", validate_schema=False)
+        logger.log_error(FileNotFoundError("/data/run_7/input.csv missing"))
+        logger.close()
+
+    events = [json.loads(line) for line in logger.log_file.read_text(encoding="utf-8").splitlines()]
+    [event] = [e for e in events if e["event_type"] == "error"]
+    assert event["details"]["error_fingerprint"] == \
+        error_fingerprint("FileNotFoundError", "/data/run_8/input.csv missing")
+
+
+def test_error_patterns_group_by_fingerprint(tmp_path):
+    """Messages differing only in volatile tokens form one pattern"""
+    base = datetime.now(timezone.utc) - timedelta(days=1)
+    log_file = tmp_path / "story_1.4_20251001.jsonl"
+    with open(log_file, 'w', encoding='utf-8') as f:
+        for i in range(6):
+            f.write(json.dumps({
+                "timestamp": (base + timedelta(minutes=i)).isoformat(),
+                "event_type": "error",
+                "category": "error",
+                "session_id": f"session_{i}",
+                "story_id": "1.4",
+                "agent_name": "dev_agent",
+                "success": False,
+                "details": {"error": f"Timeout after {1000 + i}ms calling /api/run/{i}",
+                            "error_type": "TimeoutError"}
+            }) + '\n')
+
+    backend = LocalAnalyticsBackend(log_dir=tmp_path)
+    backend.initialize()
+    patterns = PatternExtractor(postgres_manager=backend).find_error_patterns(min_occurrences=2)
+    backend.close()
+
+    assert len(patterns) == 1
+    assert patterns[0]["occurrence_count"] == 6
+    assert patterns[0]["affected_sessions"] == 6
+    assert patterns[0]["fingerprint"] == error_fingerprint("TimeoutError", "Timeout after 1ms calling /api/run/0")
@@ -0,0 +1,135 @@
+"""
+Tests for LatencySketch / LatencySketchStore - mergeable streaming percentiles
+"""
+
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from src.core.latency_sketch import LatencySketch, LatencySketchStore
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch:
+    """Test accuracy, merging and serialisation"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(5, 1.5) for _ in range(20000)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.02)
+        assert sketch.count == 20000
+        assert sketch.min == min(values) and sketch.max == max(values)
+        assert len(sketch.bins) < 2048
+
+    def test_merge_equals_single_sketch(self):
+        rng = random.Random(11)
+        values = [rng.randint(0, 5000) for _ in range(5000)]
+        whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+        assert left.bins == whole.bins
+        assert left.zero_count == whole.zero_count
+        assert left.stats() == pytest.approx(whole.stats())
+
+    def test_round_trip_and_empty(self):
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.stats() == {}
+
+        for value in (0, 5, 50, 500):
+            sketch.add(value)
+        restored = LatencySketch.from_dict(sketch.to_dict())
+        assert restored.stats() == sketch.stats()
+
+    def test_bins_bounded(self):
+        sketch = LatencySketch(relative_accuracy=0.01, max_bins=64)
+        for exponent in range(200):
+            sketch.add(1.1 ** exponent)
+        assert len(sketch.bins) <= 64
+        assert sketch.quantile(1.0) == pytest.approx(1.1 ** 199, rel=0.01)
+
+    def test_mismatched_accuracy_rejected(self):
+        with pytest.raises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+
+
+class TestLatencySketchStore:
+    """Test per-key sketches persisted across sessions"""
+
+    def test_flush_merges_across_stores(self, tmp_path):
+        db_path = tmp_path / "sketches.sqlite3"
+        first, second = LatencySketchStore(db_path), LatencySketchStore(db_path)
+        for ms in range(1, 101):
+            first.record(ms, agent_name="dev_agent", tool="Read")
+            second.record(ms * 10, agent_name="dev_agent", tool="Bash")
+        first.record(5, agent_name="qa_agent", action="review")
+
+        assert first.flush() == 2
+        assert second.flush() == 1
+        assert first.flush() == 0
+
+        reader = LatencySketchStore(db_path)
+        assert reader.percentiles(agent_name="dev_agent", tool="Read")["p50"] == pytest.approx(50, rel=0.03)
+        assert reader.percentiles(agent_name="dev_agent")["count"] == 200
+        assert reader.percentiles()["count"] == 201
+
+    def test_unflushed_samples_included(self, tmp_path):
+        store = LatencySketchStore(tmp_path / "sketches.sqlite3")
+        store.record(120, agent_name="dev_agent")
+        assert store.percentiles(agent_name="dev_agent")["max"] == 120
+        assert store.percentiles(agent_name="other") == {}
+
+
+def test_quick_logger_updates_sketches(tmp_path):
+    from src.core.quick_logger import QuickLogger
+    from src.core.pattern_extractor_sync import PatternExtractor
+
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path), "MADF_LATENCY_SKETCHES": "1"}):
+        logger = QuickLogger(story_id="test_sketch", validate_schema=False)
+        logger.set_context(agent_name="dev_agent")
+        for ms in (100, 200, 300, 400):
+            logger.log_tool_call("Read", duration_ms=ms)
+        logger.log_agent_action("planning_agent", "plan", duration_ms=900)
+        logger.close()
+
+        store = LatencySketchStore()
+        assert store.db_path == tmp_path / "latency_sketches.sqlite3"
+        extractor = PatternExtractor(postgres_manager=object(), sketch_store=store)
+
+        read = extractor.get_latency_percentiles(agent_name="dev_agent", tool="Read")
+        assert read["count"] == 4
+        assert read["max"] == 400
+        assert extractor.get_latency_percentiles(action="plan")["p50"] == pytest.approx(900, rel=0.01)
+
+
+def test_quick_logger_sketches_opt_in_and_weakly_held(tmp_path):
+    import gc
+    from src.core import quick_logger
+    from src.core.quick_logger import QuickLogger
+
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+        os.environ.pop("MADF_LATENCY_SKETCHES", None)
+        plain = QuickLogger(story_id="test_sketch", validate_schema=False)
+        assert plain.sketches is None
+        plain.close()
+        assert not (tmp_path / "latency_sketches.sqlite3").exists()
+
+        unclosed = QuickLogger(story_id="test_sketch", validate_schema=False, latency_sketches=True)
+        assert unclosed in quick_logger._open_loggers
+        del unclosed
+        gc.collect()
+        assert not any(logger.story_id == "test_sketch" for logger in quick_logger._open_loggers)
@@ -0,0 +1,214 @@
+"""
+Tests for LocalAnalyticsBackend - embedded SQLite backend for log analysis
+Runs LogAnalyzer, PatternExtractor and WeeklyRevision without Postgres
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.core.local_analytics import LocalAnalyticsBackend
+from src.core.log_analyzer_sync import LogAnalyzer
+from src.core.pattern_extractor_sync import PatternExtractor
+from src.core.quick_logger import compute_event_hash
+from src.core.weekly_revision import WeeklyRevision
+
+BASE = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(days=3)
+
+
+def _events():
+    events = []
+    for i in range(40):
+        event = {
+            "timestamp": (BASE + timedelta(minutes=30 * i)).isoformat(),
+            "event_type": "tool_call" if i % 2 == 0 else "agent_action",
+            "category": "execution",
+            "session_id": f"local_session_{i % 4}",
+            "story_id": "1.4",
+            "agent_name": "planning_agent" if i % 2 == 0 else "dev_agent",
+            "duration_ms": 500 + 100 * i,
+            "tokens_used": 100 * (i % 5),
+            "context_percent": 20.0,
+            "success": True,
+            "confidence_score": 0.9,
+            "details": {"action": "search" if i % 2 == 0 else "edit"}
+        }
+        if i % 10 == 0:
+            event.update(category="error", success=False,
+                         details={"error": "File not found", "error_type": "FileNotFoundError"})
+        events.append(event)
+    return events
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    with open(logs / "story_1.4_20251001.jsonl", 'w', encoding='utf-8') as f:
+        for event in _events():
+            f.write(json.dumps(event) + '\n')
+        f.write('{"partial": ')  # Writer mid-line
+    return logs
+
+
+@pytest.fixture
+def backend(log_dir):
+    backend = LocalAnalyticsBackend(log_dir=log_dir)
+    backend.initialize()
+    yield backend
+    backend.close()
+
+
+class TestLocalBackend:
+    """Test ingestion and query compatibility"""
+
+    def test_log_dir_imported_on_initialize(self, backend):
+        rows = backend.execute_query("SELECT COUNT(*) AS n FROM madf_events")
+        assert rows[0]["n"] == 40
+
+    def test_reimport_is_incremental_and_idempotent(self, tmp_path, log_dir):
+        db_path = tmp_path / "madf_logs.sqlite3"
+        path = log_dir / "story_1.4_20251001.jsonl"
+
+        first = LocalAnalyticsBackend(db_path=db_path)
+        assert first.import_jsonl_file(path)["successful_imports"] == 40
+        first.close()
+
+        # Resume from the stored offset: nothing new yet
+        second = LocalAnalyticsBackend(db_path=db_path)
+        assert second.import_jsonl_file(path)["total_events"] == 0
+
+        # Complete the partial line with a real event
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('"x"}\n')
+            f.write(json.dumps(_events()[1] | {"session_id": "new_session"}) + '\n')
+        result = second.import_jsonl_file(path)
+        assert result["successful_imports"] == 1
+        assert result["failed_imports"] == 1
+        second.close()
+
+    def test_bad_bytes_and_chunked_import(self, tmp_path):
+        path = tmp_path / "story_1.4_20251002.jsonl"
+        with open(path, 'wb') as f:
+            for i, event in enumerate(_events()[:10]):
+                line = json.dumps(event).encode("utf-8") + b"\n"
+                if i == 4:
+                    line = line.replace(b"search", b"sea\xffrch")
+                f.write(line)
+            f.write(b"\xfe\xff\n")
+
+        backend = LocalAnalyticsBackend(db_path=tmp_path / "madf_logs.sqlite3")
+        result = backend.import_jsonl_file(path, chunk_size=3)
+        assert result["successful_imports"] == 10
+        assert result["failed_imports"] == 1
+        assert backend.import_jsonl_file(path)["total_events"] == 0
+        backend.close()
+
+    def test_event_hash_shared_with_postgres(self):
+        event = _events()[0] | {"details": {"error": "Datei nicht gefunden: ü"}}
+        assert LocalAnalyticsBackend._event_row(event, validate=False)[-1] == compute_event_hash(event)
+
+    @pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+    def test_naive_timestamps_are_local_time(self, tmp_path):
+        path = tmp_path / "story_1.4_20251003.jsonl"
+        path.write_text(json.dumps(_events()[1] | {"timestamp": "2025-10-01T22:30:00"}) + "\n", encoding="utf-8")
+
+        # UTC-4 host: 22:30 local is 02:30 UTC the next day, as in Postgres and LogArchive
+        with patch.dict(os.environ, {"TZ": "EDT+4"}):
+            time.tzset()
+            try:
+                backend = LocalAnalyticsBackend(db_path=tmp_path / "madf_logs.sqlite3")
+                backend.import_jsonl_file(path)
+                rows = backend.execute_query(
+                    "SELECT timestamp FROM madf_events WHERE timestamp >= %s",
+                    (datetime(2025, 10, 1, 22, 30),)
+                )
+                backend.close()
+            finally:
+                time.tzset()
+
+        assert rows[0]["timestamp"] == datetime(2025, 10, 2, 2, 30, tzinfo=timezone.utc)
+
+    def test_psycopg_placeholders_and_decoding(self, backend):
+        rows = backend.execute_query(
+            "SELECT timestamp, success, details FROM madf_events "
+            "WHERE session_id = %(session)s AND duration_ms >= %(min)s ORDER BY timestamp LIMIT 1",
+            {"session": "local_session_0", "min": 0}
+        )
+        assert isinstance(rows[0]["timestamp"], datetime)
+        assert rows[0]["success"] is False
+        assert rows[0]["details"]["error_type"] == "FileNotFoundError"
+
+    def test_query_rollups_shape(self, backend):
+        rows = backend.query_rollups(filters={"agent_name": "dev_agent"}, include_sessions=True)
+        assert rows[0]["event_count"] == 20
+        assert rows[0]["sessions"] == 2
+        assert rows[0]["agents"] == 1
+
+
+class TestAnalyzersOnLocalBackend:
+    """Same summaries as with Postgres"""
+
+    def test_pattern_extractor(self, backend):
+        extractor = PatternExtractor(postgres_manager=backend)
+
+        errors = extractor.find_error_patterns(min_occurrences=2)
+        assert errors[0]["error_type"] == "FileNotFoundError"
+        assert errors[0]["occurrence_count"] == 4
+        assert errors[0]["affected_agents"] == ["planning_agent"]
+
+        slow = extractor.find_slow_operations(duration_threshold_ms=1000, limit=5)
+        assert slow[0]["avg_duration_ms"] >= 1000
+        assert slow[0]["min_duration_ms"] <= slow[0]["p95_duration_ms"] <= slow[0]["max_duration_ms"]
+
+        examples = extractor.extract_training_examples("failure", limit=10)
+        assert len(examples) == 4
+        assert all(e["success"] is False for e in examples)
+
+        assert extractor.explain("error_patterns")["plan"] is None
+
+    def test_log_analyzer(self, backend):
+        analyzer = LogAnalyzer(postgres_manager=backend)
+
+        assert "Actions: 20 total" in analyzer.get_agent_performance("dev_agent")
+        assert "Token Usage Report: 1.4" in analyzer.get_token_usage_report("1.4")
+        assert "Session: local_session_1" in analyzer.get_session_summary("local_session_1")
+
+    def test_batched_session_stats(self, backend):
+        """One grouped query per page instead of one per session"""
+        calls = []
+        execute_query = backend.execute_query
+        backend.execute_query = lambda *args, **kwargs: calls.append(args) or execute_query(*args, **kwargs)
+        analyzer = LogAnalyzer(postgres_manager=backend)
+
+        stats = list(analyzer.iter_session_stats(story_id="1.4", page_size=3))
+        assert [s["session_id"] for s in stats] == [f"local_session_{i}" for i in (3, 2, 1, 0)]
+        assert [s["total_events"] for s in stats] == [10, 10, 10, 10]
+        assert len(calls) == 2
+
+        calls.clear()
+        summaries = analyzer.get_session_summaries(
+            session_ids=["local_session_1", "local_session_2", "missing"], limit=10
+        )
+        assert [s.splitlines()[0] for s in summaries] == ["Session: local_session_2", "Session: local_session_1"]
+        assert len(calls) == 1
+
+        assert len(analyzer.get_session_summaries(story_id="1.4", limit=2)) == 2
+        assert analyzer.get_session_summary("local_session_0") == \
+            analyzer.get_session_summaries(session_ids=["local_session_0"])[0]
+
+    def test_weekly_revision(self, backend, tmp_path):
+        revision = WeeklyRevision(postgres_manager=backend, output_dir=tmp_path / "reports")
+        revision.initialize()
+
+        report = revision.generate_weekly_report(week_start=BASE, week_end=BASE + timedelta(days=7))
+
+        assert report["overview"]["total_events"] == 40
+        assert report["overview"]["failed_events"] == 4
+        assert report["error_patterns"][0]["error_type"] == "FileNotFoundError"
+        assert revision.save_report(report, format="markdown").exists()
+        assert revision.save_report(report, format="json").exists()
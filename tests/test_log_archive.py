@@ -0,0 +1,137 @@
+"""
+Tests for LogArchive - Parquet compaction of JSONL logs and vectorized metrics
+"""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.core.log_archive import LogArchive, closed_log_files
+
+DAY = date(2025, 10, 1)
+BASE = datetime(2025, 10, 1, 8, tzinfo=timezone.utc)
+
+
+def _write_log(log_dir, story_id, day, count, partial=False):
+    path = log_dir / f"story_{story_id}_{day:%Y%m%d}.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            event = {
+                "timestamp": (BASE + timedelta(days=(day - DAY).days, minutes=i)).isoformat(),
+                "event_type": "tool_call",
+                "category": "execution",
+                "session_id": f"session_{i % 3}",
+                "story_id": story_id,
+                "agent_name": "planning_agent" if i % 2 == 0 else "dev_agent",
+                "duration_ms": 10 * (i + 1),
+                "tokens_used": 100 if i % 4 == 0 else 0,
+                "success": i % 5 != 0,
+                "details": {"tool": "search", "action": "lookup"}
+            }
+            f.write(json.dumps(event) + '\n')
+        if partial:
+            f.write('{"timestamp": ')
+    return path
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    _write_log(logs, "1.4", DAY, 100, partial=True)
+    _write_log(logs, "1.5", DAY + timedelta(days=1), 20)
+    _write_log(logs, "1.4", date.today(), 5)  # Still open
+    return logs
+
+
+@pytest.fixture
+def archive(tmp_path, log_dir):
+    archive = LogArchive(tmp_path / "archive")
+    archive.compact(log_dir)
+    return archive
+
+
+class TestCompaction:
+    """Test JSONL to Parquet compaction"""
+
+    def test_only_closed_files_selected(self, log_dir):
+        files = closed_log_files(log_dir)
+        assert [(f["story_id"], f["day"]) for f in files] == [("1.4", DAY), ("1.5", DAY + timedelta(days=1))]
+
+    def test_partitioned_by_date_and_story(self, tmp_path, log_dir):
+        archive = LogArchive(tmp_path / "archive")
+        stats = archive.compact(log_dir)
+
+        assert stats["files_compacted"] == 2
+        assert stats["events_written"] == 120
+        assert stats["failed_lines"] == 1
+        assert archive.partition_path("1.4", DAY).exists()
+        assert (tmp_path / "archive" / "date=2025-10-02" / "story=1.5" / "part-0.parquet").exists()
+
+    def test_compaction_is_idempotent(self, archive, log_dir):
+        assert archive.compact(log_dir)["files_skipped"] == 2
+
+        # A late append to a closed file is picked up on the next run
+        _write_log(log_dir, "1.5", DAY + timedelta(days=1), 30)
+        stats = archive.compact(log_dir)
+        assert stats["files_compacted"] == 1
+        assert len(archive.scan(filters={"story_id": "1.5"})) == 30
+
+    def test_delete_source(self, tmp_path, log_dir):
+        LogArchive(tmp_path / "archive").compact(log_dir, delete_source=True)
+        assert [p.name for p in log_dir.iterdir()] == [f"story_1.4_{date.today():%Y%m%d}.jsonl"]
+
+
+class TestVectorizedMetrics:
+    """Test metrics computed from Arrow columns"""
+
+    def test_scan_filters(self, archive):
+        table = archive.scan(columns=["timestamp", "detail_tool"], start=BASE + timedelta(days=1))
+        assert len(table) == 20
+        assert set(table["detail_tool"].to_pylist()) == {"search"}
+
+    def test_scan_across_local_midnight(self, tmp_path):
+        # Logged on a UTC-4 host: local day 2025-10-01, UTC day 2025-10-02
+        logs = tmp_path / "logs"
+        logs.mkdir()
+        with open(logs / "story_1.4_20251001.jsonl", 'w', encoding='utf-8') as f:
+            for ts in ("2025-10-01T19:30:00-04:00", "2025-10-01T22:30:00-04:00"):
+                f.write(json.dumps({"timestamp": ts, "event_type": "tool_call", "category": "execution",
+                                    "session_id": "s1", "story_id": "1.4"}) + '\n')
+        archive = LogArchive(tmp_path / "archive")
+        archive.compact(logs)
+
+        table = archive.scan(columns=["timestamp"], start=datetime(2025, 10, 2, tzinfo=timezone.utc),
+                             end=datetime(2025, 10, 3, tzinfo=timezone.utc))
+        assert table["timestamp"].to_pylist() == [datetime(2025, 10, 2, 2, 30, tzinfo=timezone.utc)]
+
+    def test_metrics_per_agent(self, archive):
+        rows = archive.metrics(group_by=["agent_name"], filters={"story_id": "1.4"})
+        by_agent = {r["agent_name"]: r for r in rows}
+
+        planning = by_agent["planning_agent"]
+        assert planning["event_count"] == 50
+        assert planning["failure_count"] == 10
+        assert planning["failure_rate"] == pytest.approx(0.2)
+        assert planning["tokens_sum"] == 2500
+        assert planning["avg_duration_ms"] == pytest.approx(500)
+        assert planning["duration_p50"] <= planning["duration_p95"] <= planning["max_duration_ms"]
+
+    def test_ungrouped_metrics_and_exact_percentiles(self, archive):
+        [overall] = archive.metrics(group_by=[])
+        assert overall["event_count"] == 120
+        assert overall["failure_count"] == 24
+
+        exact = archive.percentiles("duration_ms", quantiles=(0.5,), filters={"story_id": "1.4"})
+        assert exact == {"p50": pytest.approx(505.0)}
+        assert overall["duration_p50"] == pytest.approx(
+            archive.percentiles("duration_ms", quantiles=(0.5,))["p50"], rel=0.05
+        )
+
+    def test_empty_archive(self, tmp_path):
+        archive = LogArchive(tmp_path / "missing")
+        assert archive.metrics() == []
+        assert archive.percentiles() == {"p50": None, "p95": None, "p99": None}
@@ -0,0 +1,140 @@
+"""
+Tests for log_context - contextvars-based logging context
+Covers scoped/nested context, span ids and concurrent agent attribution
+"""
+
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core.log_context import (
+    get_log_context,
+    set_log_context,
+    clear_log_context,
+    log_context,
+    log_span
+)
+from src.core.quick_logger import QuickLogger
+
+
+@pytest.fixture(autouse=True)
+def empty_context():
+    """Each test starts and ends without context"""
+    clear_log_context()
+    yield
+    clear_log_context()
+
+
+def _events(logger):
+    return [json.loads(line) for line in logger.log_file.read_text(encoding="utf-8").splitlines()]
+
+
+class TestLogContext:
+    """Test scoping, nesting and spans"""
+
+    def test_scoped_context_restored(self):
+        with log_context(agent_name="analyst", workflow_id="wf-1"):
+            with log_context(agent_name="validator") as inner:
+                assert inner == {"agent_name": "validator", "workflow_id": "wf-1"}
+            assert get_log_context()["agent_name"] == "analyst"
+        assert get_log_context() == {}
+
+    def test_restored_on_exception(self):
+        with pytest.raises(RuntimeError):
+            with log_context(agent_name="analyst"):
+                raise RuntimeError("boom")
+        assert get_log_context() == {}
+
+    def test_none_values_ignored(self):
+        set_log_context(agent_name="analyst")
+        set_log_context(agent_name=None, trace_id="t-1")
+        assert get_log_context() == {"agent_name": "analyst", "trace_id": "t-1"}
+
+    def test_nested_spans(self):
+        with log_span("outer") as outer:
+            with log_span("inner") as inner:
+                assert inner["parent_span_id"] == outer["span_id"]
+                assert inner["trace_id"] == outer["trace_id"]
+                assert inner["span_name"] == "inner"
+            assert get_log_context()["span_id"] == outer["span_id"]
+        assert "parent_span_id" not in outer
+
+    def test_threads_isolated(self):
+        set_log_context(agent_name="main")
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(get_log_context().get("agent_name")))
+        thread.start()
+        thread.join()
+        assert seen == [None]
+        assert get_log_context()["agent_name"] == "main"
+
+
+class TestQuickLoggerContext:
+    """Test attribution on written events"""
+
+    def test_concurrent_tasks_keep_their_agent(self, tmp_path):
+        with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+            logger = QuickLogger(story_id="test_ctx", validate_schema=False, latency_sketches=False)
+
+            async def agent(name):
+                with logger.context(agent_name=name):
+                    for step in range(5):
+                        await asyncio.sleep(0)
+                        logger.log_agent_action(name, f"step_{step}")
+
+            async def main():
+                await asyncio.gather(*(agent(f"agent_{i}") for i in range(4)))
+
+            asyncio.run(main())
+            logger.close()
+
+        actions = [e for e in _events(logger) if e["event_type"] == "agent_action"]
+        assert len(actions) == 20
+        assert all(e["agent_name"] == e["agent"] for e in actions)
+
+    def test_set_context_and_span_fields(self, tmp_path):
+        with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+            logger = QuickLogger(story_id="test_ctx", validate_schema=False, latency_sketches=False)
+            logger.set_context(agent_name="analyst", workflow_id="wf-1")
+            assert logger.current_agent == "analyst"
+            with logger.span("search") as span:
+                logger.log_tool_call("Grep", 5)
+            logger.log_tool_call("Read", 5)
+            logger.close()
+
+        grep, read = [e for e in _events(logger) if e["event_type"] == "tool_call"]
+        assert grep["span_id"] == span.span_id and grep["trace_id"] == span.trace_id
+        assert grep["workflow_id"] == "wf-1"
+        assert "span_id" not in read and read["agent_name"] == "analyst"
+
+    def test_decorator_attribution_under_gather(self, tmp_path):
+        import src.core.quick_logger as ql
+        from src.core.madf_logger import log_agent_execution
+
+        ql._logger_instance = None
+        try:
+            with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+                @log_agent_execution()
+                async def run(self):
+                    await asyncio.sleep(0)
+                    ql.get_logger().log("tool_call", "execution", tool_name="Read", tool_owner=type(self).__name__)
+
+                agents = [type(name, (), {"run": run})() for name in ("Analyst", "Validator")]
+
+                async def main():
+                    await asyncio.gather(*(a.run() for a in agents))
+
+                asyncio.run(main())
+                logger = ql.get_logger()
+                logger.close()
+        finally:
+            ql._logger_instance = None
+
+        calls = [e for e in _events(logger) if e["event_type"] == "tool_call"]
+        assert sorted(e["agent_name"] for e in calls) == ["Analyst", "Validator"]
+        assert all(e["agent_name"] == e["tool_owner"] for e in calls)
+        assert get_log_context() == {}
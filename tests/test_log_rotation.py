@@ -0,0 +1,128 @@
+"""
+Tests for log_rotation - zstd-compressed logs, sidecar indexes and transparent readers
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from src.core import log_rotation
+from src.core.local_analytics import LocalAnalyticsBackend
+from src.core.log_archive import closed_log_files
+from src.core.log_rotation import (
+    compress_file,
+    compress_in_background,
+    iter_log_files,
+    open_log,
+    read_index,
+    write_log
+)
+from src.core.log_segments import SegmentWriter, merge_segments
+
+
+def _line(minute, event_type="tool_call", session="s1"):
+    return json.dumps({
+        "timestamp": f"2025-10-01T08:{minute:02d}:00+00:00",
+        "event_type": event_type,
+        "category": "execution",
+        "session_id": session,
+        "story_id": "1.4",
+        "duration_ms": minute
+    }) + "\n"
+
+
+def test_compress_round_trip_with_index(tmp_path):
+    source = tmp_path / "story_1.4_20251001.jsonl"
+    lines = [_line(m) for m in range(10)] + ["not json\n"]
+    source.write_text("".join(lines), encoding="utf-8")
+
+    target = compress_file(source)
+    assert target.name == "story_1.4_20251001.jsonl.zst"
+    assert not source.exists()
+    with open_log(target) as f:
+        assert f.readlines() == lines
+
+    index = read_index(target)
+    assert index["events"] == 10 and index["invalid_lines"] == 1
+    assert index["first_timestamp"] == "2025-10-01T08:00:00+00:00"
+    assert index["last_timestamp"] == "2025-10-01T08:09:00+00:00"
+    assert index["event_types"] == {"tool_call": 10}
+    assert index["compressed_bytes"] == target.stat().st_size
+
+
+def test_iter_log_files_skips_by_index(tmp_path):
+    write_log(tmp_path / "story_1.4_20251001.jsonl.zst", [_line(5)])
+    (tmp_path / "story_1.4_20251002.jsonl").write_text(_line(6), encoding="utf-8")
+
+    names = [p.name for p in iter_log_files(tmp_path)]
+    assert names == ["story_1.4_20251001.jsonl.zst", "story_1.4_20251002.jsonl"]
+
+    later = datetime(2025, 10, 1, 9, tzinfo=timezone.utc)
+    # Unindexed plain files are always kept
+    assert [p.name for p in iter_log_files(tmp_path, start=later)] == ["story_1.4_20251002.jsonl"]
+    assert [f["path"].name for f in closed_log_files(tmp_path)] == names
+
+
+def test_time_rotation_compresses_in_background(tmp_path):
+    writer = SegmentWriter(tmp_path / "segments", "1.4", max_age=0.01, compress=True)
+    writer.write(_line(1))
+    time.sleep(0.02)
+    writer.write(_line(2))
+    writer.close()
+    for future in writer.pending_compression:
+        future.result(timeout=10)
+
+    compressed = sorted((tmp_path / "segments").glob("*.jsonl.zst"))
+    assert len(compressed) == 2
+    assert not list((tmp_path / "segments").glob("*.jsonl"))
+    assert all(read_index(path)["events"] == 1 for path in compressed)
+
+    stats = merge_segments(tmp_path, compress=True)
+    daily = tmp_path / f"story_1.4_{date.today():%Y%m%d}.jsonl.zst"
+    assert stats["files_written"] == [str(daily)] and stats["events_written"] == 2
+    assert not list((tmp_path / "segments").iterdir())
+
+
+def test_background_executor_created_once_under_concurrency():
+    created = []
+
+    def slow_executor(**kwargs):
+        time.sleep(0.05)  # Widen the check-then-create window
+        created.append(ThreadPoolExecutor(**kwargs))
+        return created[-1]
+
+    barrier = threading.Barrier(8)
+
+    def submit():
+        barrier.wait()
+        return compress_in_background(threading.get_ident).result(timeout=10)
+
+    with patch.object(log_rotation, "_executor", None), \
+            patch.object(log_rotation, "ThreadPoolExecutor", side_effect=slow_executor):
+        with ThreadPoolExecutor(max_workers=8) as callers:
+            workers = set(callers.map(lambda _: submit(), range(8)))
+
+    assert len(created) == 1
+    assert len(workers) == 1
+    created[0].shutdown(wait=True)
+
+
+def test_local_backend_imports_compressed_once(tmp_path):
+    write_log(tmp_path / "story_1.4_20251001.jsonl.zst", [_line(m, session=f"s{m % 3}") for m in range(30)])
+    (tmp_path / "story_1.4_20251002.jsonl").write_text(_line(0, session="plain"), encoding="utf-8")
+
+    backend = LocalAnalyticsBackend(log_dir=tmp_path)
+    backend.initialize()
+    count = backend.execute_query("SELECT COUNT(*) AS n FROM madf_events")[0]["n"]
+    again = backend.import_log_dir(tmp_path)
+    backend.close()
+
+    assert count == 31
+    assert again["total_events"] == 0
@@ -0,0 +1,104 @@
+"""
+Tests for log_segments - per-process segment sink and merge into daily files
+"""
+
+import json
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from src.core.log_segments import SegmentWriter, mergeable_segments, merge_segments
+from src.core.quick_logger import QuickLogger
+
+
+WRITER_SCRIPT = """
+import sys
+from src.core.quick_logger import QuickLogger
+logger = QuickLogger(story_id="seg", validate_schema=False, latency_sketches=False,
+                     segments=True, buffered=sys.argv[2] == "1")
+for i in range(200):
+    logger.log_tool_call("Read", i)
+logger.close()
+"""
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_processes_write_own_segments_and_merge(tmp_path):
+    env = {**os.environ, "MADF_LOG_PATH": str(tmp_path), "MADF_LOG_COMPRESS": "0",
+           "PYTHONPATH": os.pathsep.join(sys.path)}
+    procs = [
+        subprocess.Popen([sys.executable, "-c", WRITER_SCRIPT, str(i), str(i % 2)], env=env)
+        for i in range(4)
+    ]
+    assert all(proc.wait(timeout=60) == 0 for proc in procs)
+
+    segments = list((tmp_path / "segments").glob("*.jsonl"))
+    assert len(segments) == 4
+    assert not list((tmp_path / "segments").glob("*.open"))
+
+    stats = merge_segments(tmp_path, compress=False)
+    assert stats["segments_merged"] == 4
+    [daily] = stats["files_written"]
+
+    events = _read(tmp_path / os.path.basename(daily))
+    assert len(events) == 4 * 202  # session_start + 200 calls + session_end
+    timestamps = [e["timestamp"] for e in events]
+    assert timestamps == sorted(timestamps)
+    assert not list((tmp_path / "segments").iterdir())
+
+
+def test_rollover_and_close(tmp_path):
+    writer = SegmentWriter(tmp_path, "1.4", max_bytes=1, compress=False)
+    for i in range(5):
+        writer.write(json.dumps({"timestamp": f"2025-10-01T00:00:0{i}", "i": i}) + "\n")
+    assert writer.path.name.endswith(".jsonl.open")
+    writer.close()
+
+    closed = sorted(p.name for p in tmp_path.iterdir())
+    assert len(closed) == 5
+    assert all(name.endswith(".jsonl") for name in closed)
+    assert closed[0].endswith(f".p{os.getpid()}.s0001.jsonl")
+
+
+def test_open_segments_only_merged_for_past_days(tmp_path):
+    segment_dir = tmp_path / "segments"
+    segment_dir.mkdir()
+    today, yesterday = date.today(), date.today() - timedelta(days=1)
+    (segment_dir / f"story_1.4_{today:%Y%m%d}.p1.s0001.jsonl.open").write_text('{"timestamp": "b"}\n')
+    (segment_dir / f"story_1.4_{yesterday:%Y%m%d}.p2.s0001.jsonl.open").write_text('{"timestamp": "a"}\n')
+    (segment_dir / "unrelated.txt").write_text("x")
+
+    groups = mergeable_segments(segment_dir)
+    assert list(groups) == [("1.4", f"{yesterday:%Y%m%d}")]
+
+
+def test_merge_keeps_existing_daily_lines(tmp_path):
+    daily = tmp_path / "story_1.4_20251001.jsonl"
+    daily.write_text('{"timestamp": "2025-10-01T00:00:01"}\n{"timestamp": "2025-10-01T00:00:04"}\n')
+    segment_dir = tmp_path / "segments"
+    segment_dir.mkdir()
+    (segment_dir / "story_1.4_20251001.p7.s0001.jsonl").write_text(
+        '{"timestamp": "2025-10-01T00:00:02"}\n{"timestamp": "2025-10-01T00:00:03"}'
+    )
+
+    assert merge_segments(tmp_path, compress=False)["events_written"] == 4
+    assert [e["timestamp"][-1] for e in _read(daily)] == ["1", "2", "3", "4"]
+    assert merge_segments(tmp_path, compress=False)["files_written"] == []
+
+
+def test_quick_logger_segment_mode(tmp_path):
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path), "MADF_LOG_SEGMENTS": "1",
+                                 "MADF_LOG_COMPRESS": "0"}):
+        logger = QuickLogger(story_id="seg", validate_schema=False, latency_sketches=False)
+        logger.log_tool_call("Grep", 3)
+        assert logger.segments.path.parent == tmp_path / "segments"
+        assert not logger.log_file.exists()
+        logger.close()
+
+    merge_segments(tmp_path, compress=False)
+    assert [e["event_type"] for e in _read(logger.log_file)] == ["session_start", "tool_call", "session_end"]
@@ -0,0 +1,221 @@
+"""
+Tests for MCPSessionPool - persistent pooled MCP stdio sessions
+Uses a real local stdio MCP server (tests/fixtures/echo_mcp_server.py)
+"""
+
+import os
+import sys
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from src.core.mcp_session_pool import MCPSessionPool
+
+ECHO_SERVER = {
+    "type": "stdio",
+    "command": sys.executable,
+    "args": [str(Path(__file__).parent / "fixtures" / "echo_mcp_server.py")]
+}
+
+
+async def _pid(session) -> str:
+    result = await session.call_tool("server_pid", {})
+    return result.content[0].text
+
+
+class TestMCPSessionPool:
+    """Test session reuse, limits and restart behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_between_calls(self):
+        """Sequential calls reuse the same server process"""
+        pool = MCPSessionPool(health_check_interval=0)
+        try:
+            async with pool.acquire("echo", ECHO_SERVER) as session:
+                first_pid = await _pid(session)
+            async with pool.acquire("echo", ECHO_SERVER) as session:
+                second_pid = await _pid(session)
+
+            assert first_pid == second_pid
+            stats = pool.stats()
+            assert stats["created"] == 1
+            assert stats["reused"] == 1
+        finally:
+            await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_max_size_respected(self):
+        """Concurrent borrowers never exceed per-server max_size"""
+        config = {**ECHO_SERVER, "pool": {"max_size": 2}}
+        pool = MCPSessionPool(health_check_interval=0)
+
+        async def borrow():
+            async with pool.acquire("echo", config) as session:
+                pid = await _pid(session)
+                await asyncio.sleep(0.05)
+                return pid
+
+        try:
+            pids = await asyncio.gather(*(borrow() for _ in range(6)))
+            assert len(set(pids)) <= 2
+            assert pool.stats()["servers"]["echo"]["total"] <= 2
+        finally:
+            await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_crashed_server_restarted(self):
+        """A crashed server is replaced by a new process"""
+        pool = MCPSessionPool(health_check_interval=0, ping_timeout=2.0)
+        try:
+            async with pool.acquire("echo", ECHO_SERVER) as session:
+                first_pid = await _pid(session)
+
+            with pytest.raises(Exception):
+                async with pool.acquire("echo", ECHO_SERVER) as session:
+                    await asyncio.wait_for(session.call_tool("crash", {}), timeout=5)
+
+            async with pool.acquire("echo", ECHO_SERVER) as session:
+                second_pid = await _pid(session)
+
+            assert first_pid != second_pid
+        finally:
+            await pool.close_all()
+
+    @pytest.mark.asyncio
+    async def test_health_check_reaps_idle_and_keeps_min_size(self):
+        """Idle sessions above min_size are reaped, min_size stays warm"""
+        config = {**ECHO_SERVER, "pool": {"min_size": 1, "max_size": 3}}
+        pool = MCPSessionPool(health_check_interval=0, idle_timeout=0)
+
+        async def borrow():
+            async with pool.acquire("echo", config) as session:
+                await asyncio.sleep(0.05)
+                return await _pid(session)
+
+        try:
+            await asyncio.gather(*(borrow() for _ in range(3)))
+            assert pool.stats()["servers"]["echo"]["total"] == 3
+
+            await pool.health_check()
+
+            stats = pool.stats()
+            assert stats["servers"]["echo"]["total"] == 1
+            assert stats["reaped"] == 2
+        finally:
+            await pool.close_all()
+
+
+class TestBridgeEventLoop:
+    """Test MCPBridge sync/async facade on the long-lived background loop"""
+
+    @pytest.fixture
+    def bridge(self, tmp_path):
+        from src.core.mcp_bridge import MCPBridge
+
+        # Isolated cache dir so persisted tool schemas from other runs don't apply
+        with patch.dict(os.environ, {"MADF_CACHE_PATH": str(tmp_path)}):
+            bridge = MCPBridge()
+        bridge.wrapped_mcp_servers["echo"] = ECHO_SERVER
+        yield bridge
+        bridge.close()
+
+    def test_sync_calls_reuse_server_process(self, bridge):
+        """Sync wrappers share one loop, so the pooled process survives between calls"""
+        first = bridge._run_sync(bridge.call_mcp_tool("echo", "server_pid", {}))
+        second = bridge._run_sync(bridge.call_mcp_tool("echo", "server_pid", {}))
+
+        assert first["result"][0].text == second["result"][0].text
+        assert bridge.get_pool_stats()["created"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_facade_from_running_loop(self, bridge):
+        """Async callers on another loop can await tool calls concurrently"""
+        results = await asyncio.gather(*(
+            bridge.call_mcp_tool("echo", "echo", {"text": str(i)}) for i in range(4)
+        ))
+
+        assert [r["result"][0].text for r in results] == ["0", "1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_sync_wrapper_inside_running_loop(self, bridge):
+        """Sync wrappers no longer fail when an event loop is already running"""
+        result = bridge.load_mcp_tools("echo")
+
+        assert "echo" in result
+
+    @pytest.mark.asyncio
+    async def test_call_many_preserves_order_and_isolates_failures(self, bridge):
+        """Batched calls return in input order; one bad call doesn't fail the batch"""
+        calls = [("echo", "echo", {"text": f"item-{i}"}) for i in range(20)]
+        calls.insert(5, {"server": "unknown_server", "tool": "echo", "parameters": {}})
+        calls.insert(10, {"server": "echo", "tool": "not_a_tool", "parameters": {}})
+
+        results = await bridge.call_many(calls, max_concurrency=6)
+
+        assert len(results) == 22
+        assert results[5]["success"] is False
+        assert results[10]["success"] is False
+        texts = [r["result"][0].text for r in results if r["success"]]
+        assert texts == [f"item-{i}" for i in range(20)]
+        assert bridge.get_pool_stats()["servers"]["echo"]["total"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_coalesced(self, bridge):
+        """Concurrent identical calls to a coalescable tool share one round-trip"""
+        bridge.wrapped_mcp_servers["echo"] = {**ECHO_SERVER, "coalesce": ["slow_count"]}
+
+        results = await asyncio.gather(*(
+            bridge.call_mcp_tool("echo", "slow_count", {"delay": 0.3}) for _ in range(5)
+        ))
+
+        assert all(r["success"] for r in results)
+        assert {r["result"][0].text for r in results} == {"1"}
+        assert sum(1 for r in results if r.get("coalesced")) == 4
+        coalescing = bridge.get_cache_stats()["coalescing"]
+        assert coalescing["leaders"] == 1
+        assert coalescing["in_flight"] == 0
+
+        # Calls after the shared one completes are issued again
+        again = await bridge.call_mcp_tool("echo", "slow_count", {"delay": 0.0})
+        assert again["result"][0].text == "2"
+
+    @pytest.mark.asyncio
+    async def test_helpers_and_call_many_share_cache_and_coalescing(self, bridge):
+        """Context7 helper, call_mcp_tool and call_many go through one cached single-flight path"""
+        bridge.direct_mcp_servers["context7"] = {**ECHO_SERVER, "coalesce": ["slow_count"]}
+        parameters = {"delay": 0.3}
+
+        results = await asyncio.gather(
+            bridge.call_context7_tool_async("slow_count", parameters),
+            bridge.call_context7_tool_async("slow_count", parameters),
+            bridge.call_many([("context7", "slow_count", parameters)] * 3)
+        )
+        flat = results[:2] + results[2]
+        assert {r["documentation"] for r in flat} == {"1"}
+        assert sum(1 for r in flat if r.get("coalesced")) == 4
+        assert bridge.get_cache_stats()["coalescing"]["leaders"] == 1
+
+        [cached] = await bridge.call_many([("context7", "slow_count", parameters)])
+        assert cached["cached"] is True and cached["documentation"] == "1"
+        again = await bridge.call_mcp_tool("context7", "slow_count", parameters)
+        assert again["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_helpers_validated_against_registry(self, bridge):
+        """Parsed helper calls get the same registry checks as raw calls"""
+        bridge.direct_mcp_servers["context7"] = ECHO_SERVER
+        assert (await bridge.call_mcp_tool("context7", "echo", {"text": "warm"}))["success"]
+        created = bridge.get_pool_stats()["created"]
+        cached = bridge._context7_cache.stats()["memory_entries"]
+
+        missing = await bridge.call_context7_tool_async("not_a_tool", {})
+        invalid = await bridge.call_context7_tool_async("echo", {})
+
+        assert missing == {"success": False, "error": "Tool 'not_a_tool' not found on server"}
+        assert "Invalid arguments" in invalid["error"]
+        assert bridge.get_pool_stats()["created"] == created
+        assert bridge._context7_cache.stats()["memory_entries"] == cached
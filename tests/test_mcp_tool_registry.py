@@ -0,0 +1,127 @@
+"""
+Tests for ToolRegistry - cached MCP tool schemas
+Registry logic is tested directly; bridge warm-up uses a real local stdio MCP server
+"""
+
+import os
+import sys
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.core.mcp_tool_registry import ToolRegistry
+
+FIND_SYMBOL = {
+    "name": "find_symbol",
+    "description": "Find symbols in code",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "name_path": {"type": "string"},
+            "include_body": {"type": "boolean"}
+        },
+        "required": ["name_path"]
+    }
+}
+
+SERVER_CONFIG = {"command": "uvx", "args": ["serena", "start-mcp-server"]}
+
+
+class TestToolRegistry:
+    """Test lookup, validation, invalidation and persistence"""
+
+    def test_register_and_lookup(self):
+        """Registered tools are found by name"""
+        registry = ToolRegistry()
+        registry.register("serena", [FIND_SYMBOL], "v1")
+
+        assert registry.is_warm("serena")
+        assert registry.has_tool("serena", "find_symbol")
+        assert not registry.has_tool("serena", "missing_tool")
+        assert registry.get_descriptions("serena") == {"find_symbol": "Find symbols in code"}
+
+    def test_validate_arguments(self):
+        """Arguments are checked against the cached input schema"""
+        registry = ToolRegistry()
+        registry.register("serena", [FIND_SYMBOL], "v1")
+
+        assert registry.validate_arguments("serena", "find_symbol", {"name_path": "MCPBridge"}) == []
+
+        errors = registry.validate_arguments("serena", "find_symbol", {"include_body": "yes"})
+        assert any("name_path" in e for e in errors)
+        assert any("include_body" in e for e in errors)
+
+    def test_version_hash_changes_with_server_version(self):
+        """Different serverInfo versions produce different hashes"""
+        v1 = ToolRegistry.compute_version_hash(SERVER_CONFIG, SimpleNamespace(name="serena", version="1.0"))
+        v2 = ToolRegistry.compute_version_hash(SERVER_CONFIG, SimpleNamespace(name="serena", version="1.1"))
+
+        registry = ToolRegistry()
+        registry.register("serena", [FIND_SYMBOL], v1)
+        assert registry.is_current("serena", v1)
+        assert not registry.is_current("serena", v2)
+
+    def test_invalidate(self):
+        """Invalidated servers must be re-listed"""
+        registry = ToolRegistry()
+        registry.register("serena", [FIND_SYMBOL], "v1")
+        registry.invalidate("serena")
+
+        assert not registry.is_warm("serena")
+        assert registry.validate_arguments("serena", "find_symbol", {}) == []
+
+    def test_save_and_load(self, tmp_path):
+        """Exported registry starts the next process warm"""
+        cache_path = tmp_path / "mcp_tool_registry.json"
+        registry = ToolRegistry(cache_path=cache_path)
+        registry.register("serena", [FIND_SYMBOL], "v1")
+        assert cache_path.exists()
+
+        reloaded = ToolRegistry(cache_path=cache_path)
+        assert reloaded.is_current("serena", "v1")
+        assert reloaded.has_tool("serena", "find_symbol")
+
+    def test_corrupt_cache_ignored(self, tmp_path):
+        """A corrupt cache file does not break startup"""
+        cache_path = tmp_path / "mcp_tool_registry.json"
+        cache_path.write_text("{not json", encoding="utf-8")
+
+        registry = ToolRegistry(cache_path=cache_path)
+        assert not registry.is_warm("serena")
+
+
+class TestBridgeRegistryWarmup:
+    """Test MCPBridge warms and uses the registry with a real stdio server"""
+
+    @pytest.mark.asyncio
+    async def test_registry_warmed_on_session_start(self, tmp_path):
+        pytest.importorskip("mcp")
+        from src.core.mcp_bridge import MCPBridge
+
+        with patch.dict(os.environ, {"MADF_CACHE_PATH": str(tmp_path)}):
+            bridge = MCPBridge()
+        bridge.wrapped_mcp_servers["echo"] = {
+            "type": "stdio",
+            "command": sys.executable,
+            "args": [str(Path(__file__).parent / "fixtures" / "echo_mcp_server.py")]
+        }
+
+        try:
+            result = await bridge.call_mcp_tool("echo", "echo", {"text": "hello"})
+            assert result["success"] is True
+
+            registry = bridge.get_tool_registry()
+            assert registry.has_tool("echo", "echo")
+            assert (tmp_path / "mcp_tool_registry.json").exists()
+
+            missing = await bridge.call_mcp_tool("echo", "not_a_tool", {})
+            assert missing["success"] is False
+
+            invalid = await bridge.call_mcp_tool("echo", "echo", {})
+            assert invalid["success"] is False
+            assert "Invalid arguments" in invalid["error"]
+        finally:
+            await bridge.close_sessions()
@@ -0,0 +1,173 @@
+"""
+Tests for otlp_export - OTLP/JSON spans from QuickLogger events
+"""
+
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.log_context import clear_log_context
+from src.core.otlp_export import (
+    LocalCollector,
+    OTLPTraceExporter,
+    STATUS_ERROR,
+    event_to_span,
+    export_log_file
+)
+from src.core.quick_logger import QuickLogger
+
+
+def _attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+class TestEventToSpan:
+    """Test event conversion"""
+
+    def test_span_completion_event(self):
+        span = event_to_span({
+            "timestamp": "2025-10-01T08:00:01+00:00",
+            "start_time": "2025-10-01T08:00:00.500000+00:00",
+            "event_type": "agent_action", "category": "execution",
+            "session_id": "s1", "story_id": "1.4", "agent_name": "analyst",
+            "trace_id": "ab" * 16, "span_id": "cd" * 8, "parent_span_id": "ef" * 8,
+            "span_name": "plan", "action": "plan", "duration_ns": 250_000_000, "success": True
+        })
+        assert span["traceId"] == "ab" * 16
+        assert span["spanId"] == "cd" * 8 and span["parentSpanId"] == "ef" * 8
+        assert span["name"] == "plan"
+        assert int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"]) == 250_000_000
+        assert _attributes(span)["madf.agent_name"] == "analyst"
+
+    def test_tool_call_grouped_by_session(self):
+        event = {"timestamp": "2025-10-01T08:00:01+00:00", "event_type": "tool_call",
+                 "category": "execution", "session_id": "s1", "tool": "Read",
+                 "duration_ms": 40, "success": False, "details": {"error": "denied"}}
+        span = event_to_span(event)
+        assert span["name"] == "tool_call Read"
+        assert "parentSpanId" not in span
+        assert int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"]) == 40_000_000
+        assert span["status"] == {"code": STATUS_ERROR, "message": "denied"}
+        assert _attributes(span)["madf.tool"] == "Read"
+        assert span["traceId"] == event_to_span({**event, "tool": "Grep"})["traceId"]
+
+    def test_events_without_duration_skipped(self):
+        assert event_to_span({"timestamp": "2025-10-01T08:00:00+00:00", "event_type": "session_start"}) is None
+
+
+def test_quick_logger_exports_span_tree_to_file(tmp_path):
+    clear_log_context()
+    out = tmp_path / "traces.jsonl"
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path), "MADF_OTLP_FILE": str(out)}):
+        logger = QuickLogger(story_id="test_otlp", validate_schema=False, latency_sketches=False)
+        with logger.span("plan", agent_name="planning_agent") as root:
+            logger.log_tool_call("Grep", 12)
+            with pytest.raises(ValueError):
+                with logger.span("parse"):
+                    raise ValueError("bad input")
+        logger.close()
+        logger.trace_exporter.close()
+
+    spans = [span for line in out.read_text(encoding="utf-8").splitlines()
+             for span in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]]
+    by_name = {span["name"]: span for span in spans}
+    assert set(by_name) == {"plan", "parse", "tool_call Grep"}
+    assert by_name["plan"]["spanId"] == root.span_id
+    assert by_name["tool_call Grep"]["parentSpanId"] == root.span_id
+    assert by_name["parse"]["parentSpanId"] == root.span_id
+    assert by_name["parse"]["status"]["code"] == STATUS_ERROR
+    assert {span["traceId"] for span in spans} == {root.trace_id}
+
+
+def test_batched_http_export_to_local_collector(tmp_path):
+    collector = LocalCollector(tmp_path / "collected.jsonl", port=0).start()
+    try:
+        exporter = OTLPTraceExporter(endpoint=collector.endpoint, batch_size=2, flush_interval=60)
+        for i in range(5):
+            exporter.submit({"timestamp": f"2025-10-01T08:00:0{i}+00:00", "event_type": "tool_call",
+                             "session_id": "s1", "tool": "Read", "duration_ms": 5 + i})
+        exporter.close()
+    finally:
+        collector.stop()
+
+    assert len(collector.requests) == 3
+    assert len(list(collector.spans())) == 5
+    assert exporter.exported_spans == 5
+    assert len((tmp_path / "collected.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_unreachable_endpoint_does_not_raise(tmp_path):
+    collector = LocalCollector(tmp_path / "unused.jsonl", port=0)
+    endpoint = collector.endpoint
+    collector.stop()
+
+    exporter = OTLPTraceExporter(endpoint=endpoint, timeout=1)
+    exporter.submit({"timestamp": "2025-10-01T08:00:00+00:00", "event_type": "tool_call", "duration_ms": 1})
+    exporter.close()
+    assert exporter.failed_requests == 1 and exporter.exported_spans == 0
+
+
+def test_export_existing_log_file(tmp_path):
+    log_file = tmp_path / "story_1.4_20251001.jsonl"
+    log_file.write_text("\n".join(json.dumps({
+        "timestamp": f"2025-10-01T08:00:0{i}+00:00", "event_type": "agent_action",
+        "session_id": "s1", "action": "review", "duration_ms": 100
+    }) for i in range(3)) + "\nnot json\n", encoding="utf-8")
+
+    exporter = OTLPTraceExporter(file_path=tmp_path / "traces.jsonl")
+    assert export_log_file(log_file, exporter) == 3
+    exporter.close()
+
+
+def test_export_large_log_file_is_not_truncated(tmp_path):
+    log_file = tmp_path / "story_1.4_20251001.jsonl"
+    log_file.write_text("".join(json.dumps({
+        "timestamp": "2025-10-01T08:00:00+00:00", "event_type": "tool_call",
+        "session_id": "s1", "tool": "Grep", "duration_ms": i + 1
+    }) + "\n" for i in range(5000)), encoding="utf-8")
+
+    out = tmp_path / "traces.jsonl"
+    exporter = OTLPTraceExporter(file_path=out, max_queue=1000, batch_size=100, flush_interval=60)
+    assert export_log_file(log_file, exporter) == 5000
+    exporter.close()
+    assert exporter.dropped_events == 0
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 50
+
+
+def test_queue_overflow_is_counted(tmp_path):
+    exporter = OTLPTraceExporter(file_path=tmp_path / "traces.jsonl", max_queue=10, batch_size=1000, flush_interval=60)
+    for i in range(15):
+        exporter.submit({"timestamp": "2025-10-01T08:00:00+00:00", "event_type": "tool_call", "duration_ms": i})
+    assert exporter.dropped_events == 5
+    exporter.close()
+
+
+def test_malformed_events_are_skipped_and_thread_survives(tmp_path):
+    out = tmp_path / "traces.jsonl"
+    exporter = OTLPTraceExporter(file_path=out, flush_interval=60)
+    exporter.submit({"event_type": "tool_call", "duration_ms": 5})
+    exporter.submit({"timestamp": "yesterday", "event_type": "tool_call", "duration_ms": 5})
+    exporter._wake.set()
+    deadline = time.monotonic() + 10
+    while exporter.dropped_events < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert exporter._thread.is_alive()
+
+    exporter.submit({"timestamp": "2025-10-01T08:00:00+00:00", "event_type": "tool_call", "duration_ms": 5})
+    exporter.close()
+    assert exporter.dropped_events == 2 and exporter.exported_spans == 1
+    assert "ValueError" in exporter.last_error
+    assert len(out.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_unexpected_send_error_is_counted():
+    exporter = OTLPTraceExporter(endpoint="http://127.0.0.1:4318/v1/traces", flush_interval=60)
+    with patch("src.core.otlp_export.urllib.request.urlopen", side_effect=ValueError("bad response")):
+        exporter.submit({"timestamp": "2025-10-01T08:00:00+00:00", "event_type": "tool_call", "duration_ms": 1})
+        assert exporter.flush() == 0
+    assert exporter._thread.is_alive()
+    exporter.close()
+    assert exporter.failed_requests == 1 and "bad response" in exporter.last_error
@@ -0,0 +1,59 @@
+"""
+Tests for the PatternExtractor prepared query catalog and EXPLAIN capture
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+
+
+def test_find_seq_scans_walks_nested_plans():
+    from src.core.pattern_extractor_sync import find_seq_scans
+
+    plan = [{"Plan": {"Node Type": "Append", "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "madf_events_p2025_10"},
+        {"Node Type": "Index Scan", "Relation Name": "madf_events_p2025_11"},
+        {"Node Type": "Seq Scan", "Relation Name": "madf_ingest_ledger"}
+    ]}}]
+
+    assert find_seq_scans(plan) == ["madf_events_p2025_10"]
+
+
+# Dedicated connection so pg_prepared_statements reflects this session
+@pytest.mark.parametrize("manager", [{"use_pool": False}], indirect=True)
+def test_catalog_queries_prepared_once_per_connection(manager):
+    """Repeated calls with different thresholds reuse one server-side statement"""
+    from src.core.pattern_extractor_sync import PatternExtractor
+
+    extractor = PatternExtractor(postgres_manager=manager)
+    for min_occurrences in (1, 2, 3):
+        extractor.find_error_patterns(min_occurrences=min_occurrences)
+
+    prepared = manager.execute_query(
+        "SELECT statement FROM pg_prepared_statements WHERE statement LIKE %s",
+        ("%detail_error_fingerprint as fingerprint%",)
+    )
+    assert len(prepared) == 1
+
+
+@pytest.mark.parametrize("manager", [{"use_pool": False}], indirect=True)
+def test_explain_hook_flags_seq_scans(manager):
+    """capture_plans runs EXPLAIN once per query and reports madf_events seq scans"""
+    from src.core.pattern_extractor_sync import PatternExtractor
+
+    flagged = []
+    extractor = PatternExtractor(
+        postgres_manager=manager,
+        capture_plans=True,
+        explain_hook=lambda name, relations: flagged.append((name, relations))
+    )
+    manager.execute_query("SELECT set_config('enable_indexscan', 'off', false), "
+                          "set_config('enable_bitmapscan', 'off', false)")
+
+    extractor.find_decision_patterns()
+    extractor.find_decision_patterns()
+
+    assert [name for name, _ in flagged] == ["decision_patterns"]
+    assert all(r.startswith("madf_events") for r in flagged[0][1])
+    assert "decision_patterns" in extractor.seq_scans
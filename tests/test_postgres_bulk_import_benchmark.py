@@ -0,0 +1,78 @@
+"""
+Bulk Import Benchmark: per-row INSERT vs COPY FROM STDIN
+Story 1.4 Task 1 Phase 2 - Measure bulk ingestion throughput
+
+Imports the same JSONL file with PostgresManager.import_jsonl_file (one INSERT
+per line) and PostgresManager.bulk_import_jsonl_file (chunked COPY) and
+reports rows/sec for each. Also checks bad lines go to the reject sidecar.
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+import time
+import json
+from pathlib import Path
+
+STORY_ID = "bulk_test"
+EVENT_COUNT = 5000
+
+
+@pytest.fixture
+def sample_jsonl_file(tmp_path, make_event):
+    """JSONL file with EVENT_COUNT valid events"""
+    path = tmp_path / "bulk_events.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(EVENT_COUNT):
+            f.write(json.dumps(make_event(i, workflow_id=f"workflow_{i % 10}", impact_score=0.5)) + '\n')
+    return path
+
+
+def test_bulk_import_faster_than_row_inserts(manager, sample_jsonl_file):
+    """COPY path imports every row and beats per-row INSERT throughput"""
+    start = time.perf_counter()
+    row_result = manager.import_jsonl_file(sample_jsonl_file)
+    row_time = time.perf_counter() - start
+
+    manager.execute_query("DELETE FROM madf_events WHERE story_id = %s RETURNING id", (STORY_ID,))
+
+    bulk_result = manager.bulk_import_jsonl_file(sample_jsonl_file, chunk_size=1000)
+
+    row_rps = row_result["successful_imports"] / row_time if row_time > 0 else 0
+
+    print("\n" + "="*60)
+    print("BULK IMPORT BENCHMARK")
+    print("="*60)
+    print(f"Events: {EVENT_COUNT}")
+    print(f"Per-row INSERT: {row_time:.3f}s ({row_rps:.0f} rows/sec)")
+    print(f"COPY (chunked): {bulk_result['duration_seconds']:.3f}s "
+          f"({bulk_result['rows_per_second']:.0f} rows/sec, {bulk_result['chunks']} chunks)")
+    print("="*60)
+
+    assert row_result["successful_imports"] == EVENT_COUNT
+    assert bulk_result["successful_imports"] == EVENT_COUNT
+    assert bulk_result["chunks"] == EVENT_COUNT // 1000
+    assert bulk_result["rows_per_second"] > row_rps
+
+
+def test_bad_rows_go_to_reject_file(manager, make_event, tmp_path):
+    """Unparseable and unloadable lines are rejected without aborting the chunk"""
+    path = tmp_path / "mixed.jsonl"
+    bad_timestamp = {**make_event(1), "timestamp": "not-a-timestamp"}
+    missing_session = {k: v for k, v in make_event(2).items() if k != "session_id"}
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(make_event(0)) + '\n')
+        f.write('{"truncated": \n')
+        f.write(json.dumps(bad_timestamp) + '\n')
+        f.write(json.dumps(missing_session) + '\n')
+        f.write(json.dumps(make_event(3)) + '\n')
+
+    result = manager.bulk_import_jsonl_file(path, chunk_size=100)
+
+    assert result["total_events"] == 5
+    assert result["successful_imports"] == 2
+    assert result["failed_imports"] == 3
+
+    with open(result["reject_path"], 'r', encoding='utf-8') as f:
+        rejected_lines = sorted(json.loads(line)["line"] for line in f)
+    assert rejected_lines == [2, 3, 4]
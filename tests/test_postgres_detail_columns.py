@@ -0,0 +1,57 @@
+"""
+Tests for generated details columns and pattern-query indexes
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+import json
+from datetime import datetime, timezone
+
+STORY_ID = "detail_cols_test"
+
+
+@pytest.mark.parametrize("manager", [{"use_pool": False}], indirect=True)
+def test_generated_columns_follow_details(manager, tmp_path):
+    """detail_* columns are filled from details on insert"""
+    path = tmp_path / "details.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "event_type": "error",
+            "category": "error",
+            "session_id": "detail_cols_session",
+            "story_id": STORY_ID,
+            "details": {"error": "boom", "error_type": "ValueError", "action": "parse", "tool": "read_file"}
+        }) + '\n')
+    manager.bulk_import_jsonl_file(path)
+
+    row = manager.execute_query(
+        "SELECT detail_error, detail_error_type, detail_action, detail_tool FROM madf_events WHERE story_id = %s",
+        (STORY_ID,)
+    )[0]
+    assert row == {"detail_error": "boom", "detail_error_type": "ValueError",
+                   "detail_action": "parse", "detail_tool": "read_file"}
+
+
+@pytest.mark.parametrize("manager", [{"use_pool": False}], indirect=True)
+def test_pattern_queries_use_indexes(manager):
+    """Error and slow-operation queries are planned on the new indexes"""
+    from src.core.pattern_extractor_sync import PatternExtractor
+
+    manager.execute_query("SELECT set_config('enable_seqscan', 'off', false)")
+    extractor = PatternExtractor(postgres_manager=manager)
+
+    plans = {
+        name: json.dumps(extractor.explain(name, params)["plan"])
+        for name, params in {
+            "error_patterns": {"min_occurrences": 1, **extractor._time_bounds(None, None)},
+            "slow_operations": {"duration_threshold_ms": 1000, "limit": 10,
+                                **extractor._time_bounds(None, None)}
+        }.items()
+    }
+
+    # Partition indexes get derived names, so check scan types rather than names
+    assert "Seq Scan" not in plans["error_patterns"]
+    assert "Index Only Scan" in plans["slow_operations"]
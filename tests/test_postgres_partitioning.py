@@ -0,0 +1,89 @@
+"""
+Tests for time-partitioned madf_events (partition creation, pruning, retention)
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+import json
+from datetime import datetime, timedelta, timezone
+
+STORY_ID = "partition_test"
+
+
+def test_partition_bounds():
+    """Monthly and weekly partitions cover whole UTC months / ISO weeks"""
+    from src.core.postgres_manager_sync import PostgresManager
+
+    ts = datetime(2025, 10, 15, 13, 30, tzinfo=timezone.utc)
+
+    name, start, end = PostgresManager(partition_interval="month")._partition_for(ts)
+    assert name == "madf_events_p2025_10"
+    assert (start, end) == (datetime(2025, 10, 1, tzinfo=timezone.utc),
+                            datetime(2025, 11, 1, tzinfo=timezone.utc))
+
+    name, start, end = PostgresManager(partition_interval="week")._partition_for(ts)
+    assert name == "madf_events_p2025w42"
+    assert start.weekday() == 0 and end - start == timedelta(days=7)
+
+
+def test_table_is_partitioned_with_future_partitions(manager):
+    """Schema creates a partitioned table and premakes upcoming partitions"""
+    assert manager.is_partitioned()
+
+    names = {p["name"] for p in manager.list_partitions()}
+    now = datetime.now(timezone.utc)
+    current, _, next_start = manager._partition_for(now)
+    following, _, _ = manager._partition_for(next_start)
+    assert current in names
+    assert following in names
+
+
+def test_import_creates_partitions_for_old_events(manager, tmp_path):
+    """Historical events get their partitions on import"""
+    old = datetime(2024, 3, 10, tzinfo=timezone.utc)
+    path = tmp_path / "old.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({
+            "timestamp": old.isoformat(),
+            "event_type": "tool_call",
+            "category": "execution",
+            "session_id": "partition_test_session",
+            "story_id": STORY_ID
+        }) + '\n')
+
+    result = manager.bulk_import_jsonl_file(path)
+
+    assert result["successful_imports"] == 1
+    assert manager._partition_for(old)[0] in {p["name"] for p in manager.list_partitions()}
+
+
+def test_week_query_prunes_partitions(manager):
+    """A one-week range only scans the partitions overlapping that week"""
+    week_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    plan = manager.execute_query(
+        "EXPLAIN (FORMAT JSON) SELECT COUNT(*) FROM madf_events WHERE timestamp >= %s AND timestamp < %s",
+        (week_start, week_start + timedelta(days=7))
+    )
+    plan_text = json.dumps(plan)
+    scanned = {p["name"] for p in manager.list_partitions() if p["name"] in plan_text}
+
+    assert 1 <= len(scanned) <= 2
+
+
+def test_retention_detaches_expired_partitions(manager):
+    """Partitions older than the retention window are detached"""
+    manager.ensure_partitions(datetime(2020, 1, 15, tzinfo=timezone.utc),
+                              datetime(2020, 1, 15, tzinfo=timezone.utc))
+    expired_name = manager._partition_for(datetime(2020, 1, 15, tzinfo=timezone.utc))[0]
+
+    removed = manager.apply_retention(retention_days=365, action="detach")
+
+    assert expired_name in removed
+    assert expired_name not in {p["name"] for p in manager.list_partitions()}
+
+    # Detached partitions remain as standalone tables
+    with manager._conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {expired_name}")
+    manager._conn.commit()
@@ -0,0 +1,88 @@
+"""
+Tests for the shared Postgres connection pool and statement timeouts
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Requires a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+import asyncio
+import os
+from unittest.mock import patch
+
+import psycopg
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("POSTGRES_CONNECTION_STRING"),
+    reason="Postgres not configured (set POSTGRES_CONNECTION_STRING)"
+)
+
+
+@pytest.fixture
+def pool_env():
+    from src.core.postgres_pool import close_postgres_pools
+
+    close_postgres_pools()
+    with patch.dict(os.environ, {"MADF_PG_POOL_MIN": "1", "MADF_PG_POOL_MAX": "2"}):
+        yield
+    close_postgres_pools()
+
+
+def test_components_share_pooled_connections(pool_env):
+    """Analyzer, extractor and revision managers never exceed the pool size"""
+    from src.core.postgres_manager_sync import PostgresManager
+    from src.core.postgres_pool import get_postgres_pool
+    from src.core.log_analyzer_sync import LogAnalyzer
+    from src.core.pattern_extractor_sync import PatternExtractor
+
+    managers = [PostgresManager() for _ in range(4)]
+    for manager in managers:
+        manager.initialize()
+    analyzer = LogAnalyzer()
+    extractor = PatternExtractor()
+    analyzer.initialize()
+    extractor.initialize()
+
+    for manager in managers + [analyzer.pg, extractor.pg]:
+        assert manager.execute_query("SELECT 1 AS one") == [{"one": 1}]
+        # Connection goes back to the pool between queries
+        assert manager._connection is None
+
+    stats = get_postgres_pool(managers[0].connection_string).get_stats()
+    assert stats["pool_size"] <= 2
+
+    for manager in managers:
+        manager.close()
+    analyzer.close()
+    extractor.close()
+
+
+def test_per_query_statement_timeout(pool_env):
+    """timeout_ms cancels a long query without changing the pooled default"""
+    from src.core.postgres_manager_sync import PostgresManager
+
+    manager = PostgresManager()
+    manager.initialize()
+
+    with pytest.raises(psycopg.errors.QueryCanceled):
+        manager.execute_query("SELECT pg_sleep(2)", timeout_ms=50)
+
+    rows = manager.execute_query("SELECT current_setting('statement_timeout') AS timeout")
+    assert rows[0]["timeout"] == "0"
+    manager.close()
+
+
+def test_async_manager_uses_async_pool(pool_env):
+    """Async PostgresManager borrows per query from the loop's pool"""
+    from src.core.postgres_manager import PostgresManager
+    from src.core.postgres_pool import close_async_postgres_pools
+
+    async def run():
+        manager = PostgresManager()
+        await manager.initialize()
+        rows = await asyncio.gather(*[manager.execute_query("SELECT 1 AS one") for _ in range(5)])
+        await manager.close()
+        await close_async_postgres_pools()
+        return rows
+
+    assert all(r == [{"one": 1}] for r in asyncio.run(run()))
@@ -0,0 +1,85 @@
+"""
+Tests for hourly/daily rollup tables (incremental maintenance + analyzer reads)
+Story 1.4 Task 1 Phase 2 - Postgres Analysis Engine
+
+Tests using the manager fixture require a real Postgres (set POSTGRES_CONNECTION_STRING)
+"""
+
+import pytest
+import json
+from datetime import datetime, timedelta, timezone
+
+STORY_ID = "rollup_test"
+BASE = datetime(2025, 9, 1, 22, 30, tzinfo=timezone.utc)
+
+
+def _write(path, events):
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+
+def _raw_totals(manager, start, end):
+    return manager.execute_query(
+        """
+        SELECT COUNT(*) AS event_count, SUM(duration_ms) AS duration_sum,
+               COUNT(*) FILTER (WHERE success = false) AS failure_count,
+               COUNT(DISTINCT session_id) AS sessions
+        FROM madf_events WHERE story_id = %s AND timestamp >= %s AND timestamp < %s
+        """,
+        (STORY_ID, start, end)
+    )[0]
+
+
+def test_rollup_segments_split_range():
+    """Whole days from daily, whole hours from hourly, edges from raw"""
+    from src.core.postgres_manager_sync import PostgresManager
+
+    start = datetime(2025, 9, 1, 22, 30, tzinfo=timezone.utc)
+    end = datetime(2025, 9, 4, 1, 15, tzinfo=timezone.utc)
+    kinds = [kind for kind, _, _ in PostgresManager()._rollup_segments(start, end)]
+    assert kinds == ["raw", "hour", "day", "hour", "raw"]
+
+    # The current open hour is always read raw
+    now = datetime.now(timezone.utc)
+    segments = PostgresManager()._rollup_segments(now - timedelta(minutes=1), now)
+    assert [kind for kind, _, _ in segments] == ["raw"]
+
+
+def test_bulk_import_maintains_rollups(manager, make_event, tmp_path):
+    """Rollup totals match raw aggregates across raw, hourly and daily segments"""
+    events = [make_event(i, BASE + timedelta(minutes=20 * i)) for i in range(200)]
+    path = tmp_path / "rollups.jsonl"
+    _write(path, events)
+
+    manager.bulk_import_jsonl_file(path, chunk_size=50)
+    # Re-import: duplicates must not be counted twice
+    manager.bulk_import_jsonl_file(path, chunk_size=50)
+
+    start = BASE + timedelta(minutes=7)
+    end = BASE + timedelta(days=2, minutes=41)
+    rollup = manager.query_rollups(start=start, end=end, filters={"story_id": STORY_ID},
+                                   include_sessions=True)[0]
+    raw = _raw_totals(manager, start, end)
+
+    assert rollup["event_count"] == raw["event_count"]
+    assert rollup["duration_sum"] == raw["duration_sum"]
+    assert rollup["failure_count"] == raw["failure_count"]
+    assert rollup["sessions"] == raw["sessions"]
+    assert rollup["agents"] == 2
+
+
+def test_refresh_rebuilds_after_raw_delete(manager, make_event, tmp_path):
+    """refresh_rollups recomputes buckets after raw events change"""
+    path = tmp_path / "rollups.jsonl"
+    _write(path, [make_event(i, BASE + timedelta(minutes=i)) for i in range(10)])
+    manager.bulk_import_jsonl_file(path)
+
+    manager.execute_query(
+        "DELETE FROM madf_events WHERE story_id = %s AND duration_ms >= 105 RETURNING id", (STORY_ID,)
+    )
+    manager.refresh_rollups(BASE, BASE + timedelta(minutes=10))
+
+    rows = manager.query_rollups(start=BASE, end=BASE + timedelta(days=1),
+                                 filters={"story_id": STORY_ID}, group_by=["event_type"])
+    assert sum(r["event_count"] for r in rows) == 5
@@ -0,0 +1,81 @@
+"""
+Microbenchmark: QuickLogger schema validation cost per event
+Compares full Pydantic UniversalEventSchema construction against the
+fast-path validator (and sampled validation) on realistic events.
+
+Run with -s to see the timing table.
+"""
+
+import time
+
+import pytest
+
+from src.core.quick_logger import UniversalEventSchema, validate_event
+
+ITERATIONS = 20000
+
+EVENTS = [
+    {
+        "timestamp": "2025-10-01T10:00:00+00:00",
+        "event_type": "tool_call",
+        "category": "execution",
+        "session_id": "story_1.4_20251001_100000",
+        "story_id": "1.4",
+        "agent_name": "analyst",
+        "workflow_id": "wf-1",
+        "thread_id": None,
+        "trace_id": None,
+        "tool": "Read",
+        "duration_ms": 45,
+        "tokens_used": 120,
+        "context_percent": 23.5,
+        "success": True
+    },
+    {
+        "timestamp": "2025-10-01T10:00:01+00:00",
+        "event_type": "error",
+        "category": "error",
+        "session_id": "story_1.4_20251001_100000",
+        "story_id": "1.4",
+        "agent_name": "developer",
+        "workflow_id": "wf-1",
+        "thread_id": "t-1",
+        "trace_id": "trace-1",
+        "error_type": "ValueError",
+        "error_message": "bad input",
+        "context": {"file": "test.py"},
+        "priority": "high"
+    }
+]
+
+
+def _full_schema(event):
+    try:
+        UniversalEventSchema(**event)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _per_event_us(validator, every: int = 1) -> float:
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        if i % every == 0:
+            validator(EVENTS[i % len(EVENTS)])
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+@pytest.mark.slow
+def test_fast_validation_cheaper_than_full_schema():
+    """Fast path must beat full Pydantic validation per event"""
+    full_us = _per_event_us(_full_schema)
+    fast_us = _per_event_us(validate_event)
+    sampled_us = _per_event_us(validate_event, every=10)
+
+    print(f"\nValidation cost per event ({ITERATIONS} events)")
+    print(f"  full schema:        {full_us:.2f} us")
+    print(f"  fast path:          {fast_us:.2f} us ({full_us / fast_us:.1f}x)")
+    print(f"  fast path, 1 in 10: {sampled_us:.2f} us")
+
+    assert all(validate_event(e) is None for e in EVENTS)
+    assert fast_us < full_us
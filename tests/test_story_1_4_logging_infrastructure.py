@@ -12,7 +12,7 @@ import time
 from pathlib import Path
 from unittest.mock import patch
 
-from src.core.quick_logger import QuickLogger, UniversalEventSchema, get_logger
+from src.core.quick_logger import QuickLogger, UniversalEventSchema, get_logger, validate_event
 from src.core.madf_logger import MADFLogger, log_agent_execution, get_madf_logger
 
 
@@ -73,6 +73,55 @@ class TestUniversalEventSchema:
         assert schema.created_rule is False
 
 
+class TestFastValidation:
+    """Test fast-path validator agrees with UniversalEventSchema"""
+
+    BASE = {
+        "timestamp": "2025-10-01T10:00:00+00:00",
+        "event_type": "tool_call",
+        "category": "execution",
+        "session_id": "test",
+        "story_id": "1.4"
+    }
+
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {"duration_ms": 120, "tokens_used": 50, "context_percent": 12.5, "success": False},
+        {"duration_ms": "120"},          # lax coercion accepted by the schema
+        {"confidence_score": 1},
+        {"details": {"file": "a.py"}},
+        {"event_type": "invalid_type"},
+        {"category": "invalid_category"},
+        {"tokens_used": None},           # log_tool_call default
+        {"duration_ms": 1.5},
+        {"agent_name": 42},
+        {"details": "not a dict"},
+        {"session_id": None},
+    ])
+    def test_matches_schema(self, overrides):
+        event = {**self.BASE, **overrides}
+        try:
+            UniversalEventSchema(**event)
+            schema_valid = True
+        except Exception:
+            schema_valid = False
+
+        assert (validate_event(event) is None) == schema_valid
+
+    def test_sampled_validation(self, tmp_path):
+        """validate_every=N only checks 1 in N events"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+            logger = QuickLogger(story_id="test", validate_every=4)
+
+        for _ in range(8):
+            logger.log("invalid_type", "execution")
+
+        with open(logger.log_file, 'r') as f:
+            events = [json.loads(line) for line in f][1:]
+        flagged = [e for e in events if "schema_validation_error" in e]
+        assert len(flagged) == 2
+
+
 class TestQuickLogger:
     """Test QuickLogger implementation"""
 
@@ -181,6 +230,101 @@ class TestQuickLogger:
         assert avg_per_log < 1.0
 
 
+class TestBufferedQuickLogger:
+    """Test buffered writer mode (background flusher, bounded ring)"""
+
+    @pytest.fixture
+    def temp_log_dir(self):
+        """Create temporary log directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    def _read_events(self, logger):
+        if not Path(logger.log_file).exists():
+            return []
+        with open(logger.log_file, 'r') as f:
+            return [json.loads(line) for line in f]
+
+    def test_events_buffered_until_flush(self, temp_log_dir):
+        """Events stay in memory until flush()"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": temp_log_dir}):
+            logger = QuickLogger(story_id="test", buffered=True, flush_interval=60)
+
+        logger.log("tool_call", "execution", tool="Read")
+        assert self._read_events(logger) == []
+
+        logger.flush()
+        events = self._read_events(logger)
+        assert [e["event_type"] for e in events] == ["session_start", "tool_call"]
+        logger.close()
+
+    def test_flush_on_size(self, temp_log_dir):
+        """Reaching flush_size wakes the background flusher"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": temp_log_dir}):
+            logger = QuickLogger(story_id="test", buffered=True, flush_size=10, flush_interval=60)
+
+        for i in range(20):
+            logger.log("tool_call", "execution", iteration=i)
+
+        deadline = time.time() + 5
+        while len(self._read_events(logger)) < 10 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(self._read_events(logger)) >= 10
+        logger.close()
+
+    def test_close_drains_buffer(self, temp_log_dir):
+        """close() writes every pending event including session_end"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": temp_log_dir}):
+            logger = QuickLogger(story_id="test", buffered=True, flush_interval=60)
+
+        for i in range(50):
+            logger.log("tool_call", "execution", iteration=i)
+        logger.close()
+
+        events = self._read_events(logger)
+        assert len(events) == 52
+        assert events[-1]["event_type"] == "session_end"
+
+        # Logging after close falls back to direct writes
+        logger.log("tool_call", "execution", tool="late")
+        assert self._read_events(logger)[-1]["tool"] == "late"
+
+    def test_ring_is_bounded(self, temp_log_dir):
+        """Oldest events are dropped (and counted) when the ring is full"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": temp_log_dir}):
+            logger = QuickLogger(story_id="test", buffered=True, flush_size=1000,
+                                 flush_interval=60, max_buffered_events=10)
+
+        for i in range(25):
+            logger.log("tool_call", "execution", iteration=i)
+
+        assert logger.dropped_events == 16  # 26 events (incl. session_start) into 10 slots
+        logger.flush()
+        iterations = [e["iteration"] for e in self._read_events(logger)]
+        assert iterations == list(range(15, 25))
+        logger.close()
+
+    def test_thread_safe_buffered_logging(self, temp_log_dir):
+        """Concurrent producers lose no events with a large enough ring"""
+        with patch.dict(os.environ, {"MADF_LOG_PATH": temp_log_dir}):
+            logger = QuickLogger(story_id="test", buffered=True, flush_size=100, flush_interval=0.05)
+
+        def log_events(thread_id: int):
+            for i in range(500):
+                logger.log("tool_call", "execution", thread=thread_id, iteration=i)
+
+        threads = [threading.Thread(target=log_events, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        events = self._read_events(logger)
+        assert len(events) == 8 * 500 + 2
+        assert logger.dropped_events == 0
+
+
 class TestMADFLogger:
     """Test MADF Logger wrapper and decorators"""
 
@@ -306,7 +450,8 @@ class TestLogAgentExecutionDecorator:
                 events = [json.loads(line) for line in lines]
 
             action_events = [e for e in events if e.get("action") == "sync_function"]
-            assert len(action_events) >= 2  # start and end
+            assert len(action_events) == 1  # single span event on completion
+            assert action_events[0]["span_id"] and action_events[0]["success"] is True
 
             # Cleanup
             ql._logger_instance = None
@@ -333,7 +478,8 @@ class TestLogAgentExecutionDecorator:
                 events = [json.loads(line) for line in lines]
 
             action_events = [e for e in events if e.get("action") == "async_function"]
-            assert len(action_events) >= 2  # start and end
+            assert len(action_events) == 1  # single span event on completion
+            assert action_events[0]["span_id"] and action_events[0]["success"] is True
 
             # Cleanup
             ql._logger_instance = None
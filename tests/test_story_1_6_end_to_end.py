@@ -15,6 +15,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from core.mcp_bridge import MCPBridge
+from core.mcp_session_pool import MCPSessionPool
 from agents.developer_agent import DeveloperAgent
 
 
@@ -346,12 +347,14 @@ class TestTask5PerformanceMetrics:
         """Test MCPBridge session caching for performance"""
         bridge = MCPBridge()
 
-        # Verify session cache exists
-        assert hasattr(bridge, '_active_sessions'), \
-            "MCPBridge missing session cache"
+        # Verify session pool exists
+        assert isinstance(bridge._session_pool, MCPSessionPool), \
+            "MCPBridge missing session pool"
 
-        assert isinstance(bridge._active_sessions, dict), \
-            "Session cache should be dict"
+        stats = bridge.get_pool_stats()
+        assert stats["created"] == 0, "Sessions should start lazily"
+        assert stats["servers"] == {}, "No server sessions before first call"
+        bridge.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+Tests for ToolResultCache - two-tier (memory LRU + SQLite) tool result cache
+Uses real SQLite files in tmp_path
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.core.tool_result_cache import ToolResultCache
+
+DOCS = {"success": True, "documentation": "x" * 100}
+
+
+class TestToolResultCache:
+    """Test memory/disk tiers, eviction, TTL and counters"""
+
+    def test_make_key_is_canonical(self):
+        """Parameter order does not change the key"""
+        a = ToolResultCache.make_key("get-library-docs", {"topic": "hooks", "id": "/react"})
+        b = ToolResultCache.make_key("get-library-docs", {"id": "/react", "topic": "hooks"})
+        assert a == b
+
+    def test_memory_hit(self):
+        cache = ToolResultCache("context7")
+        cache.put("k", DOCS)
+
+        assert cache.get("k") == DOCS
+        assert cache.get("missing") is None
+
+        stats = cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_evicts_by_bytes(self):
+        """Memory tier stays under its byte budget, evicting least recently used"""
+        cache = ToolResultCache("context7", max_bytes=300)
+        cache.put("a", DOCS)
+        cache.put("b", DOCS)
+        cache.get("a")  # a is now most recently used
+        cache.put("c", DOCS)
+
+        stats = cache.stats()
+        assert stats["memory_bytes"] <= 300
+        assert stats["evictions"] == 1
+        assert cache.get("b") is None
+        assert cache.get("a") == DOCS
+
+    def test_ttl_expiry(self, tmp_path):
+        """Expired entries are dropped from both tiers"""
+        cache = ToolResultCache("context7", ttl_seconds=0.05, db_path=tmp_path / "cache.sqlite3")
+        cache.put("k", DOCS)
+        time.sleep(0.1)
+
+        assert cache.get("k") is None
+        assert cache.stats()["expirations"] >= 1
+        cache.close()
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new instance is served from SQLite and promotes into memory"""
+        db_path = tmp_path / "cache.sqlite3"
+        first = ToolResultCache("context7", db_path=db_path)
+        first.put("k", DOCS)
+        first.close()
+
+        second = ToolResultCache("context7", db_path=db_path)
+        assert second.get("k") == DOCS
+        assert second.get("k") == DOCS
+        stats = second.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        second.close()
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        db_path = tmp_path / "cache.sqlite3"
+        context7 = ToolResultCache("context7", db_path=db_path)
+        serena = ToolResultCache("serena", db_path=db_path)
+        context7.put("k", DOCS)
+
+        assert serena.get("k") is None
+        serena.clear()
+        assert context7.get("k") == DOCS
+        context7.close()
+        serena.close()
+
+
+class TestBridgeCacheConfig:
+    """Test MCPBridge cache wiring from environment"""
+
+    def test_bridge_cache_settings(self, tmp_path):
+        pytest.importorskip("mcp")
+        from src.core.mcp_bridge import MCPBridge
+
+        env = {
+            "MADF_CACHE_PATH": str(tmp_path),
+            "MADF_CONTEXT7_CACHE_MB": "1",
+            "MADF_SERENA_CACHE_TTL": "60"
+        }
+        with patch.dict(os.environ, env):
+            bridge = MCPBridge()
+
+        stats = bridge.get_cache_stats()
+        assert stats["context7"]["max_bytes"] == 1024 * 1024
+        assert "serena" in stats
+        assert (tmp_path / "tool_result_cache.sqlite3").exists()
+        bridge.close()
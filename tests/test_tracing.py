@@ -0,0 +1,127 @@
+"""
+Tests for tracing.Span - single-event spans with parent/child ids and sampling
+"""
+
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core.log_context import clear_log_context, get_log_context
+from src.core.quick_logger import QuickLogger
+from src.core.tracing import Span
+
+
+@pytest.fixture
+def logger(tmp_path):
+    clear_log_context()
+    with patch.dict(os.environ, {"MADF_LOG_PATH": str(tmp_path)}):
+        yield QuickLogger(story_id="test_trace", validate_schema=False, latency_sketches=True)
+    clear_log_context()
+
+
+def _spans(logger):
+    events = [json.loads(line) for line in logger.log_file.read_text(encoding="utf-8").splitlines()]
+    return {e["span_name"]: e for e in events if "span_name" in e}
+
+
+def test_nested_spans_form_a_tree(logger):
+    with logger.span("plan", agent_name="planning_agent") as root:
+        with logger.span("search", tool="Grep"):
+            logger.log_tool_call("Grep", 3)
+        with logger.span("read"):
+            pass
+    logger.close()
+
+    spans = _spans(logger)
+    assert set(spans) == {"plan", "search", "read"}
+    assert spans["plan"]["parent_span_id"] is None
+    assert spans["search"]["parent_span_id"] == root.span_id
+    assert spans["read"]["parent_span_id"] == root.span_id
+    assert {s["trace_id"] for s in spans.values()} == {root.trace_id}
+    assert spans["search"]["agent_name"] == "planning_agent"
+    assert spans["plan"]["duration_ns"] >= spans["search"]["duration_ns"] > 0
+    assert spans["plan"]["event_type"] == "agent_action"
+    assert get_log_context() == {}
+
+
+def test_exception_logged_once_as_error(logger):
+    with pytest.raises(KeyError):
+        with logger.span("lookup"):
+            raise KeyError("missing")
+    logger.close()
+
+    span = _spans(logger)["lookup"]
+    assert span["category"] == "error"
+    assert span["success"] is False
+    assert span["details"]["error_type"] == "KeyError"
+
+
+def test_cancellation_is_not_an_error(logger):
+    async def main():
+        async def task():
+            async with Span("waiting", logger=logger):
+                await asyncio.sleep(10)
+
+        running = asyncio.create_task(task())
+        await asyncio.sleep(0)
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+
+    asyncio.run(main())
+    logger.close()
+
+    span = _spans(logger)["waiting"]
+    assert span["category"] == "execution"
+    assert span["success"] is True
+    assert "error_type" not in span.get("details", {})
+
+
+def test_head_sampling_inherited_by_children(logger):
+    with Span("root", logger=logger, sample_rate=0.0):
+        with Span("child", logger=logger, sample_rate=1.0):
+            pass
+    with Span("kept", logger=logger, sample_rate=1.0):
+        pass
+    logger.close()
+
+    assert set(_spans(logger)) == {"kept"}
+    # Unsampled spans still feed the latency sketches
+    assert logger.sketches.percentiles(action="child")["count"] == 1
+
+
+def test_sketches_record_exact_duration_once(logger):
+    with Span("fast", logger=logger, sample_rate=1.0) as sampled:
+        pass
+    with Span("fast_unsampled", logger=logger, sample_rate=0.0) as unsampled:
+        pass
+
+    kept = logger.sketches.percentiles(action="fast")
+    assert kept["count"] == 1
+    assert kept["max"] == pytest.approx(sampled.duration_ns / 1e6, rel=0.02) and kept["max"] > 0
+    skipped = logger.sketches.percentiles(action="fast_unsampled")
+    assert skipped["max"] == pytest.approx(unsampled.duration_ns / 1e6, rel=0.02)
+    logger.close()
+
+
+def test_concurrent_tasks_build_separate_trees(logger):
+    async def agent(name):
+        async with Span(name, logger=logger, agent_name=name):
+            await asyncio.sleep(0)
+            with Span(f"{name}.step", logger=logger):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(agent("a"), agent("b"))
+
+    asyncio.run(main())
+    logger.close()
+
+    spans = _spans(logger)
+    for name in ("a", "b"):
+        assert spans[f"{name}.step"]["parent_span_id"] == spans[name]["span_id"]
+        assert spans[f"{name}.step"]["agent_name"] == name
+    assert spans["a"]["trace_id"] != spans["b"]["trace_id"]
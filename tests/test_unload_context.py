@@ -59,7 +59,7 @@ class MCPManager:
         # Context7-specific cache clearing
         bridge = cls.get_bridge()
         if server_name == "context7" and hasattr(bridge, '_context7_cache'):
-            cache_size = len(bridge._context7_cache)
+            cache_size = bridge._context7_cache.stats()["memory_entries"]
             bridge._context7_cache.clear()
             print(f"  [OK] Context7 cache cleared ({cache_size} entries)")
         else:
@@ -81,11 +81,10 @@ class MCPManager:
         print(f"Tool definitions count: {len(cls._loaded_tools)}")
 
         if hasattr(bridge, '_context7_cache'):
-            print(f"Context7 cache entries: {len(bridge._context7_cache)}")
-            if bridge._context7_cache:
-                print(f"Cache keys:")
-                for key in bridge._context7_cache.keys():
-                    print(f"  - {key}")
+            cache_stats = bridge._context7_cache.stats()
+            print(f"Context7 cache entries: {cache_stats['memory_entries']}")
+            if cache_stats["memory_entries"]:
+                print(f"Cache memory: {cache_stats['memory_bytes']} bytes")
 
         print("=" * 70 + "\n")
 
@@ -139,8 +138,9 @@ def test_unload_context_clearing():
 
     # Try to access cache
     if hasattr(bridge, '_context7_cache'):
-        print(f"Cache size after unload: {len(bridge._context7_cache)}")
-        print(f"Cache cleared: {'YES' if len(bridge._context7_cache) == 0 else 'NO'}")
+        cache_size = bridge._context7_cache.stats()["memory_entries"]
+        print(f"Cache size after unload: {cache_size}")
+        print(f"Cache cleared: {'YES' if cache_size == 0 else 'NO'}")
 
     print()
 
@@ -245,7 +245,7 @@ def test_partial_vs_full_clear():
 
     manager.unload_tools("serena")
     print(f"Remaining tools: {manager.get_loaded_tools()}")
-    print(f"Context7 cache still exists: {len(bridge._context7_cache) > 0}")
+    print(f"Context7 cache still exists: {bridge._context7_cache.stats()['memory_entries'] > 0}")
     print()
 
     # Test 2: Unload Context7 (clears its cache)
@@ -254,7 +254,7 @@ def test_partial_vs_full_clear():
 
     manager.unload_tools("context7")
     print(f"Remaining tools: {manager.get_loaded_tools()}")
-    print(f"Context7 cache cleared: {len(bridge._context7_cache) == 0}")
+    print(f"Context7 cache cleared: {bridge._context7_cache.stats()['memory_entries'] == 0}")
     print()
 
 
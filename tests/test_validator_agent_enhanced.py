@@ -174,16 +174,9 @@ class TestPerformanceAnalysis:
 
     def test_analyze_performance_story(self, validator_agent):
         """Test story performance analysis"""
-        # Mock postgres query
-        validator_agent.postgres.execute_query = Mock(
-            return_value=[
-                {'session_id': 'session1'},
-                {'session_id': 'session2'}
-            ]
-        )
-
-        validator_agent.log_analyzer.get_session_summary = Mock(
-            return_value="Summary"
+        # Mock batched session summaries
+        validator_agent.log_analyzer.get_session_summaries = Mock(
+            return_value=["Summary 1", "Summary 2"]
         )
 
         result = validator_agent.analyze_performance(story_id="1.4")
@@ -191,6 +184,9 @@ class TestPerformanceAnalysis:
         assert result['analysis_type'] == 'story'
         assert result['story_id'] == '1.4'
         assert result['sessions_analyzed'] == 2
+        validator_agent.log_analyzer.get_session_summaries.assert_called_once_with(
+            story_id="1.4", limit=10
+        )
 
     def test_analyze_performance_disabled(self, validator_agent_minimal):
         """Test analysis when Postgres disabled"""